@@ -0,0 +1,77 @@
+import argparse
+import os
+from common.video_editor import VideoEditor
+from common.reframer import reframe_video
+from common.reframer import reframe_directory
+from common.utilities import get_detections_path
+from common.reframer import load_ball_positions
+from common.render_profiles import get_render_profile
+from common.render_profiles import RENDER_PROFILES
+from common.render_profiles import PROFILE_PUBLISH
+from common.logger import logger
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Compare the moviepy and frame-pipe 9:16 reframing paths"
+    )
+    parser.add_argument(
+        "--video",
+        default=None,
+        help="Specify a clip with a _detections.json file next to it to reframe with both paths",
+    )
+    parser.add_argument(
+        "--directory",
+        default=None,
+        help="Specify a game directory to reframe in batch with the frame-pipe path",
+    )
+    parser.add_argument(
+        "--output_dir",
+        default="output/benchmark/reframe",
+        help="Specify the directory the vertical clips are written to",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Specify the number of clips reframed at the same time in batch mode",
+    )
+    parser.add_argument(
+        "--render_profile",
+        choices=list(RENDER_PROFILES),
+        default=PROFILE_PUBLISH,
+        help="Specify the encoder settings used by both paths",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    render_profile = get_render_profile(args.render_profile)
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.video:
+        ball_positions = load_ball_positions(get_detections_path(args.video))
+        filename = os.path.basename(args.video)
+        moviepy_stats = VideoEditor.edit_video(
+            args.video,
+            os.path.join(args.output_dir, f"moviepy_{filename}"),
+            ball_positions,
+            render_profile,
+        )
+        pipe_stats = reframe_video(
+            args.video,
+            os.path.join(args.output_dir, f"pipe_{filename}"),
+            ball_positions,
+            render_profile=render_profile,
+        )
+        for name, stats in [("moviepy", moviepy_stats), ("pipe", pipe_stats)]:
+            logger.console(
+                f"{name:>8}: {stats['frames']} frames in {stats['seconds']}s, {stats['fps']} fps"
+            )
+    if args.directory:
+        reframe_directory(
+            args.directory,
+            args.output_dir,
+            workers=args.workers,
+            render_profile=render_profile,
+        )
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import resource
+import time
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from common.utilities import get_files_in_directory
+from common.video_editor import VideoEditor
+from common.ffmpeg_renderer import create_highlight_video_ffmpeg
+from common.ffmpeg_renderer import create_highlight_video_stream_copy
+from common.ffmpeg_renderer import create_highlight_video_segmented
+from common.ffmpeg_renderer import create_highlight_video_incremental
+from common.ffmpeg_renderer import RENDER_BACKENDS
+from common.ffmpeg_renderer import RENDER_BACKEND_FFMPEG
+from common.ffmpeg_renderer import RENDER_BACKEND_COPY
+from common.ffmpeg_renderer import RENDER_BACKEND_SEGMENTED
+from common.ffmpeg_renderer import RENDER_BACKEND_INCREMENTAL
+from common.render_profiles import get_render_profile
+from common.render_profiles import RENDER_PROFILES
+from common.render_profiles import PROFILE_PUBLISH
+from common.logger import logger
+
+
+def get_cpu_seconds():
+    # Includes the ffmpeg processes spawned by the backends
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def run_backend(
+    backend, video_paths, output_directory, box_score_data, render_profile=None, max_open_clips=None
+):
+    """
+    Renders the highlight video of a clip set with one backend.
+
+    Parameters:
+        backend (str): One of RENDER_BACKENDS.
+        video_paths (list): Paths of the game clips.
+        output_directory (str): Directory the highlight video is written to.
+        box_score_data (list): The box score data used for the stats images.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+        max_open_clips (int, optional): Maximum number of clips the moviepy backend keeps open.
+
+    Returns:
+        dict: Wall and CPU time of the render and the size and duration of the output.
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    output_video = f"{output_directory}/final_highlight_logo.mp4"
+    for path in [output_video, f"{output_directory}/final_highlight.mp4"]:
+        if os.path.exists(path):
+            os.remove(path)
+
+    started_at = time.monotonic()
+    cpu_started_at = get_cpu_seconds()
+    if backend == RENDER_BACKEND_FFMPEG:
+        create_highlight_video_ffmpeg(
+            list(video_paths), output_directory, box_score_data, render_profile=render_profile
+        )
+    elif backend == RENDER_BACKEND_SEGMENTED:
+        create_highlight_video_segmented(
+            list(video_paths), output_directory, box_score_data, render_profile=render_profile
+        )
+    elif backend == RENDER_BACKEND_INCREMENTAL:
+        create_highlight_video_incremental(
+            list(video_paths), output_directory, box_score_data, render_profile=render_profile
+        )
+    elif backend == RENDER_BACKEND_COPY:
+        # Written without the logo, unless the clips had to be re-encoded
+        output_video = (
+            create_highlight_video_stream_copy(list(video_paths), output_directory, box_score_data)
+            or output_video
+        )
+    else:
+        VideoEditor.create_highlight_video(
+            list(video_paths),
+            output_directory,
+            box_score_data,
+            render_profile=render_profile,
+            max_open_clips=max_open_clips,
+        )
+    result = {
+        "backend": backend,
+        "wall_seconds": round(time.monotonic() - started_at, 2),
+        "cpu_seconds": round(get_cpu_seconds() - cpu_started_at, 2),
+        "output": None,
+    }
+    if os.path.exists(output_video):
+        result["output"] = output_video
+        result["size_mb"] = round(os.path.getsize(output_video) / 1024 / 1024, 2)
+        result["duration"] = ffmpeg_parse_infos(output_video)["duration"]
+    return result
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Compare the highlight render backends on the same clips"
+    )
+    parser.add_argument(
+        "--clips_dir",
+        required=True,
+        help="Specify the directory with the downloaded game clips (e.g. output/nba/videos/DATE/GAME)",
+    )
+    parser.add_argument(
+        "--output_dir",
+        default="output/benchmark/render",
+        help="Specify the directory the videos of each backend are written to",
+    )
+    parser.add_argument(
+        "--box_score",
+        default=None,
+        help="Specify a box score json saved by the crawler to include the stats images",
+    )
+    parser.add_argument(
+        "--render_profile",
+        choices=list(RENDER_PROFILES),
+        default=PROFILE_PUBLISH,
+        help="Specify the encoder settings used by every backend",
+    )
+    parser.add_argument(
+        "--max_open_clips",
+        type=int,
+        default=None,
+        help="Specify the maximum number of clips the moviepy backend keeps open",
+    )
+    parser.add_argument(
+        "--backends",
+        nargs="*",
+        choices=RENDER_BACKENDS,
+        default=RENDER_BACKENDS,
+        help="Specify the backends to benchmark",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    box_score_data = []
+    if args.box_score:
+        with open(args.box_score, encoding="utf-8") as f:
+            box_score_data = json.load(f)
+    video_paths = get_files_in_directory(args.clips_dir)
+    logger.console(f"Benchmarking {len(video_paths)} clips from {args.clips_dir}")
+
+    results = [
+        run_backend(
+            backend,
+            video_paths,
+            os.path.join(args.output_dir, backend),
+            box_score_data,
+            get_render_profile(args.render_profile),
+            args.max_open_clips,
+        )
+        for backend in args.backends
+    ]
+    for result in results:
+        if result["output"]:
+            logger.console(
+                f"{result['backend']:>8}: {result['wall_seconds']}s wall, {result['cpu_seconds']}s CPU, "
+                f"{result['duration']}s of video, {result['size_mb']} MB"
+            )
+        else:
+            logger.console(
+                f"{result['backend']:>8}: failed after {result['wall_seconds']}s, see the log for details"
+            )
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import ffmpeg
+from common.logger import logger
+
+DEFAULT_ASSET_CACHE_DIR = "output/cache/assets"
+INTRO_VIDEO_PATH = "resources/video/intro.mp4"
+LOGO_PATH = "resources/image/logo.png"
+LOGO_SIZE = (45, 45)
+# Resolutions the NBA clips are usually served in
+COMMON_CLIP_RESOLUTIONS = [(1280, 720), (1920, 1080), (960, 540), (640, 360)]
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """
+    Computes the SHA-256 digest of a file's content.
+
+    Parameters:
+        path (str): Path to the file.
+        chunk_size (int): Size of the chunks read, in bytes.
+
+    Returns:
+        str: The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetCache:
+    """
+    Cache of assets derived from the resources, such as the intro and logo resized to a clip size.
+
+    Each variant is stored once under a name derived from the hash of the
+    source file, the target size and the filter parameters, so it is reused
+    by every later render and regenerated only when the source changes.
+    Variants are written to a temporary file and renamed into place, so
+    concurrent renders, in threads or processes, never read a partial file.
+
+    Attributes:
+        directory (str): Directory holding the derived assets.
+    """
+
+    def __init__(self, directory=DEFAULT_ASSET_CACHE_DIR):
+        """
+        The constructor for AssetCache class.
+
+        Parameters:
+            directory (str): Directory holding the derived assets.
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        # Source hashes, keyed by (path, size, mtime) so unchanged sources are not read again
+        self._source_hashes = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_source_hash(self, path):
+        stat = os.stat(path)
+        source = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            source_hash = self._source_hashes.get(source)
+        if source_hash is None:
+            source_hash = hash_file(path)
+            with self._lock:
+                self._source_hashes[source] = source_hash
+        return source_hash
+
+    def _get_key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def make_path(self, source_path, width, height, filter_params=None):
+        """
+        Returns the path a variant of a source is stored at.
+
+        Parameters:
+            source_path (str): Path to the source asset.
+            width (int): Target width.
+            height (int): Target height.
+            filter_params (dict, optional): Extra options of the ffmpeg scale filter (e.g. flags).
+
+        Returns:
+            str: Path of the variant in the cache.
+        """
+        key_source = json.dumps(
+            [self._get_source_hash(source_path), width, height, filter_params or {}],
+            sort_keys=True,
+        )
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+        name, extension = os.path.splitext(os.path.basename(source_path))
+        return os.path.join(self.directory, f"{name}_{width}x{height}_{key}{extension}")
+
+    def get_resized(self, source_path, width, height, filter_params=None):
+        """
+        Returns a copy of an asset scaled to the given size, generating it on first use.
+
+        Parameters:
+            source_path (str): Path to the source asset (video or image).
+            width (int): Target width.
+            height (int): Target height.
+            filter_params (dict, optional): Extra options of the ffmpeg scale filter (e.g. flags).
+
+        Returns:
+            str: Path of the resized asset.
+        """
+        path = self.make_path(source_path, width, height, filter_params)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+        with self._get_key_lock(path):
+            # Another thread may have generated it while this one waited
+            if os.path.exists(path):
+                self.hits += 1
+                return path
+            self.misses += 1
+            _, extension = os.path.splitext(path)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=extension)
+            os.close(fd)
+            try:
+                (
+                    ffmpeg.input(source_path)
+                    .filter("scale", width, height, **(filter_params or {}))
+                    .output(temp_path)
+                    .overwrite_output()
+                    .run(quiet=True)
+                )
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            logger.console(f"Generated {path} from {source_path}")
+        return path
+
+    def prewarm(self, resolutions=None):
+        """
+        Generates the intro for every resolution and the resized logo ahead of a render.
+
+        Parameters:
+            resolutions (list, optional): (width, height) tuples. Defaults to COMMON_CLIP_RESOLUTIONS.
+
+        Returns:
+            list: The paths of the generated or already cached assets.
+        """
+        paths = [self.get_resized(LOGO_PATH, *LOGO_SIZE)]
+        for width, height in resolutions or COMMON_CLIP_RESOLUTIONS:
+            paths.append(self.get_resized(INTRO_VIDEO_PATH, width, height))
+        return paths
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_asset_cache():
+    """
+    Returns the process-wide AssetCache, creating it on first use.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = AssetCache()
+        return _default_cache
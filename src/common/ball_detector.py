@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+import cv2
+import numpy as np
+import torch
+from common.detection_sampler import detect_sampled_frames
+from common.detection_sampler import DEFAULT_FRAME_STRIDE
+from common.detection_sampler import DEFAULT_MAX_JUMP_RATIO
+from common.detection_sampler import DEFAULT_BATCH_SIZE
+from common.logger import logger
+
+YOLO_REPO = "ultralytics/yolov5"
+# Directory torch.hub clones YOLO_REPO into
+YOLO_HUB_DIR = "ultralytics_yolov5_master"
+# Model of each size, from the fastest to the most accurate
+YOLO_MODELS = {
+    "n": "yolov5n",
+    "s": "yolov5s",
+    "m": "yolov5m",
+    "l": "yolov5l",
+}
+DEFAULT_MODEL_SIZE = "l"
+SPORTS_BALL_LABEL = "sports ball"
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_yolo_model(model_size=DEFAULT_MODEL_SIZE):
+    """
+    Returns the pretrained YOLOv5 model of a size, loading it once per process.
+
+    The repository cached by torch.hub on the first run is loaded from disk,
+    so only the very first load needs the network. The weights are
+    downloaded once by YOLOv5 and reused afterwards.
+
+    Parameters:
+        model_size (str): One of the YOLO_MODELS sizes: n, s, m or l.
+
+    Returns:
+        The model, in evaluation mode.
+
+    Raises:
+        ValueError: If there is no model of that size.
+    """
+    if model_size not in YOLO_MODELS:
+        raise ValueError(
+            f"Unknown model size {model_size}, expected one of {', '.join(YOLO_MODELS)}"
+        )
+    with _models_lock:
+        model = _models.get(model_size)
+        if model is None:
+            started_at = time.monotonic()
+            repo_dir = os.path.join(torch.hub.get_dir(), YOLO_HUB_DIR)
+            if os.path.isdir(repo_dir):
+                model = torch.hub.load(
+                    repo_dir, YOLO_MODELS[model_size], source="local", pretrained=True
+                )
+            else:
+                model = torch.hub.load(
+                    YOLO_REPO, YOLO_MODELS[model_size], pretrained=True, trust_repo=True
+                )
+            model.eval()
+            _models[model_size] = model
+            logger.console(
+                f"Loaded {YOLO_MODELS[model_size]} in {time.monotonic() - started_at:.1f}s"
+            )
+        return model
+
+
+def locate_ball_in_boxes(frame, boxes, lower_hsv, upper_hsv):
+    """
+    Finds the basketball inside the sports ball boxes of a frame using its HSV range.
+
+    Parameters:
+        frame (np.ndarray): The BGR frame.
+        boxes (list): The (x1, y1, x2, y2, confidence) sports ball boxes of the frame.
+        lower_hsv (np.ndarray): Lower bound of the basketball's HSV range.
+        upper_hsv (np.ndarray): Upper bound of the basketball's HSV range.
+
+    Returns:
+        tuple: The (x, y, radius) of the last ball found in the frame, or None.
+    """
+    ball = None
+    kernel = np.ones((5, 5), np.uint8)
+    for x1, y1, x2, y2, _ in boxes:
+        cropped_frame = frame[y1:y2, x1:x2]
+        if cropped_frame.size == 0:
+            continue
+        hsv_frame = cv2.cvtColor(cropped_frame, cv2.COLOR_BGR2HSV)
+        mask = cv2.inRange(hsv_frame, lower_hsv, upper_hsv)
+
+        # Morphological opening
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+
+        # Find contours
+        contours, _ = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        for contour in contours:
+            (x, y), radius = cv2.minEnclosingCircle(contour)
+            # Adjust coordinates for original frame
+            ball = (int(x) + x1, int(y) + y1, int(radius))
+    return ball
+
+
+class BallDetector:
+    """
+    Headless basketball detector running YOLOv5 on the CPU over batches of frames.
+
+    The model is shared by every detector of the same size in the process.
+    Frames are decoded with OpenCV and sent to the model N at a time under
+    torch.inference_mode, so no autograd state is kept and the per-call
+    overhead of the model is paid once per batch instead of once per frame.
+    Only a subset of the frames is sampled, see detect_sampled_frames. The
+    balls found by YOLO are then confirmed with the basketball's HSV range,
+    like detect_video_basketball_pytorch always did.
+
+    Attributes:
+        model_size (str): One of the YOLO_MODELS sizes.
+        batch_size (int): Number of frames sent to the model at once.
+        model: The YOLOv5 model.
+    """
+
+    def __init__(self, model_size=DEFAULT_MODEL_SIZE, batch_size=DEFAULT_BATCH_SIZE, threads=None):
+        """
+        The constructor for BallDetector class.
+
+        Parameters:
+            model_size (str): One of the YOLO_MODELS sizes: n, s, m or l. Smaller is faster and less accurate.
+            batch_size (int): Number of frames sent to the model at once.
+            threads (int, optional): Number of threads torch may use in this process. Defaults to torch's own.
+        """
+        if threads:
+            torch.set_num_threads(threads)
+        self.model_size = model_size
+        self.batch_size = batch_size
+        self.model = get_yolo_model(model_size)
+
+    def detect_batch(self, frames):
+        """
+        Runs the model on a batch of frames.
+
+        Parameters:
+            frames (list): The BGR frames.
+
+        Returns:
+            list: For each frame, its (x1, y1, x2, y2, confidence) sports ball boxes.
+        """
+        # YOLOv5 expects RGB images
+        images = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+        with torch.inference_mode():
+            results = self.model(images)
+        boxes = []
+        for frame_detections in results.xyxy:
+            frame_boxes = []
+            for x1, y1, x2, y2, confidence, cls_id in frame_detections.tolist():
+                if results.names[int(cls_id)] == SPORTS_BALL_LABEL:
+                    frame_boxes.append((int(x1), int(y1), int(x2), int(y2), confidence))
+            boxes.append(frame_boxes)
+        return boxes
+
+    def locate_balls(self, frames, lower_hsv, upper_hsv):
+        """
+        Returns the basketball x of each frame of a batch, or None where it is not found.
+        """
+        balls = [
+            locate_ball_in_boxes(frame, frame_boxes, lower_hsv, upper_hsv)
+            for frame, frame_boxes in zip(frames, self.detect_batch(frames))
+        ]
+        return [ball[0] if ball else None for ball in balls]
+
+    def detect_video(
+        self,
+        video_path,
+        lower_hsv,
+        upper_hsv,
+        stride=DEFAULT_FRAME_STRIDE,
+        max_jump_ratio=DEFAULT_MAX_JUMP_RATIO,
+    ):
+        """
+        Detects the basketball in a video, sampling frames with detect_sampled_frames.
+
+        Parameters:
+            video_path (str): Path to the video.
+            lower_hsv (np.ndarray): Lower bound of the basketball's HSV range.
+            upper_hsv (np.ndarray): Upper bound of the basketball's HSV range.
+            stride (int): Distance in frames between the first samples. 1 runs the model on every frame.
+            max_jump_ratio (float): Change of x, as a fraction of the frame width, that gets denser samples.
+
+        Returns:
+            dict: The ball x coordinate keyed by timestamp in milliseconds.
+        """
+        logger.console(
+            f"Detecting the ball in {os.path.basename(video_path)} with {YOLO_MODELS[self.model_size]}"
+        )
+        return detect_sampled_frames(
+            video_path,
+            lambda frames: self.locate_balls(frames, lower_hsv, upper_hsv),
+            stride,
+            max_jump_ratio,
+            self.batch_size,
+        )
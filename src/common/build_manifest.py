@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+from common.asset_cache import hash_file
+from common.logger import logger
+
+
+def make_build_key(*parts):
+    """
+    Returns a short digest identifying an intermediate build product from everything it depends on.
+
+    Parameters:
+        *parts: JSON serializable values, e.g. source hashes, trim ranges and encoder settings.
+
+    Returns:
+        str: The hex digest.
+    """
+    key_source = json.dumps(parts, sort_keys=True)
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()[:16]
+
+
+class BuildManifest:
+    """
+    Record of the intermediate segments of a highlight video build, stored next to them.
+
+    The manifest keeps the content hash of every input file, keyed by path
+    and invalidated by its size and modification time, so unchanged inputs
+    are not read again on the next build. It also keeps the ordered list of
+    segments and the output they were joined into.
+
+    Attributes:
+        path (str): Path of the manifest file.
+        file_hashes (dict): Size, modification time and SHA-256 of each input, keyed by absolute path.
+        segments (list): The segments of the last build, in playing order.
+        output (str): Path of the video the segments were joined into.
+    """
+
+    def __init__(self, path):
+        """
+        The constructor for BuildManifest class.
+
+        Parameters:
+            path (str): Path of the manifest file. It is loaded if it exists.
+        """
+        self.path = path
+        self.file_hashes = {}
+        self.segments = []
+        self.output = None
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.file_hashes = data.get("file_hashes", {})
+                self.segments = data.get("segments", [])
+                self.output = data.get("output")
+            except (OSError, ValueError) as e:
+                logger.error(f"Ignoring the unreadable build manifest {path}: {e}")
+
+    def get_file_hash(self, path):
+        """
+        Returns the SHA-256 of a file, hashing it only if it changed since it was last hashed.
+
+        Parameters:
+            path (str): Path to the file.
+
+        Returns:
+            str: The hex digest.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self.file_hashes.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        file_hash = hash_file(path)
+        self.file_hashes[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_hash,
+        }
+        return file_hash
+
+    def get_segment_keys(self):
+        return [segment["key"] for segment in self.segments]
+
+    def save(self, segments, output):
+        """
+        Records the segments of a finished build and writes the manifest.
+
+        Parameters:
+            segments (list): The segments of the build, in playing order.
+            output (str): Path of the video the segments were joined into.
+        """
+        self.segments = segments
+        self.output = output
+        temp_path = self.path + ".part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "file_hashes": self.file_hashes,
+                    "segments": self.segments,
+                    "output": self.output,
+                },
+                f,
+                indent=4,
+            )
+        os.replace(temp_path, self.path)
@@ -0,0 +1,235 @@
+import os
+import queue
+import threading
+import time
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from common.video_editor import preprocess_clip, MAX_DURATION
+from common.logger import logger
+
+PREPROCESSED_DIR = "preprocessed"
+
+# Marks the end of the stream in a stage queue
+_END = object()
+
+
+class ClipPipeline:
+    """
+    Streams play-by-play clips through download and preprocessing as soon as their URLs are known.
+
+    The pipeline has three stages connected by bounded queues: resolved events
+    are fed with ``on_event_resolved`` (usually as the VideoUrlResolver
+    callback), download workers fetch each clip through a DownloadManager, and
+    preprocessing workers trim, scale and normalize every clip as soon as it
+    lands. When a queue is full the stage feeding it blocks, so a slow stage
+    holds back the ones before it instead of piling up work in memory.
+
+    Preprocessed clips are written to ``{output_directory}/preprocessed`` with
+    the same file names as the downloads, and clips whose preprocessed file is
+    newer than the download are not processed again.
+
+    Unless a size is given, every clip is scaled to the size of the first clip
+    in play order, like create_highlight_video does. That clip is only known
+    once every event is queued, so clips are scaled to the size of the first
+    download meanwhile, and close() preprocesses again the ones that differ.
+
+    Attributes:
+        output_directory (str): Directory the clips are downloaded to.
+        preprocessed_directory (str): Directory the preprocessed clips are written to.
+        width (int): Width every clip is scaled to. Taken from the first clip in play order when not given.
+        height (int): Height every clip is scaled to. Taken from the first clip in play order when not given.
+    """
+
+    def __init__(
+        self,
+        download_manager,
+        output_directory,
+        max_queued=8,
+        preprocess_workers=2,
+        max_duration=MAX_DURATION,
+        width=None,
+        height=None,
+    ):
+        """
+        The constructor for ClipPipeline class.
+
+        Parameters:
+            download_manager (DownloadManager): Manager the clips are downloaded with. The
+                pipeline runs as many download workers as the manager allows.
+            output_directory (str): Directory the clips are downloaded to.
+            max_queued (int): Maximum number of clips waiting in front of each stage.
+            preprocess_workers (int): Number of clips preprocessed at the same time.
+            max_duration (int): Maximum duration of each preprocessed clip in seconds.
+            width (int, optional): Width every clip is scaled to.
+            height (int, optional): Height every clip is scaled to.
+        """
+        self.download_manager = download_manager
+        self.output_directory = output_directory
+        self.preprocessed_directory = os.path.join(output_directory, PREPROCESSED_DIR)
+        self.max_duration = max_duration
+        self.width = width
+        self.height = height
+        self._size_given = width is not None and height is not None
+        self._download_queue = queue.Queue(maxsize=max_queued)
+        self._preprocess_queue = queue.Queue(maxsize=max_queued)
+        self._size_lock = threading.Lock()
+        self._results_lock = threading.Lock()
+        self._queued_paths = set()
+        self._preprocessed_paths = []
+        # Size each clip was preprocessed to in this run, keyed by output path
+        self._output_sizes = {}
+        self._failed = 0
+        self._started_at = time.monotonic()
+        self._closed = False
+
+        os.makedirs(self.preprocessed_directory, exist_ok=True)
+        self._download_threads = [
+            threading.Thread(target=self._download_worker, daemon=True)
+            for _ in range(download_manager.max_workers)
+        ]
+        self._preprocess_threads = [
+            threading.Thread(target=self._preprocess_worker, daemon=True)
+            for _ in range(preprocess_workers)
+        ]
+        for thread in self._download_threads + self._preprocess_threads:
+            thread.start()
+
+    def on_event_resolved(self, event_data, video_urls):
+        """
+        Queues the clips of a resolved play-by-play event for download.
+
+        Blocks while the download queue is full.
+
+        Parameters:
+            event_data (dict): The play-by-play event, with ``pos``, ``clock`` and ``title``.
+            video_urls (list): The video URLs resolved for the event.
+        """
+        for video_url in video_urls:
+            logger.console(f"Queueing download play-by-play event video url: {video_url}")
+            self._download_queue.put(
+                (
+                    video_url,
+                    f"{event_data['pos']}_{event_data['clock']}_{event_data['title']}.mp4",
+                )
+            )
+
+    def _download_worker(self):
+        while True:
+            item = self._download_queue.get()
+            if item is _END:
+                return
+            video_url, filename = item
+            # Going through submit keeps the manager's limit on concurrent downloads
+            # when several pipelines share it
+            try:
+                path = self.download_manager.submit(
+                    video_url, self.output_directory, filename
+                ).result()
+            except Exception as e:
+                # The worker must keep draining the queue or the producer blocks on put() forever
+                logger.error(f"Failed to download {video_url}: {e}")
+                path = None
+            with self._results_lock:
+                if not path:
+                    self._failed += 1
+                    continue
+                # Several urls of an event share a file name. The manager downloads the first
+                # and skips the others, and each file is preprocessed once
+                if path in self._queued_paths:
+                    continue
+                self._queued_paths.add(path)
+            self._preprocess_queue.put(path)
+
+    def _get_target_size(self, path):
+        # Size of the first download until close() knows the first clip in play order
+        with self._size_lock:
+            if self.width is None or self.height is None:
+                self.width, self.height = ffmpeg_parse_infos(path)["video_size"]
+                logger.console(f"Preprocessing clips to {self.width}x{self.height}")
+            return self.width, self.height
+
+    def _preprocess(self, path, output_path, width, height):
+        started_at = time.monotonic()
+        preprocess_clip(path, output_path, self.max_duration, width, height)
+        with self._results_lock:
+            self._output_sizes[output_path] = (width, height)
+        logger.console(
+            f"Preprocessed {os.path.basename(path)} in {time.monotonic() - started_at:.2f}s"
+        )
+
+    def _match_first_clip_size(self):
+        # Preprocesses again the clips whose size differs from the first clip in play order
+        if self._size_given or not self._queued_paths:
+            return
+        first_path = min(self._queued_paths, key=os.path.basename)
+        self.width, self.height = ffmpeg_parse_infos(first_path)["video_size"]
+        for output_path in list(self._preprocessed_paths):
+            output_size = self._output_sizes.get(output_path)
+            if output_size is None:
+                # Preprocessed by an earlier run
+                output_size = tuple(ffmpeg_parse_infos(output_path)["video_size"])
+            if output_size == (self.width, self.height):
+                continue
+            path = os.path.join(self.output_directory, os.path.basename(output_path))
+            logger.console(
+                f"Preprocessing {os.path.basename(path)} again to {self.width}x{self.height}"
+            )
+            try:
+                self._preprocess(path, output_path, self.width, self.height)
+            except Exception as e:
+                logger.error(f"Failed to preprocess {path}: {e}")
+                self._preprocessed_paths.remove(output_path)
+                self._failed += 1
+
+    def _preprocess_worker(self):
+        while True:
+            path = self._preprocess_queue.get()
+            if path is _END:
+                return
+            output_path = os.path.join(
+                self.preprocessed_directory, os.path.basename(path)
+            )
+            try:
+                if not (
+                    os.path.exists(output_path)
+                    and os.path.getmtime(output_path) >= os.path.getmtime(path)
+                ):
+                    self._preprocess(path, output_path, *self._get_target_size(path))
+            except Exception as e:
+                logger.error(f"Failed to preprocess {path}: {e}")
+                with self._results_lock:
+                    self._failed += 1
+                continue
+            with self._results_lock:
+                self._preprocessed_paths.append(output_path)
+
+    def close(self):
+        """
+        Waits for every queued clip to be downloaded and preprocessed, at the size of the first clip in play order.
+
+        Returns:
+            list: The paths of the preprocessed clips, sorted by file name.
+        """
+        if self._closed:
+            return sorted(self._preprocessed_paths)
+        self._closed = True
+        for _ in self._download_threads:
+            self._download_queue.put(_END)
+        for thread in self._download_threads:
+            thread.join()
+        for _ in self._preprocess_threads:
+            self._preprocess_queue.put(_END)
+        for thread in self._preprocess_threads:
+            thread.join()
+        self._match_first_clip_size()
+
+        elapsed = time.monotonic() - self._started_at
+        logger.console(
+            f"Clip pipeline: {len(self._preprocessed_paths)} clips ready, {self._failed} failed, in {elapsed:.1f}s"
+        )
+        return sorted(self._preprocessed_paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,165 @@
+import os
+import time
+import cv2
+from common.logger import logger
+
+# Every 5th frame is ~167ms at 30fps, well under the 1000ms clean_basketball_coordinates keeps
+DEFAULT_FRAME_STRIDE = 5
+# Samples whose ball x differs by more than this fraction of the frame width get a sample in between
+DEFAULT_MAX_JUMP_RATIO = 0.05
+DEFAULT_BATCH_SIZE = 8
+# Frame gaps longer than this are crossed by seeking instead of grabbing every frame
+SEEK_THRESHOLD = 60
+
+
+def get_timestamp(frame_number, fps):
+    # Timestamp of a frame in milliseconds, like the detectors always computed it
+    return int(round(frame_number / fps * 1000))
+
+
+def read_frames(cap, frame_numbers, seek_threshold=SEEK_THRESHOLD):
+    """
+    Reads the given frames of a video, skipping the others without converting them.
+
+    Short gaps are skipped with grab(), which does not convert the frame to
+    BGR, and long gaps or frames behind the current position are reached by
+    seeking with CAP_PROP_POS_FRAMES.
+
+    Parameters:
+        cap (cv2.VideoCapture): The opened video.
+        frame_numbers (list): Numbers of the frames to read.
+        seek_threshold (int): Gaps longer than this many frames are crossed by seeking.
+
+    Yields:
+        tuple: The (frame number, frame) of each frame read, in ascending order.
+    """
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    for frame_number in sorted(set(frame_numbers)):
+        if frame_number < position or frame_number - position > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+            position = frame_number
+        while position < frame_number:
+            if not cap.grab():
+                return
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        position += 1
+        yield frame_number, frame
+
+
+def plan_densification(samples, max_jump, min_gap=1):
+    """
+    Returns the frames to sample between two samples where the ball moved quickly.
+
+    Parameters:
+        samples (dict): Ball x, or None if it was not found, keyed by frame number.
+        max_jump (float): Largest change of x between two neighbouring samples that is interpolated.
+        min_gap (int): Samples this close are never densified.
+
+    Returns:
+        list: The frame in the middle of each gap to densify.
+    """
+    frame_numbers = sorted(samples)
+    new_frame_numbers = []
+    for first, second in zip(frame_numbers, frame_numbers[1:]):
+        if second - first <= min_gap:
+            continue
+        if samples[first] is None or samples[second] is None:
+            continue
+        if abs(samples[second] - samples[first]) > max_jump:
+            new_frame_numbers.append((first + second) // 2)
+    return new_frame_numbers
+
+
+def interpolate_samples(samples, fps):
+    """
+    Fills the frames between two samples where the ball was found with a linear interpolation.
+
+    Frames between a sample where the ball was found and one where it was
+    not are left out, like frames without a detection always were.
+
+    Parameters:
+        samples (dict): Ball x, or None if it was not found, keyed by frame number.
+        fps (float): Frame rate of the video.
+
+    Returns:
+        dict: The ball x coordinate keyed by timestamp in milliseconds.
+    """
+    frame_numbers = sorted(samples)
+    detections = {}
+    for first, second in zip(frame_numbers, frame_numbers[1:]):
+        if samples[first] is None or samples[second] is None:
+            continue
+        for frame_number in range(first, second):
+            x = samples[first] + (samples[second] - samples[first]) * (frame_number - first) / (
+                second - first
+            )
+            detections[get_timestamp(frame_number, fps)] = int(round(x))
+    for frame_number in frame_numbers:
+        if samples[frame_number] is not None:
+            detections[get_timestamp(frame_number, fps)] = samples[frame_number]
+    return dict(sorted(detections.items()))
+
+
+def detect_sampled_frames(
+    video_path,
+    locate_balls,
+    stride=DEFAULT_FRAME_STRIDE,
+    max_jump_ratio=DEFAULT_MAX_JUMP_RATIO,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Detects the basketball on a subset of the frames of a video and interpolates the rest.
+
+    Every ``stride``-th frame and the last one are sampled first. Wherever
+    the ball moved more than ``max_jump_ratio`` of the frame width between
+    two samples, the frame in the middle is sampled too, until the samples
+    agree or are next to each other. The frames in between are interpolated.
+
+    Parameters:
+        video_path (str): Path to the video.
+        locate_balls (callable): Takes a list of BGR frames and returns the ball x, or None, of each one.
+        stride (int): Distance in frames between the first samples. 1 samples every frame.
+        max_jump_ratio (float): Change of x, as a fraction of the frame width, that gets denser samples.
+        batch_size (int): Number of frames passed to locate_balls at once.
+
+    Returns:
+        dict: The ball x coordinate keyed by timestamp in milliseconds.
+    """
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    max_jump = cap.get(cv2.CAP_PROP_FRAME_WIDTH) * max_jump_ratio
+    samples = {}
+    started_at = time.monotonic()
+
+    pending = list(range(0, frame_count, stride))
+    if frame_count and pending[-1] != frame_count - 1:
+        pending.append(frame_count - 1)
+    try:
+        while pending:
+            frame_numbers = []
+            frames = []
+            for frame_number, frame in read_frames(cap, pending):
+                frame_numbers.append(frame_number)
+                frames.append(frame)
+                if len(frames) == batch_size:
+                    samples.update(zip(frame_numbers, locate_balls(frames)))
+                    frame_numbers, frames = [], []
+            if frames:
+                samples.update(zip(frame_numbers, locate_balls(frames)))
+            # Frames past the real end of the video, when its frame count is an estimate
+            for frame_number in pending:
+                samples.setdefault(frame_number, None)
+            pending = plan_densification(samples, max_jump)
+    finally:
+        cap.release()
+
+    elapsed = time.monotonic() - started_at
+    logger.console(
+        f"Sampled {len(samples)} of {frame_count} frames of {os.path.basename(video_path)} "
+        f"in {elapsed:.1f}s ({frame_count / elapsed if elapsed > 0 else 0:.1f} video fps)"
+    )
+    return interpolate_samples(samples, fps)
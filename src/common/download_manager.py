@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from common.http_client import get_http_client
+from common.fixture_store import get_fixture_store
+from common.fixture_store import FixtureMissingError
+from common.logger import logger
+
+PART_SUFFIX = ".part"
+
+
+class IncompleteDownloadError(Exception):
+    """
+    Raised when a downloaded file does not match the size announced by the server.
+    """
+
+
+class DownloadStats:
+    """
+    Thread-safe counters describing one download run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.bytes_downloaded = 0
+        self.completed = 0
+        self.resumed = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at
+            return {
+                "completed": self.completed,
+                "resumed": self.resumed,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "bytes_downloaded": self.bytes_downloaded,
+                "elapsed_seconds": round(elapsed, 2),
+                "megabytes_per_second": (
+                    round(self.bytes_downloaded / elapsed / 1024 / 1024, 2)
+                    if elapsed > 0
+                    else 0
+                ),
+            }
+
+
+class DownloadManager:
+    """
+    Downloads files concurrently, resuming interrupted downloads.
+
+    Data is written to a ``.part`` file next to the target, which is renamed
+    once its size matches the server's Content-Length. A leftover ``.part``
+    file is resumed with an HTTP Range request, and targets that already
+    exist are skipped, so a crashed run can simply be started again.
+    Downloads to the same target run one at a time, so when several URLs
+    share a file name the first one that succeeds is kept and the others
+    are skipped.
+
+    Attributes:
+        max_workers (int): Number of files downloaded at the same time.
+        max_attempts (int): Number of attempts per file before giving up.
+        stats (DownloadStats): Counters of the current run.
+    """
+
+    def __init__(
+        self, max_workers=4, http_client=None, chunk_size=1024 * 1024, max_attempts=3
+    ):
+        """
+        The constructor for DownloadManager class.
+
+        Parameters:
+            max_workers (int): Number of files downloaded at the same time.
+            http_client (HttpClient, optional): Client to download with. Defaults to the shared client.
+            chunk_size (int): Size of the chunks read from the network, in bytes.
+            max_attempts (int): Number of attempts per file before giving up.
+        """
+        self.max_workers = max_workers
+        self.http_client = http_client or get_http_client()
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+        self.stats = DownloadStats()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._target_locks = {}
+
+    def _download_once(self, url, local_filename):
+        part_filename = local_filename + PART_SUFFIX
+        offset = (
+            os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+        )
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        with self.http_client.get(url, stream=True, headers=headers) as response:
+            if response.status_code == 416:
+                # The part file already holds every byte, or is longer than the remote file
+                remote_size = self._get_remote_size(url)
+                if remote_size == offset:
+                    os.replace(part_filename, local_filename)
+                    return
+                os.remove(part_filename)
+                raise IncompleteDownloadError(
+                    f"Discarded {part_filename}, it does not match the remote file"
+                )
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                range_start, total_size = self._parse_content_range(
+                    response.headers.get("Content-Range")
+                )
+                if range_start != offset:
+                    os.remove(part_filename)
+                    raise IncompleteDownloadError(
+                        f"Server answered range {range_start}- instead of {offset}-"
+                    )
+                self.stats.increment("resumed")
+            else:
+                # Full response, either a fresh download or the server ignored the Range header
+                offset = 0
+                content_length = response.headers.get("Content-Length")
+                total_size = int(content_length) if content_length else None
+
+            with open(part_filename, "ab" if offset else "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        self.stats.increment("bytes_downloaded", len(chunk))
+
+        downloaded_size = os.path.getsize(part_filename)
+        if total_size is not None and downloaded_size != total_size:
+            raise IncompleteDownloadError(
+                f"Downloaded {downloaded_size} of {total_size} bytes for {url}"
+            )
+        os.replace(part_filename, local_filename)
+
+    def _get_remote_size(self, url):
+        response = self.http_client.head(url, allow_redirects=True)
+        content_length = response.headers.get("Content-Length")
+        return int(content_length) if content_length else None
+
+    @staticmethod
+    def _parse_content_range(content_range):
+        # Content-Range: bytes 100-199/1000 (the total may be "*" when unknown)
+        if not content_range or " " not in content_range:
+            return 0, None
+        byte_range, total_size = content_range.split(" ", 1)[1].split("/")
+        range_start = int(byte_range.split("-")[0])
+        return range_start, None if total_size == "*" else int(total_size)
+
+    def download(self, url, output_directory, filename=None):
+        """
+        Downloads a single file, resuming a previous partial download if there is one.
+
+        Parameters:
+            url (str): URL of the file to download.
+            output_directory (str): Directory to save the file in.
+            filename (str, optional): Name of the file. If None, it is derived from the URL.
+
+        Returns:
+            str: Path of the downloaded file, or None if every attempt failed.
+        """
+        os.makedirs(output_directory, exist_ok=True)
+        local_filename = os.path.join(
+            output_directory, filename if filename else url.split("/")[-1]
+        )
+        # Two threads writing the same .part file would splice different files together
+        with self._get_target_lock(local_filename):
+            return self._download_to(url, local_filename)
+
+    def _get_target_lock(self, local_filename):
+        with self._executor_lock:
+            return self._target_locks.setdefault(
+                os.path.abspath(local_filename), threading.Lock()
+            )
+
+    def _download_to(self, url, local_filename):
+        fixture_store = get_fixture_store()
+        if fixture_store and fixture_store.replaying:
+            # Downloads that failed while recording were never saved
+            try:
+                fixture_store.load_file(url, local_filename)
+            except FixtureMissingError as e:
+                logger.error(f"Download of {url} failed: {e}")
+                self.stats.increment("failed")
+                return None
+            self.stats.increment("completed")
+            return local_filename
+
+        if os.path.exists(local_filename):
+            logger.console(f"Skipping download, {local_filename} already exists")
+            self.stats.increment("skipped")
+            if fixture_store:
+                fixture_store.save_file(url, local_filename)
+            return local_filename
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self._download_once(url, local_filename)
+                self.stats.increment("completed")
+                if fixture_store:
+                    fixture_store.save_file(url, local_filename)
+                return local_filename
+            except (requests.exceptions.RequestException, IncompleteDownloadError, OSError) as e:
+                logger.error(
+                    f"Download attempt {attempt}/{self.max_attempts} of {url} failed: {e}"
+                )
+        self.stats.increment("failed")
+        return None
+
+    def submit(self, url, output_directory, filename=None):
+        """
+        Schedules a download on the manager's thread pool.
+
+        Parameters:
+            url (str): URL of the file to download.
+            output_directory (str): Directory to save the file in.
+            filename (str, optional): Name of the file. If None, it is derived from the URL.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the path of the file, or None if the download failed.
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor.submit(self.download, url, output_directory, filename)
+
+    def download_all(self, downloads):
+        """
+        Downloads several files concurrently.
+
+        Parameters:
+            downloads (list): Dicts with ``url``, ``output_directory`` and optional ``filename`` keys.
+
+        Returns:
+            list: The path of each file (None for failed downloads), in the same order as ``downloads``.
+        """
+        futures = [
+            self.submit(
+                download["url"], download["output_directory"], download.get("filename")
+            )
+            for download in downloads
+        ]
+        return [future.result() for future in futures]
+
+    def get_stats(self):
+        return self.stats.as_dict()
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.console(
+            f"Downloads: {stats['completed']} completed ({stats['resumed']} resumed), "
+            f"{stats['skipped']} skipped, {stats['failed']} failed, "
+            f"{stats['bytes_downloaded'] / 1024 / 1024:.1f} MB at {stats['megabytes_per_second']} MB/s"
+        )
+
+    def close(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,316 @@
+import atexit
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    WebDriverException,
+)
+from common.logger import logger
+
+BUTTON_COOKIE_BANNER = "onetrust-accept-btn-handler"
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_RECYCLE_AFTER = 25
+
+
+class DriverSession:
+    """
+    A pooled Chrome WebDriver together with the bookkeeping the pool needs.
+
+    Attributes:
+        driver (webdriver.Chrome): The underlying WebDriver.
+        session_id (int): Sequential identifier of this session within its pool.
+        pages_served (int): Number of times the session has been borrowed.
+        cookie_banner_dismissed (bool): True once the cookie banner was accepted in this browser.
+        created_at (float): Time the browser was launched.
+        healthy (bool): False once the session hit a WebDriver error and must be discarded.
+        captures_network (bool): True if the browser records Chrome performance (network) logs.
+    """
+
+    def __init__(self, driver, session_id, captures_network=False):
+        self.driver = driver
+        self.session_id = session_id
+        self.captures_network = captures_network
+        self.pages_served = 0
+        self.cookie_banner_dismissed = False
+        self.created_at = time.time()
+        self.healthy = True
+
+    def is_alive(self):
+        """
+        Checks that the browser still answers WebDriver commands.
+
+        Returns:
+            bool: True if the browser responded, False otherwise.
+        """
+        if not self.healthy:
+            return False
+        try:
+            # Any round trip to the browser works as a ping
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def get_metrics(self):
+        return {
+            "session_id": self.session_id,
+            "pages_served": self.pages_served,
+            "cookie_banner_dismissed": self.cookie_banner_dismissed,
+            "age_seconds": round(time.time() - self.created_at, 2),
+        }
+
+
+class DriverPool:
+    """
+    A bounded pool of reusable Chrome WebDriver sessions.
+
+    Launching Chrome is the most expensive part of every Selenium fetch, so the
+    fetchers borrow an already running browser from this pool instead of
+    starting and quitting one per call.
+
+    Attributes:
+        size (int): Maximum number of browsers alive at the same time.
+        headless (bool): Whether browsers are launched in headless mode.
+        recycle_after (int): Number of pages a browser serves before it is replaced.
+        capture_network (bool): Whether browsers record network traffic in their performance log.
+    """
+
+    def __init__(
+        self,
+        size=DEFAULT_POOL_SIZE,
+        headless=True,
+        recycle_after=DEFAULT_RECYCLE_AFTER,
+        page_load_timeout=60,
+        capture_network=True,
+    ):
+        """
+        The constructor for DriverPool class.
+
+        Parameters:
+            size (int): Maximum number of browsers alive at the same time.
+            headless (bool): Whether browsers are launched in headless mode.
+            recycle_after (int): Number of pages a browser serves before it is replaced.
+            page_load_timeout (int): Page load timeout applied to every browser, in seconds.
+            capture_network (bool): Whether browsers record network traffic in their performance log,
+                which lets the fetchers read video URLs from the captured responses.
+        """
+        if size < 1:
+            raise ValueError("DriverPool size must be at least 1.")
+        self.size = size
+        self.headless = headless
+        self.recycle_after = recycle_after
+        self.page_load_timeout = page_load_timeout
+        self.capture_network = capture_network
+        self._idle_sessions = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._next_session_id = 0
+        self._sessions = []
+        self._retired_metrics = []
+        self._closed = False
+
+    def _build_options(self):
+        options = Options()
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        # A fixed window size keeps the page layout (and the clickable rows) identical to headed mode
+        options.add_argument("--window-size=1920,1080")
+        if self.headless:
+            options.add_argument("--headless=new")
+        if self.capture_network:
+            # Same performance-log setup as test_twitter, network events only
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            options.add_experimental_option(
+                "perfLoggingPrefs", {"enableNetwork": True, "enablePage": False}
+            )
+        return options
+
+    def _create_session(self):
+        driver = webdriver.Chrome(options=self._build_options())
+        driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self._next_session_id += 1
+            session = DriverSession(
+                driver, self._next_session_id, self.capture_network
+            )
+            self._sessions.append(session)
+        logger.console(f"Launched browser session {session.session_id}")
+        return session
+
+    def _retire_session(self, session, reason):
+        logger.console(
+            f"Retiring browser session {session.session_id} after {session.pages_served} pages ({reason})"
+        )
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            self._retired_metrics.append(session.get_metrics())
+        try:
+            session.driver.quit()
+        except WebDriverException as e:
+            logger.error(f"Error while quitting browser session {session.session_id}: {e}")
+
+    def _acquire(self):
+        self._slots.acquire()
+        try:
+            while True:
+                try:
+                    session = self._idle_sessions.get_nowait()
+                except queue.Empty:
+                    return self._create_session()
+                if session.is_alive():
+                    return session
+                self._retire_session(session, "failed health check")
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _release(self, session):
+        try:
+            if self._closed:
+                self._retire_session(session, "pool closed")
+            elif not session.healthy:
+                self._retire_session(session, "webdriver error")
+            elif session.pages_served >= self.recycle_after:
+                self._retire_session(session, "recycle limit reached")
+            else:
+                self._idle_sessions.put(session)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def borrow(self):
+        """
+        Borrows a browser session for the duration of a ``with`` block.
+
+        Blocks until a session is free when all ``size`` browsers are in use.
+        Sessions that raise a WebDriverException are discarded instead of being
+        returned to the pool.
+
+        Yields:
+            DriverSession: The borrowed session.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool is closed.")
+        session = self._acquire()
+        session.pages_served += 1
+        try:
+            yield session
+        except WebDriverException:
+            session.healthy = False
+            raise
+        finally:
+            self._release(session)
+
+    def dismiss_cookie_banner(self, session, wait_time=5):
+        """
+        Accepts the cookie banner once per browser session.
+
+        The consent cookie persists for the lifetime of the browser, so later
+        pages loaded by the same session do not show the banner again.
+
+        Parameters:
+            session (DriverSession): The session whose current page may show the banner.
+            wait_time (int): Time in seconds to wait for the banner to appear.
+        """
+        if session.cookie_banner_dismissed:
+            return
+        driver = session.driver
+        try:
+            WebDriverWait(driver, wait_time).until(
+                EC.element_to_be_clickable((By.ID, BUTTON_COOKIE_BANNER))
+            )
+            driver.find_element(By.ID, BUTTON_COOKIE_BANNER).click()
+            session.cookie_banner_dismissed = True
+        except TimeoutException:
+            logger.error(
+                "No cookie banner found or timeout occurred while waiting for cookie banner."
+            )
+        except NoSuchElementException:
+            logger.error("Cookie banner close button not found.")
+        except WebDriverException as e:
+            logger.error(f"Error while handling cookie banner: {e}")
+
+    def get_metrics(self):
+        """
+        Returns reuse metrics for every session this pool has launched.
+
+        Returns:
+            dict: Totals plus a per-session list of metrics.
+        """
+        with self._lock:
+            sessions = [session.get_metrics() for session in self._sessions]
+            sessions += list(self._retired_metrics)
+        pages_served = sum(session["pages_served"] for session in sessions)
+        return {
+            "sessions_launched": len(sessions),
+            "pages_served": pages_served,
+            "pages_per_session": (
+                round(pages_served / len(sessions), 2) if sessions else 0
+            ),
+            "sessions": sorted(sessions, key=lambda session: session["session_id"]),
+        }
+
+    def close(self):
+        """
+        Quits every idle browser and logs the reuse metrics.
+        Sessions still borrowed are quit when they are returned.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                session = self._idle_sessions.get_nowait()
+            except queue.Empty:
+                break
+            self._retire_session(session, "pool closed")
+        metrics = self.get_metrics()
+        logger.console(
+            f"Driver pool served {metrics['pages_served']} pages with {metrics['sessions_launched']} browser sessions"
+        )
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """
+    Returns the process-wide DriverPool, creating it on first use.
+
+    Returns:
+        DriverPool: The shared pool used by the Selenium fetchers.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def set_driver_pool(pool):
+    """
+    Replaces the process-wide DriverPool, closing the previous one.
+
+    Parameters:
+        pool (DriverPool): The pool the Selenium fetchers should borrow from.
+    """
+    global _default_pool
+    with _default_pool_lock:
+        previous_pool = _default_pool
+        _default_pool = pool
+        if pool is not None:
+            atexit.register(pool.close)
+    if previous_pool is not None and previous_pool is not pool:
+        previous_pool.close()
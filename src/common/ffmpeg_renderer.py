@@ -0,0 +1,820 @@
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+import ffmpeg
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from common.video_editor import (
+    MAX_DURATION,
+    CLIP_FPS,
+    AUDIO_SAMPLE_RATE,
+    create_stats_images,
+    get_clip_trim_range,
+    join_segments,
+)
+from common.asset_cache import get_asset_cache, INTRO_VIDEO_PATH, LOGO_PATH, LOGO_SIZE
+from common.render_profiles import get_render_profile
+from common.build_manifest import BuildManifest, make_build_key
+from common.logger import logger
+
+RENDER_BACKEND_MOVIEPY = "moviepy"
+RENDER_BACKEND_FFMPEG = "ffmpeg"
+RENDER_BACKEND_COPY = "copy"
+RENDER_BACKEND_SEGMENTED = "segmented"
+RENDER_BACKEND_INCREMENTAL = "incremental"
+RENDER_BACKENDS = [
+    RENDER_BACKEND_MOVIEPY,
+    RENDER_BACKEND_FFMPEG,
+    RENDER_BACKEND_COPY,
+    RENDER_BACKEND_SEGMENTED,
+    RENDER_BACKEND_INCREMENTAL,
+]
+
+INTRO_AUDIO_PATH = "resources/audio/intro.mp3"
+OUTRO_AUDIO_PATH = "resources/audio/outro.mp3"
+INTRO_AUDIO_FADEOUT = 5
+OUTRO_AUDIO_FADEOUT = 7
+LOGO_PADDING_TOP = 0
+LOGO_PADDING_RIGHT = 20
+# Size of the black bar create_logo_clip draws behind the logo (100 spaces of Arial 48)
+LOGO_BAR_SIZE = (1334, 56)
+SEGMENTS_DIR = ".segments"
+# Segments of the incremental builds, kept between renders
+BUILD_DIR = ".build"
+BUILD_MANIFEST_FILENAME = "manifest.json"
+# Keyframes this close to a cut point are treated as being on it
+KEYFRAME_TOLERANCE = 0.001
+# x264 profile names of the profiles ffprobe reports for H.264 streams
+X264_PROFILES = {
+    "Constrained Baseline": "baseline",
+    "Baseline": "baseline",
+    "Main": "main",
+    "High": "high",
+}
+
+
+def _fit(video, width, height, fps=CLIP_FPS, pix_fmt="yuv420p"):
+    # Scales and pads a segment to the output size, like moviepy's "compose" concatenation centers it
+    return (
+        video.filter("scale", width, height, force_original_aspect_ratio="decrease")
+        .filter("pad", width, height, "(ow-iw)/2", "(oh-ih)/2")
+        .filter("setsar", 1)
+        .filter("fps", fps=fps)
+        .filter("format", pix_fmt)
+    )
+
+
+def _normalize_audio(audio, sample_rate=AUDIO_SAMPLE_RATE, channels=2):
+    return audio.filter(
+        "aformat",
+        sample_fmts="fltp",
+        sample_rates=sample_rate,
+        channel_layouts="mono" if channels == 1 else "stereo",
+    )
+
+
+def _silence(duration, sample_rate=AUDIO_SAMPLE_RATE, channels=2):
+    return ffmpeg.input(
+        f"anullsrc=r={sample_rate}:cl={'mono' if channels == 1 else 'stereo'}",
+        f="lavfi",
+        t=duration,
+    ).audio
+
+
+def _faded_audio(audio_path, fadeout, duration, sample_rate=AUDIO_SAMPLE_RATE, channels=2):
+    # Like AudioFileClip(path).audio_fadeout(fadeout) cut to the length of the segment it is set on
+    audio_duration = ffmpeg_parse_infos(audio_path)["duration"]
+    audio = (
+        ffmpeg.input(audio_path)
+        .audio.filter("afade", t="out", st=max(audio_duration - fadeout, 0), d=fadeout)
+        .filter("apad")
+        .filter("atrim", duration=duration)
+    )
+    return _normalize_audio(audio, sample_rate, channels)
+
+
+def _is_game_clip(videopath):
+    # Keep only the ones that start with a number and and with .mp4 (These are the videos previously downloaded)
+    videofilename = os.path.basename(videopath)
+    return videofilename[0].isnumeric() and videofilename.endswith(".mp4")
+
+
+def _get_trim_range(videopath, trim_clips):
+    duration = ffmpeg_parse_infos(videopath)["duration"]
+    return get_clip_trim_range(duration, MAX_DURATION) if trim_clips else (0, duration)
+
+
+def _build_intro_segment(width, height):
+    intro_duration = ffmpeg_parse_infos(INTRO_VIDEO_PATH)["duration"]
+    return [
+        _fit(
+            ffmpeg.input(get_asset_cache().get_resized(INTRO_VIDEO_PATH, width, height)).video,
+            width,
+            height,
+        ),
+        _faded_audio(INTRO_AUDIO_PATH, INTRO_AUDIO_FADEOUT, intro_duration),
+    ]
+
+
+def _build_clip_segment(videopath, width, height, start, end):
+    clip = ffmpeg.input(videopath, ss=start, t=end - start)
+    audio = (
+        _normalize_audio(clip.audio.filter("apad").filter("atrim", duration=end - start))
+        if ffmpeg_parse_infos(videopath).get("audio_found")
+        else _silence(end - start)
+    )
+    return [_fit(clip.video, width, height), audio]
+
+
+def _build_stats_segment(image_path, width, height, image_duration, with_outro):
+    # The outro music starts on the first stats image
+    image = ffmpeg.input(image_path, loop=1, t=image_duration, framerate=CLIP_FPS)
+    audio = (
+        _faded_audio(OUTRO_AUDIO_PATH, OUTRO_AUDIO_FADEOUT, image_duration)
+        if with_outro
+        else _silence(image_duration)
+    )
+    return [_fit(image.video, width, height), audio]
+
+
+def build_highlight_segments(
+    video_paths, box_score_data, output_path, width, height, image_duration=5, trim_clips=True
+):
+    """
+    Builds the (video, audio) stream pairs of every segment of the highlight video.
+
+    Parameters:
+        video_paths (list): Paths of the game clips, in playing order.
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        output_path (str): Directory the stats images are written to.
+        width (int): Width of the highlight video.
+        height (int): Height of the highlight video.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips like trim_clip.
+
+    Returns:
+        list: The [video, audio] streams of the intro, the game clips and the stats images.
+    """
+    segments = [_build_intro_segment(width, height)]
+
+    for videopath in video_paths:
+        if not _is_game_clip(videopath):
+            continue
+        start, end = _get_trim_range(videopath, trim_clips)
+        segments.append(_build_clip_segment(videopath, width, height, start, end))
+
+    stats_image_paths = create_stats_images(box_score_data, output_path)
+    if stats_image_paths:
+        for index, image_path in enumerate(stats_image_paths):
+            segments.append(
+                _build_stats_segment(image_path, width, height, image_duration, index == 0)
+            )
+    return segments
+
+
+def add_logo(video, width):
+    """
+    Draws the logo and its black bar in the top right corner, like create_logo_clip.
+
+    Parameters:
+        video: The video stream.
+        width (int): Width of the video.
+
+    Returns:
+        The video stream with the logo.
+    """
+    bar_width = min(LOGO_BAR_SIZE[0], width)
+    logo = ffmpeg.input(get_asset_cache().get_resized(LOGO_PATH, *LOGO_SIZE)).video
+    return video.filter(
+        "drawbox",
+        x=width - bar_width,
+        y=0,
+        w=bar_width,
+        h=LOGO_BAR_SIZE[1],
+        color="black",
+        t="fill",
+    ).overlay(
+        logo,
+        x=width - LOGO_SIZE[0] - LOGO_PADDING_RIGHT,
+        y=LOGO_PADDING_TOP,
+    )
+
+
+def create_highlight_video_ffmpeg(
+    video_paths,
+    output_path,
+    box_score_data,
+    image_duration=5,
+    trim_clips=True,
+    render_profile=None,
+):
+    """
+    Creates the same highlight video as VideoEditor.create_highlight_video with a single ffmpeg run.
+
+    The intro, the trimmed game clips and the stats images are scaled,
+    concatenated and overlaid with the logo in one filtergraph, so the
+    frames are decoded and encoded by ffmpeg without going through Python.
+
+    Parameters:
+        video_paths (list): List of paths to video files.
+        output_path (str): Directory to save the final video in.
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips like trim_clip. Pass False for preprocessed clips.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        str: Path of the final video, or None if it could not be rendered.
+    """
+    render_profile = render_profile or get_render_profile()
+    final_video_path = f"{output_path}/final_highlight_logo.mp4"
+    temp_path = f"{output_path}/final_highlight_logo.part.mp4"
+    try:
+        video_paths = sorted(video_paths)
+        width, height = ffmpeg_parse_infos(video_paths[0])["video_size"]
+        logger.console(f"Width: {width}, Height: {height}")
+
+        segments = build_highlight_segments(
+            video_paths, box_score_data, output_path, width, height, image_duration, trim_clips
+        )
+        joined = ffmpeg.concat(
+            *[stream for segment in segments for stream in segment], v=1, a=1
+        ).node
+        video = add_logo(joined[0], width)
+
+        (
+            ffmpeg.output(
+                video,
+                joined[1],
+                temp_path,
+                pix_fmt="yuv420p",
+                r=CLIP_FPS,
+                **render_profile.ffmpeg_params(),
+            )
+            .overwrite_output()
+            .run(quiet=True)
+        )
+        os.replace(temp_path, final_video_path)
+        return final_video_path
+    except ffmpeg.Error as e:
+        logger.error(f"ffmpeg failed to render the highlight video: {e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+    finally:
+        # Only left behind when the render failed
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return None
+
+
+def concatenate_clips(video_paths, output_video_path, render_profile=None):
+    """
+    Joins clips end to end in a single ffmpeg run, without the intro, logo or stats images.
+
+    Every clip is fitted to the size of the first one and clips without an
+    audio track get silence, so clips of different sources can be joined.
+
+    Parameters:
+        video_paths (list): Paths of the clips, in playing order.
+        output_video_path (str): Path to save the joined video.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        str: Path of the joined video, or None if it could not be rendered.
+    """
+    render_profile = render_profile or get_render_profile()
+    temp_path = os.path.splitext(output_video_path)[0] + ".part.mp4"
+    try:
+        width, height = ffmpeg_parse_infos(video_paths[0])["video_size"]
+        streams = []
+        for video_path in video_paths:
+            infos = ffmpeg_parse_infos(video_path)
+            clip = ffmpeg.input(video_path)
+            audio = (
+                _normalize_audio(clip.audio.filter("apad").filter("atrim", duration=infos["duration"]))
+                if infos.get("audio_found")
+                else _silence(infos["duration"])
+            )
+            streams.extend([_fit(clip.video, width, height), audio])
+        joined = ffmpeg.concat(*streams, v=1, a=1).node
+
+        (
+            ffmpeg.output(
+                joined[0],
+                joined[1],
+                temp_path,
+                pix_fmt="yuv420p",
+                r=CLIP_FPS,
+                **render_profile.ffmpeg_params(),
+            )
+            .overwrite_output()
+            .run(quiet=True)
+        )
+        os.replace(temp_path, output_video_path)
+        return output_video_path
+    except ffmpeg.Error as e:
+        logger.error(f"ffmpeg failed to join the clips: {e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+    finally:
+        # Only left behind when the join failed
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return None
+
+
+def probe_stream_parameters(path):
+    """
+    Reads the codec parameters that must match for clips to be concatenated without re-encoding.
+
+    Parameters:
+        path (str): Path to the video file.
+
+    Returns:
+        dict: The ``video`` and ``audio`` stream parameters, None for a missing stream.
+    """
+    streams = ffmpeg.probe(path)["streams"]
+    video = next((stream for stream in streams if stream["codec_type"] == "video"), None)
+    audio = next((stream for stream in streams if stream["codec_type"] == "audio"), None)
+    return {
+        "video": (
+            {
+                key: video.get(key)
+                for key in ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate")
+            }
+            if video
+            else None
+        ),
+        "audio": (
+            {key: audio.get(key) for key in ("codec_name", "sample_rate", "channels")}
+            if audio
+            else None
+        ),
+    }
+
+
+def are_clips_compatible(stream_parameters):
+    """
+    Checks whether clips can be stream copied into the same video.
+
+    Every clip must have H.264 video and AAC audio with identical parameters,
+    which is what the re-encoded intro and stats segments are encoded to.
+
+    Parameters:
+        stream_parameters (list): The probe_stream_parameters result of every clip.
+
+    Returns:
+        bool: True if the clips can be concatenated without re-encoding.
+    """
+    if not stream_parameters:
+        return False
+    first = stream_parameters[0]
+    if first["video"] is None or first["audio"] is None:
+        return False
+    if first["video"]["codec_name"] != "h264" or first["audio"]["codec_name"] != "aac":
+        return False
+    return all(parameters == first for parameters in stream_parameters[1:])
+
+
+def get_keyframe_times(path):
+    """
+    Lists the timestamps of the video keyframes from the packet flags, without decoding.
+
+    Parameters:
+        path (str): Path to the video file.
+
+    Returns:
+        list: The keyframe timestamps in seconds, in ascending order.
+    """
+    packets = ffmpeg.probe(
+        path, select_streams="v:0", show_entries="packet=pts_time,flags"
+    ).get("packets", [])
+    return sorted(
+        float(packet["pts_time"])
+        for packet in packets
+        if "K" in packet.get("flags", "") and packet.get("pts_time") not in (None, "N/A")
+    )
+
+
+def plan_clip_cut(start, end, keyframe_times):
+    """
+    Splits a trimmed clip into a re-encoded head and a stream copied body.
+
+    A stream copy can only start on a keyframe, so the part between the cut
+    point and the next keyframe is re-encoded.
+
+    Parameters:
+        start (float): Start of the kept part, in seconds.
+        end (float): End of the kept part, in seconds.
+        keyframe_times (list): The keyframe timestamps of the clip.
+
+    Returns:
+        tuple: (encode_range, copy_range), each a (start, end) tuple or None.
+    """
+    keyframe = next(
+        (time for time in keyframe_times if time >= start - KEYFRAME_TOLERANCE), None
+    )
+    if keyframe is None or keyframe >= end - KEYFRAME_TOLERANCE:
+        return (start, end), None
+    if keyframe - start <= KEYFRAME_TOLERANCE:
+        return None, (keyframe, end)
+    return (start, keyframe), (keyframe, end)
+
+
+def _encode_segment(video, audio, path, parameters):
+    # Encodes a segment with the same codec parameters as the clips it is concatenated with
+    video_parameters = parameters["video"]
+    audio_parameters = parameters["audio"]
+    output_options = {
+        "vcodec": "libx264",
+        "pix_fmt": video_parameters["pix_fmt"],
+        "r": video_parameters["r_frame_rate"],
+        "acodec": "aac",
+        "ar": audio_parameters["sample_rate"],
+        "ac": audio_parameters["channels"],
+        "f": "mpegts",
+    }
+    profile = X264_PROFILES.get(video_parameters["profile"])
+    if profile:
+        output_options["profile:v"] = profile
+    ffmpeg.output(video, audio, path, **output_options).overwrite_output().run(quiet=True)
+
+
+def _copy_segment(input_path, start, end, path):
+    (
+        ffmpeg.input(input_path, ss=start, t=end - start)
+        .output(path, c="copy", **{"bsf:v": "h264_mp4toannexb"}, f="mpegts")
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def create_highlight_video_stream_copy(
+    video_paths, output_path, box_score_data, image_duration=5, trim_clips=True
+):
+    """
+    Creates the highlight video copying the game clips instead of re-encoding them.
+
+    When every clip has the same codec parameters, only the intro, the stats
+    images and the part of each clip before its first keyframe after the cut
+    point are encoded, matching the clips' parameters. Everything else is
+    stream copied and the segments are joined with the concat demuxer, so
+    assembling the body of the video runs at close to disk speed. The logo
+    is not overlaid, since burning it in would require re-encoding every
+    frame, so the video is written to ``final_highlight.mp4`` rather than
+    ``final_highlight_logo.mp4``. Incompatible clips fall back to
+    create_highlight_video_ffmpeg, which writes the logo version.
+
+    Parameters:
+        video_paths (list): List of paths to video files.
+        output_path (str): Directory to save the final video in.
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips like trim_clip. Pass False for preprocessed clips.
+
+    Returns:
+        str: Path of the final video, or None if it could not be rendered.
+    """
+    video_paths = sorted(
+        path
+        for path in video_paths
+        if os.path.basename(path)[0].isnumeric() and path.endswith(".mp4")
+    )
+    try:
+        stream_parameters = [probe_stream_parameters(path) for path in video_paths]
+    except ffmpeg.Error as e:
+        logger.error(f"Could not probe the clips: {e.stderr.decode(errors='replace')}")
+        stream_parameters = []
+    except FileNotFoundError:
+        logger.error("ffprobe is not installed, the clips cannot be stream copied")
+        stream_parameters = []
+    if not are_clips_compatible(stream_parameters):
+        logger.console("Clips do not share codec parameters, re-encoding the whole video")
+        return create_highlight_video_ffmpeg(
+            video_paths, output_path, box_score_data, image_duration, trim_clips
+        )
+
+    parameters = stream_parameters[0]
+    width, height = parameters["video"]["width"], parameters["video"]["height"]
+    fps = parameters["video"]["r_frame_rate"]
+    pix_fmt = parameters["video"]["pix_fmt"]
+    sample_rate = int(parameters["audio"]["sample_rate"])
+    channels = parameters["audio"]["channels"]
+    segments_directory = os.path.join(output_path, SEGMENTS_DIR)
+    os.makedirs(segments_directory, exist_ok=True)
+    segment_paths = []
+    copied_seconds = 0
+    encoded_seconds = 0
+
+    def next_segment_path():
+        segment_paths.append(
+            os.path.join(segments_directory, f"{len(segment_paths):04d}.ts")
+        )
+        return segment_paths[-1]
+
+    try:
+        intro_duration = ffmpeg_parse_infos(INTRO_VIDEO_PATH)["duration"]
+        _encode_segment(
+            _fit(
+                ffmpeg.input(get_asset_cache().get_resized(INTRO_VIDEO_PATH, width, height)).video,
+                width,
+                height,
+                fps,
+                pix_fmt,
+            ),
+            _faded_audio(
+                INTRO_AUDIO_PATH, INTRO_AUDIO_FADEOUT, intro_duration, sample_rate, channels
+            ),
+            next_segment_path(),
+            parameters,
+        )
+        encoded_seconds += intro_duration
+
+        for videopath in video_paths:
+            duration = ffmpeg_parse_infos(videopath)["duration"]
+            start, end = (
+                get_clip_trim_range(duration, MAX_DURATION) if trim_clips else (0, duration)
+            )
+            encode_range, copy_range = plan_clip_cut(start, end, get_keyframe_times(videopath))
+            if encode_range:
+                clip = ffmpeg.input(
+                    videopath, ss=encode_range[0], t=encode_range[1] - encode_range[0]
+                )
+                _encode_segment(clip.video, clip.audio, next_segment_path(), parameters)
+                encoded_seconds += encode_range[1] - encode_range[0]
+            if copy_range:
+                _copy_segment(videopath, *copy_range, next_segment_path())
+                copied_seconds += copy_range[1] - copy_range[0]
+
+        stats_image_paths = create_stats_images(box_score_data, output_path)
+        if stats_image_paths:
+            for image_path, audio in zip(
+                stats_image_paths,
+                [
+                    _faded_audio(
+                        OUTRO_AUDIO_PATH, OUTRO_AUDIO_FADEOUT, image_duration, sample_rate, channels
+                    ),
+                    _silence(image_duration, sample_rate, channels),
+                ],
+            ):
+                image = ffmpeg.input(image_path, loop=1, t=image_duration, framerate=fps)
+                _encode_segment(
+                    _fit(image.video, width, height, fps, pix_fmt),
+                    audio,
+                    next_segment_path(),
+                    parameters,
+                )
+                encoded_seconds += image_duration
+
+        final_video_path = f"{output_path}/final_highlight.mp4"
+        join_segments(segment_paths, segments_directory, final_video_path)
+        logger.console(
+            f"Stream copied {copied_seconds:.1f}s and encoded {encoded_seconds:.1f}s of video"
+        )
+        return final_video_path
+    except ffmpeg.Error as e:
+        logger.error(f"ffmpeg failed to render the highlight video: {e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+    finally:
+        shutil.rmtree(segments_directory, ignore_errors=True)
+    return None
+
+
+def _encode_logo_segment(segment, segment_path, width, render_profile):
+    # Burns the logo into a segment and encodes it with the settings shared by every segment
+    video, audio = segment
+    (
+        ffmpeg.output(
+            add_logo(video, width),
+            audio,
+            segment_path,
+            pix_fmt="yuv420p",
+            r=CLIP_FPS,
+            **render_profile.ffmpeg_params(),
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def create_highlight_video_segmented(
+    video_paths,
+    output_path,
+    box_score_data,
+    image_duration=5,
+    trim_clips=True,
+    render_profile=None,
+    workers=None,
+):
+    """
+    Creates the same highlight video as create_highlight_video_ffmpeg, encoding its segments in parallel.
+
+    The intro, every game clip and every stats image are independent
+    segments of the timeline. Each one gets the logo and is encoded by its
+    own ffmpeg process, starting on a keyframe, so the segments can be
+    joined with stream copy and a reel of many clips uses every core.
+
+    Parameters:
+        video_paths (list): List of paths to video files.
+        output_path (str): Directory to save the final video in.
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips like trim_clip. Pass False for preprocessed clips.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+        workers (int, optional): Number of segments encoded at the same time. Defaults to the number of cores.
+
+    Returns:
+        str: Path of the final video, or None if it could not be rendered.
+    """
+    workers = workers or os.cpu_count()
+    render_profile = render_profile or get_render_profile()
+    if not render_profile.threads:
+        # Split the cores between the encoders running at the same time
+        render_profile = render_profile.with_threads(max(os.cpu_count() // workers, 1))
+    segments_directory = os.path.join(output_path, SEGMENTS_DIR)
+    try:
+        video_paths = sorted(video_paths)
+        width, height = ffmpeg_parse_infos(video_paths[0])["video_size"]
+        logger.console(f"Width: {width}, Height: {height}")
+        segments = build_highlight_segments(
+            video_paths, box_score_data, output_path, width, height, image_duration, trim_clips
+        )
+        os.makedirs(segments_directory, exist_ok=True)
+        segment_paths = [
+            # Every segment has identical encoder settings, so MP4 segments concatenate cleanly
+            os.path.join(segments_directory, f"{index:04d}.mp4")
+            for index in range(len(segments))
+        ]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Each worker only waits on its ffmpeg process, the encoding itself runs outside Python
+            list(
+                executor.map(
+                    lambda segment, segment_path: _encode_logo_segment(
+                        segment, segment_path, width, render_profile
+                    ),
+                    segments,
+                    segment_paths,
+                )
+            )
+        final_video_path = f"{output_path}/final_highlight_logo.mp4"
+        join_segments(segment_paths, segments_directory, final_video_path)
+        logger.console(
+            f"Encoded {len(segments)} segments with {workers} workers using the {render_profile.name} profile"
+        )
+        return final_video_path
+    except ffmpeg.Error as e:
+        logger.error(f"ffmpeg failed to render the highlight video: {e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+    finally:
+        shutil.rmtree(segments_directory, ignore_errors=True)
+    return None
+
+
+def create_highlight_video_incremental(
+    video_paths,
+    output_path,
+    box_score_data,
+    image_duration=5,
+    trim_clips=True,
+    render_profile=None,
+    workers=None,
+):
+    """
+    Creates the same highlight video as create_highlight_video_segmented, reusing the segments of earlier builds.
+
+    The encoded segments are kept in the game directory with a build
+    manifest. Each segment is named after a key made of the hash of its
+    sources, its trim range, the video size, the logo and the encoder
+    settings, so a rebuild only encodes the segments whose key is new,
+    e.g. a play appended late, and joins everything with stream copy.
+    Segments no longer used are removed.
+
+    Parameters:
+        video_paths (list): List of paths to video files.
+        output_path (str): Directory to save the final video in.
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips like trim_clip. Pass False for preprocessed clips.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+        workers (int, optional): Number of segments encoded at the same time. Defaults to the number of cores.
+
+    Returns:
+        str: Path of the final video, or None if it could not be rendered.
+    """
+    workers = workers or os.cpu_count()
+    render_profile = render_profile or get_render_profile()
+    # The number of encoder threads does not change the segments, so it is not part of their key
+    encoder_settings = {
+        name: value for name, value in render_profile.ffmpeg_params().items() if name != "threads"
+    }
+    if not render_profile.threads:
+        # Split the cores between the encoders running at the same time
+        render_profile = render_profile.with_threads(max(os.cpu_count() // workers, 1))
+    build_directory = os.path.join(output_path, BUILD_DIR)
+    os.makedirs(build_directory, exist_ok=True)
+    manifest = BuildManifest(os.path.join(build_directory, BUILD_MANIFEST_FILENAME))
+    try:
+        video_paths = sorted(path for path in video_paths if _is_game_clip(path))
+        width, height = ffmpeg_parse_infos(video_paths[0])["video_size"]
+        logger.console(f"Width: {width}, Height: {height}")
+        shared_key_parts = [width, height, CLIP_FPS, encoder_settings, manifest.get_file_hash(LOGO_PATH)]
+
+        # (manifest record, function building the segment's streams) of every segment, in playing order
+        planned_segments = [
+            (
+                {
+                    "kind": "intro",
+                    "source": INTRO_VIDEO_PATH,
+                    "key": make_build_key(
+                        "intro",
+                        manifest.get_file_hash(INTRO_VIDEO_PATH),
+                        manifest.get_file_hash(INTRO_AUDIO_PATH),
+                        *shared_key_parts,
+                    ),
+                },
+                lambda: _build_intro_segment(width, height),
+            )
+        ]
+        for videopath in video_paths:
+            start, end = _get_trim_range(videopath, trim_clips)
+            planned_segments.append(
+                (
+                    {
+                        "kind": "clip",
+                        "source": videopath,
+                        "trim": [start, end],
+                        "key": make_build_key(
+                            "clip", manifest.get_file_hash(videopath), start, end, *shared_key_parts
+                        ),
+                    },
+                    lambda videopath=videopath, start=start, end=end: _build_clip_segment(
+                        videopath, width, height, start, end
+                    ),
+                )
+            )
+        stats_image_paths = create_stats_images(box_score_data, output_path) or []
+        for index, image_path in enumerate(stats_image_paths):
+            planned_segments.append(
+                (
+                    {
+                        "kind": "stats",
+                        "source": image_path,
+                        "key": make_build_key(
+                            "stats",
+                            manifest.get_file_hash(image_path),
+                            manifest.get_file_hash(OUTRO_AUDIO_PATH) if index == 0 else None,
+                            image_duration,
+                            *shared_key_parts,
+                        ),
+                    },
+                    lambda image_path=image_path, index=index: _build_stats_segment(
+                        image_path, width, height, image_duration, index == 0
+                    ),
+                )
+            )
+
+        segment_paths = []
+        # Keyed by segment key, identical clips share one segment
+        missing_segments = {}
+        for record, build in planned_segments:
+            record["path"] = os.path.join(build_directory, f"{record['key']}.mp4")
+            segment_paths.append(record["path"])
+            if not os.path.exists(record["path"]):
+                missing_segments[record["key"]] = (record, build)
+
+        def encode(record, build):
+            # Encoded under a temporary name so an interrupted build never leaves a partial segment
+            temp_path = os.path.join(build_directory, f"{record['key']}.part.mp4")
+            _encode_logo_segment(build(), temp_path, width, render_profile)
+            os.replace(temp_path, record["path"])
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda segment: encode(*segment), missing_segments.values()))
+
+        records = [record for record, _ in planned_segments]
+        final_video_path = f"{output_path}/final_highlight_logo.mp4"
+        if (
+            missing_segments
+            or manifest.output != final_video_path
+            or manifest.get_segment_keys() != [record["key"] for record in records]
+            or not os.path.exists(final_video_path)
+        ):
+            join_segments(segment_paths, build_directory, final_video_path)
+        manifest.save(records, final_video_path)
+
+        for filename in os.listdir(build_directory):
+            path = os.path.join(build_directory, filename)
+            if filename.endswith(".mp4") and path not in segment_paths:
+                os.remove(path)
+        logger.console(
+            f"Encoded {len(missing_segments)} of {len(records)} segments, "
+            f"reused {len(records) - len(missing_segments)} from earlier builds"
+        )
+        return final_video_path
+    except ffmpeg.Error as e:
+        logger.error(f"ffmpeg failed to render the highlight video: {e.stderr.decode(errors='replace')}")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+    return None
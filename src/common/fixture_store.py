@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from common.page_cache import PageCache
+from common.logger import logger
+
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+
+class FixtureMissingError(LookupError):
+    """
+    Raised in replay mode when a request was never recorded.
+    """
+
+
+class FixtureStore:
+    """
+    Records everything the NBA pipeline fetches and replays it without network.
+
+    In record mode the fetchers save every HTML page, ``__NEXT_DATA__`` payload,
+    scraping result and downloaded clip under ``directory``. In replay mode they
+    read them back instead of touching the network or a browser, and a missing
+    fixture raises FixtureMissingError rather than falling back to the network.
+
+    Files are stored as ``{directory}/{kind}/{key}{extension}``, where the key is
+    the same URL-derived key the page cache uses, and ``index.jsonl`` lists
+    which URL each file belongs to.
+
+    Attributes:
+        directory (str): Directory holding the fixtures.
+        mode (str): Either MODE_RECORD or MODE_REPLAY.
+    """
+
+    def __init__(self, directory, mode):
+        """
+        The constructor for FixtureStore class.
+
+        Parameters:
+            directory (str): Directory holding the fixtures.
+            mode (str): Either MODE_RECORD or MODE_REPLAY.
+        """
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unknown fixture store mode: {mode}")
+        if mode == MODE_REPLAY and not os.path.isdir(directory):
+            raise FileNotFoundError(f"Fixture directory {directory} does not exist.")
+        self.directory = directory
+        self.mode = mode
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def recording(self):
+        return self.mode == MODE_RECORD
+
+    @property
+    def replaying(self):
+        return self.mode == MODE_REPLAY
+
+    def _path(self, kind, url, extra, extension):
+        key = PageCache.make_key(url, namespace=kind, extra=extra)
+        return os.path.join(self.directory, kind, f"{key}{extension}")
+
+    def _write(self, kind, url, extra, path, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        os.close(fd)
+        write(temp_path)
+        os.replace(temp_path, path)
+        with self._lock:
+            with open(os.path.join(self.directory, "index.jsonl"), "a") as f:
+                f.write(
+                    json.dumps(
+                        {
+                            "kind": kind,
+                            "url": url,
+                            "extra": extra,
+                            "file": os.path.relpath(path, self.directory),
+                        }
+                    )
+                    + "\n"
+                )
+
+    def _read_path(self, kind, url, extra, extension):
+        path = self._path(kind, url, extra, extension)
+        if not os.path.exists(path):
+            raise FixtureMissingError(f"No recorded {kind} for {url}")
+        return path
+
+    def save_page(self, url, content):
+        """
+        Records the body of a fetched page.
+
+        Parameters:
+            url (str): The URL of the page.
+            content (bytes): The page body.
+        """
+
+        def write(path):
+            with open(path, "wb") as f:
+                f.write(content)
+
+        self._write("pages", url, None, self._path("pages", url, None, ".html"), write)
+
+    def load_page(self, url):
+        """
+        Returns the recorded body of a page.
+
+        Raises:
+            FixtureMissingError: If the page was not recorded.
+        """
+        with open(self._read_path("pages", url, None, ".html"), "rb") as f:
+            return f.read()
+
+    def save_json(self, kind, url, data, extra=None):
+        """
+        Records a JSON-serializable result that was derived from a URL.
+
+        Parameters:
+            kind (str): Kind of result, e.g. "next_data" or "video_urls".
+            url (str): The URL the result was derived from.
+            data: The result.
+            extra (optional): JSON-serializable values the result also depends on (e.g. filters).
+        """
+
+        def write(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "extra": extra, "data": data}, f, ensure_ascii=False, indent=4)
+
+        self._write(kind, url, extra, self._path(kind, url, extra, ".json"), write)
+
+    def load_json(self, kind, url, extra=None):
+        """
+        Returns a recorded result.
+
+        Raises:
+            FixtureMissingError: If the result was not recorded.
+        """
+        with open(self._read_path(kind, url, extra, ".json"), encoding="utf-8") as f:
+            return json.load(f)["data"]
+
+    def save_file(self, url, source_path):
+        """
+        Records a downloaded file.
+
+        Parameters:
+            url (str): The URL the file was downloaded from.
+            source_path (str): Path of the downloaded file.
+        """
+        extension = os.path.splitext(source_path)[1]
+        self._write(
+            "files",
+            url,
+            None,
+            self._path("files", url, None, extension),
+            lambda path: shutil.copyfile(source_path, path),
+        )
+
+    def load_file(self, url, destination_path):
+        """
+        Copies a recorded download to ``destination_path``.
+
+        Raises:
+            FixtureMissingError: If the download was not recorded.
+        """
+        extension = os.path.splitext(destination_path)[1]
+        shutil.copyfile(
+            self._read_path("files", url, None, extension), destination_path
+        )
+        return destination_path
+
+
+_fixture_store = None
+
+
+def get_fixture_store():
+    """
+    Returns the active FixtureStore, or None when the pipeline runs live.
+    """
+    return _fixture_store
+
+
+def set_fixture_store(store):
+    """
+    Activates a FixtureStore for every fetcher, or deactivates it with None.
+    """
+    global _fixture_store
+    _fixture_store = store
+    if store is not None:
+        logger.console(f"Fixture store in {store.mode} mode: {store.directory}")
@@ -0,0 +1,134 @@
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from common.logger import logger
+
+STATUS_DONE = "done"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+
+class GameScheduler:
+    """
+    Processes several games concurrently with separate pools per kind of work.
+
+    Each game goes through an I/O stage (fetching, scraping, downloading) on a
+    thread pool and then a CPU stage (rendering) on a process pool, so one game
+    can render while the next ones are still being scraped. A game that raises
+    in either stage is recorded as failed without affecting the others.
+
+    Attributes:
+        io_workers (int): Number of games in their I/O stage at the same time.
+        cpu_workers (int): Number of games in their CPU stage at the same time.
+    """
+
+    def __init__(self, io_workers=2, cpu_workers=1, use_processes=True):
+        """
+        The constructor for GameScheduler class.
+
+        Parameters:
+            io_workers (int): Number of games in their I/O stage at the same time.
+            cpu_workers (int): Number of games in their CPU stage at the same time.
+            use_processes (bool): Whether the CPU stage runs in worker processes. When False
+                it runs on a thread pool, which avoids pickling the stage arguments.
+        """
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.use_processes = use_processes
+
+    def run(self, games, io_stage, cpu_stage):
+        """
+        Runs both stages for every game.
+
+        Parameters:
+            games (list): Tuples of (game name, game input).
+            io_stage (callable): Called as ``io_stage(game_input)`` on a thread. Returns the input
+                of the CPU stage, or None when there is nothing to render for the game.
+            cpu_stage (callable): Called as ``cpu_stage(cpu_input)``. Must be a module-level
+                function with picklable arguments when worker processes are used, which are
+                spawned rather than forked.
+
+        Returns:
+            dict: For every game name, its ``status``, the ``stage`` it stopped in, the
+                ``error`` message if it failed, and the seconds spent in each stage.
+        """
+        results = {
+            name: {"status": None, "stage": "io", "error": None, "io_seconds": None, "cpu_seconds": None}
+            for name, _ in games
+        }
+        if self.use_processes:
+            # Workers are started lazily while the I/O threads hold locks (logging, browsers,
+            # downloads), and a forked child could inherit one locked forever, so they are spawned
+            cpu_executor = ProcessPoolExecutor(
+                max_workers=self.cpu_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            cpu_executor = ThreadPoolExecutor(max_workers=self.cpu_workers)
+        started_at = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as io_executor, cpu_executor:
+            io_futures = {
+                io_executor.submit(_run_timed, io_stage, game_input): name
+                for name, game_input in games
+            }
+            cpu_futures = {}
+            pending = set(io_futures)
+            while pending:
+                done, pending = wait(pending, return_when="FIRST_COMPLETED")
+                for future in done:
+                    if future in io_futures:
+                        name = io_futures[future]
+                        try:
+                            cpu_input, seconds = future.result()
+                        except Exception as e:
+                            self._fail(results[name], name, e)
+                            continue
+                        results[name]["io_seconds"] = seconds
+                        if cpu_input is None:
+                            results[name]["status"] = STATUS_SKIPPED
+                            continue
+                        results[name]["stage"] = "cpu"
+                        logger.console(f"Game {name} scraped in {seconds:.1f}s, queued for rendering")
+                        cpu_future = cpu_executor.submit(_run_timed, cpu_stage, cpu_input)
+                        cpu_futures[cpu_future] = name
+                        pending.add(cpu_future)
+                    else:
+                        name = cpu_futures[future]
+                        try:
+                            _, seconds = future.result()
+                        except Exception as e:
+                            self._fail(results[name], name, e)
+                            continue
+                        results[name]["cpu_seconds"] = seconds
+                        results[name]["status"] = STATUS_DONE
+                        logger.console(f"Game {name} rendered in {seconds:.1f}s")
+
+        self._log_summary(results, time.monotonic() - started_at)
+        return results
+
+    @staticmethod
+    def _fail(result, name, error):
+        result["status"] = STATUS_FAILED
+        result["error"] = str(error)
+        logger.error(f"Game {name} failed in its {result['stage']} stage: {error}")
+        logger.error("".join(traceback.format_exception(error)))
+
+    @staticmethod
+    def _log_summary(results, elapsed):
+        statuses = [result["status"] for result in results.values()]
+        logger.console(
+            f"Processed {len(results)} games in {elapsed:.1f}s: "
+            f"{statuses.count(STATUS_DONE)} done, {statuses.count(STATUS_SKIPPED)} skipped, "
+            f"{statuses.count(STATUS_FAILED)} failed"
+        )
+        for name, result in results.items():
+            if result["status"] == STATUS_FAILED:
+                logger.console(f"  {name}: failed in {result['stage']} stage ({result['error']})")
+
+
+def _run_timed(stage, stage_input):
+    # Module-level so it can be sent to worker processes
+    started_at = time.monotonic()
+    result = stage(stage_input)
+    return result, time.monotonic() - started_at
@@ -0,0 +1,117 @@
+import json
+import os
+import tempfile
+import cv2
+import numpy as np
+from common.asset_cache import hash_file
+from common.build_manifest import make_build_key
+from common.utilities import get_files_in_directory
+from common.logger import logger
+
+DEFAULT_HSV_CACHE_PATH = "output/cache/hsv_range.json"
+DEFAULT_HSV_FACTOR = 0.8
+
+
+def merge_hsv_statistics(statistics, pixels):
+    """
+    Adds a batch of pixels to running per-channel statistics, using Chan's parallel form of Welford's algorithm.
+
+    Parameters:
+        statistics (tuple): The (count, mean, m2) of the pixels seen so far, m2 being the sum of
+            squared differences from the mean. Use (0, 0, 0) to start.
+        pixels (np.ndarray): The HSV pixels of the batch, one row per pixel.
+
+    Returns:
+        tuple: The (count, mean, m2) of all the pixels.
+    """
+    count, mean, m2 = statistics
+    pixels = pixels.reshape(-1, 3).astype(np.float64)
+    batch_count = len(pixels)
+    if batch_count == 0:
+        return statistics
+    batch_mean = pixels.mean(axis=0)
+    batch_m2 = ((pixels - batch_mean) ** 2).sum(axis=0)
+    total = count + batch_count
+    delta = batch_mean - mean
+    mean = mean + delta * batch_count / total
+    m2 = m2 + batch_m2 + delta**2 * count * batch_count / total
+    return total, mean, m2
+
+
+def compute_hsv_range(image_paths, factor=DEFAULT_HSV_FACTOR):
+    """
+    Computes the HSV range of the sample images, one image at a time.
+
+    Parameters:
+        image_paths (list): Paths of the sample images.
+        factor (float): Number of standard deviations the range extends on each side of the mean.
+
+    Returns:
+        tuple: The lower and upper bounds, as np.ndarray.
+
+    Raises:
+        ValueError: If the images have no pixels.
+    """
+    statistics = (0, 0, 0)
+    for image_path in image_paths:
+        hsv_image = cv2.cvtColor(cv2.imread(image_path), cv2.COLOR_BGR2HSV)
+        statistics = merge_hsv_statistics(statistics, hsv_image)
+    count, mean, m2 = statistics
+    if count == 0:
+        raise ValueError("No pixels to compute the HSV range from")
+    hsv_std = np.sqrt(m2 / count)
+    return mean - hsv_std * factor, mean + hsv_std * factor
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache_path, cache):
+    directory = os.path.dirname(cache_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Renamed into place so concurrent detections never read a partial file
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(cache, f, indent=4)
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_hsv_range(image_directory, factor=DEFAULT_HSV_FACTOR, cache_path=DEFAULT_HSV_CACHE_PATH):
+    """
+    Returns the HSV range of the sample images in a directory, computing it only when the samples change.
+
+    The range is stored in a JSON file under a key derived from the name
+    and content hash of every sample and from the factor, so adding,
+    removing or editing a sample computes it again.
+
+    Parameters:
+        image_directory (str): Directory with the sample images.
+        factor (float): Number of standard deviations the range extends on each side of the mean.
+        cache_path (str): Path of the JSON file the ranges are stored in.
+
+    Returns:
+        tuple: The lower and upper bounds, as np.ndarray.
+    """
+    image_paths = sorted(get_files_in_directory(image_directory))
+    key = make_build_key(
+        factor, [[os.path.basename(path), hash_file(path)] for path in image_paths]
+    )
+    cache = _load_cache(cache_path)
+    if key in cache:
+        return np.array(cache[key]["lower"]), np.array(cache[key]["upper"])
+
+    logger.console(f"Computing the HSV range of {len(image_paths)} images in {image_directory}")
+    lower_hsv, upper_hsv = compute_hsv_range(image_paths, factor)
+    logger.console(f"Lower HSV: {lower_hsv}, upper HSV: {upper_hsv}")
+    cache[key] = {"lower": lower_hsv.tolist(), "upper": upper_hsv.tolist()}
+    _save_cache(cache_path, cache)
+    return lower_hsv, upper_hsv
@@ -0,0 +1,381 @@
+import asyncio
+import atexit
+import importlib.util
+import random
+import threading
+import time
+import weakref
+import requests
+from requests.adapters import HTTPAdapter
+from common.logger import logger
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+}
+
+
+def get_retry_delay(attempt, backoff_factor, response=None, max_delay=30):
+    """
+    Computes how long to wait before retrying a request.
+
+    Honors a numeric Retry-After header, otherwise uses exponential backoff with
+    full jitter so concurrent workers do not retry in lockstep.
+
+    Parameters:
+        attempt (int): Zero-based number of the attempt that failed.
+        backoff_factor (float): Base delay in seconds.
+        response (optional): The failed response, if any.
+        max_delay (float): Upper bound for the delay, in seconds.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), max_delay)
+    return random.uniform(0, min(backoff_factor * 2**attempt, max_delay))
+
+
+class HttpMetrics:
+    """
+    Thread-safe request, retry and failure counters, kept the same way by HttpClient and AsyncHttpClient.
+
+    Connection reuse is not counted here, each client derives it from its
+    own connections in get_metrics.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "failures": self.failures,
+            }
+
+
+class HttpClient:
+    """
+    Synchronous HTTP client backed by a keep-alive connection pool.
+
+    Requests to the same host reuse their TCP/TLS connections, and responses
+    with a 429/5xx status or connection errors are retried with jittered
+    exponential backoff.
+
+    Attributes:
+        timeout (tuple): (connect, read) timeouts in seconds.
+        max_retries (int): Number of retries after the first attempt.
+        backoff_factor (float): Base delay for the exponential backoff, in seconds.
+        metrics (HttpMetrics): Request, retry and failure counters.
+    """
+
+    def __init__(
+        self,
+        timeout=DEFAULT_TIMEOUT,
+        max_retries=3,
+        backoff_factor=0.5,
+        pool_size=10,
+        headers=None,
+    ):
+        """
+        The constructor for HttpClient class.
+
+        Parameters:
+            timeout (tuple | float): (connect, read) timeouts in seconds.
+            max_retries (int): Number of retries after the first attempt.
+            backoff_factor (float): Base delay for the exponential backoff, in seconds.
+            pool_size (int): Number of connections kept alive per host.
+            headers (dict, optional): Headers sent with every request.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.metrics = HttpMetrics()
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0
+        )
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request, retrying on 429/5xx responses and connection errors.
+
+        Parameters:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Passed to requests.Session.request (e.g. stream, headers).
+
+        Returns:
+            requests.Response: The last response received. Its status is not checked
+                beyond the retry decision.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt failed without a response.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self.metrics.increment("requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt == self.max_retries:
+                    self.metrics.increment("failures")
+                    raise
+                delay = get_retry_delay(attempt, self.backoff_factor)
+                logger.info(f"Retrying {url} in {delay:.2f}s after error: {e}")
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    if response.status_code >= 400:
+                        self.metrics.increment("failures")
+                    return response
+                delay = get_retry_delay(attempt, self.backoff_factor, response)
+                logger.info(
+                    f"Retrying {url} in {delay:.2f}s after status code {response.status_code}"
+                )
+                response.close()
+            self.metrics.increment("retries")
+            time.sleep(delay)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def get_metrics(self):
+        """
+        Returns the request counters, including how often a pooled connection was reused.
+
+        Returns:
+            dict: The request, retry, failure and connection counters.
+        """
+        metrics = self.metrics.as_dict()
+        connections_opened = 0
+        pooled_requests = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                connections_opened += pool.num_connections
+                pooled_requests += pool.num_requests
+        metrics["connections_opened"] = connections_opened
+        metrics["connections_reused"] = max(pooled_requests - connections_opened, 0)
+        return metrics
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncHttpClient:
+    """
+    asyncio HTTP client with the same retry policy and counters as HttpClient.
+
+    Uses httpx with a shared connection pool (and HTTP/2 when the ``h2``
+    package is installed). Without httpx it falls back to running an
+    HttpClient in worker threads.
+
+    Attributes:
+        timeout (float): Request timeout in seconds.
+        max_retries (int): Number of retries after the first attempt.
+        backoff_factor (float): Base delay for the exponential backoff, in seconds.
+        metrics (HttpMetrics): Request, retry and failure counters.
+        connections_reused (int): Number of requests sent over a connection opened by an earlier one.
+    """
+
+    def __init__(
+        self,
+        timeout=30,
+        max_retries=3,
+        backoff_factor=0.5,
+        pool_size=10,
+        headers=None,
+        http2=True,
+    ):
+        """
+        The constructor for AsyncHttpClient class.
+
+        Parameters:
+            timeout (float): Request timeout in seconds.
+            max_retries (int): Number of retries after the first attempt.
+            backoff_factor (float): Base delay for the exponential backoff, in seconds.
+            pool_size (int): Maximum number of open connections.
+            headers (dict, optional): Headers sent with every request.
+            http2 (bool): Whether to negotiate HTTP/2 when the server and the ``h2`` package allow it.
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.metrics = HttpMetrics()
+        self.connections_reused = 0
+        self._seen_streams = weakref.WeakSet()
+        if httpx is not None:
+            self.http2 = http2 and importlib.util.find_spec("h2") is not None
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=timeout,
+                headers=headers or DEFAULT_HEADERS,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                ),
+            )
+            self._fallback_client = None
+        else:
+            self.http2 = False
+            self._client = None
+            self._fallback_client = HttpClient(
+                timeout=timeout,
+                max_retries=max_retries,
+                backoff_factor=backoff_factor,
+                pool_size=pool_size,
+                headers=headers,
+            )
+            self.metrics = self._fallback_client.metrics
+
+    def _track_connection(self, response):
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        try:
+            if stream in self._seen_streams:
+                # Only touched from the event loop, so no lock is needed
+                self.connections_reused += 1
+            else:
+                self._seen_streams.add(stream)
+        except TypeError:
+            # Stream implementations that do not support weak references are not tracked
+            pass
+
+    async def request(self, method, url, **kwargs):
+        """
+        Sends a request, retrying on 429/5xx responses and connection errors.
+
+        Parameters:
+            method (str): The HTTP method.
+            url (str): The URL to request.
+            **kwargs: Passed to httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response | requests.Response: The last response received.
+        """
+        if self._client is None:
+            return await asyncio.to_thread(
+                self._fallback_client.request, method, url, **kwargs
+            )
+        for attempt in range(self.max_retries + 1):
+            self.metrics.increment("requests")
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    self.metrics.increment("failures")
+                    raise
+                delay = get_retry_delay(attempt, self.backoff_factor)
+                logger.info(f"Retrying {url} in {delay:.2f}s after error: {e}")
+            else:
+                self._track_connection(response)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    if response.status_code >= 400:
+                        self.metrics.increment("failures")
+                    return response
+                delay = get_retry_delay(attempt, self.backoff_factor, response)
+                logger.info(
+                    f"Retrying {url} in {delay:.2f}s after status code {response.status_code}"
+                )
+            self.metrics.increment("retries")
+            await asyncio.sleep(delay)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def get_all(self, urls, **kwargs):
+        """
+        Fetches several URLs concurrently over the shared connection pool.
+
+        Parameters:
+            urls (list[str]): The URLs to fetch.
+            **kwargs: Passed to every request.
+
+        Returns:
+            list: One response (or the raised exception) per URL, in the same order.
+        """
+        return await asyncio.gather(
+            *(self.get(url, **kwargs) for url in urls), return_exceptions=True
+        )
+
+    def get_metrics(self):
+        if self._fallback_client is not None:
+            return self._fallback_client.get_metrics()
+        metrics = self.metrics.as_dict()
+        metrics["connections_reused"] = self.connections_reused
+        metrics["http2"] = self.http2
+        return metrics
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+        else:
+            self._fallback_client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def _log_and_close_client(client):
+    metrics = client.get_metrics()
+    logger.console(
+        f"HTTP client: {metrics['requests']} requests, {metrics['retries']} retries, "
+        f"{metrics['connections_reused']} reused connections"
+    )
+    client.close()
+
+
+def get_http_client():
+    """
+    Returns the process-wide HttpClient, creating it on first use.
+
+    Returns:
+        HttpClient: The shared client used by the crawlers and the downloader.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+            atexit.register(_log_and_close_client, _default_client)
+        return _default_client
@@ -1,12 +1,29 @@
 import numpy as np
-from common.utilities import get_files_in_directory
+from common.utilities import get_detections_path
+from common.utilities import is_up_to_date
+from common.ball_detector import BallDetector
+from common.ball_detector import get_yolo_model
+from common.ball_detector import DEFAULT_MODEL_SIZE
+from common.detection_sampler import detect_sampled_frames
+from common.detection_sampler import DEFAULT_FRAME_STRIDE
+from common.detection_sampler import DEFAULT_MAX_JUMP_RATIO
+from common.detection_sampler import DEFAULT_BATCH_SIZE
+from common.hsv_calibration import get_hsv_range
+from common.hsv_calibration import DEFAULT_HSV_FACTOR
 from common.logger import logger
+import bisect
+import json
 import math
-import torch
+import multiprocessing
 import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 import cv2
 
+ANNOTATED_VIDEO_FOURCC = "mp4v"
+BASKETBALL_SAMPLE_DIR = "resources/image/basketball_sample"
+
 # ci_build_and_not_headless = False
 # try:
 #     from cv2.version import ci_build, headless
@@ -33,30 +50,21 @@ class ImageProcessor:
         # Convert to HSV
         return cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
 
-    def get_average_hsv(self, image_directory, factor=0.8):
-        logger.console(f"Get Avergage HSV in directory {image_directory}")
-        image_paths = get_files_in_directory(image_directory)
-        logger.console(f"Found {len(image_paths)} images")
-        logger.console(image_paths)
-        # Load and convert all images to HSV
-        hsv_images = [self.load_and_convert_to_hsv(path) for path in image_paths]
-
-        # Combine all HSV values from all images
-        all_hsv_values = np.vstack([img.reshape(-1, 3) for img in hsv_images])
+    def get_average_hsv(self, image_directory, factor=DEFAULT_HSV_FACTOR):
+        """
+        Returns the HSV range of the basketball sample images, mean plus or minus factor standard deviations.
 
-        # Calculate the average HSV value
-        average_hsv = np.mean(all_hsv_values, axis=0)
+        The range is computed one image at a time and cached on disk until
+        the samples or the factor change, see get_hsv_range.
 
-        # Calculate the standard deviation or define a fixed threshold
-        hsv_std = np.std(all_hsv_values, axis=0)
+        Parameters:
+            image_directory (str): Directory with the sample images.
+            factor (float): Number of standard deviations the range extends on each side of the mean.
 
-        # Define your HSV range for detection
-        lower_hsv = average_hsv - hsv_std * factor  # Adjust 'factor' as needed
-        upper_hsv = average_hsv + hsv_std * factor
-        # Print out the determined range
-        print(f"Lower HSV: {lower_hsv}")
-        print(f"Upper HSV: {upper_hsv}")
-        return lower_hsv, upper_hsv
+        Returns:
+            tuple: The lower and upper bounds, as np.ndarray.
+        """
+        return get_hsv_range(image_directory, factor)
 
     def detect_basketball(self, frame, lower_hsv, upper_hsv, frame_number, fps):
         # Convert frame to HSV and create a mask
@@ -106,15 +114,69 @@ class ImageProcessor:
 
         return frame, detections
 
-    def detect_video_basketball(self, video_path):
+    def locate_basketballs(self, frames, lower_hsv, upper_hsv):
+        """
+        Returns the basketball x of each frame, or None where it is not found, using the HSV range.
+        """
+        balls = []
+        for frame in frames:
+            # A frame rate of 1 makes frame 0 the only timestamp detect_basketball can use
+            _, detections = self.detect_basketball(frame, lower_hsv, upper_hsv, 0, 1)
+            balls.append(detections.get(0))
+        return balls
+
+    def detect_video_basketball(
+        self,
+        video_path,
+        display=False,
+        annotated_output_path=None,
+        stride=DEFAULT_FRAME_STRIDE,
+        max_jump_ratio=DEFAULT_MAX_JUMP_RATIO,
+    ):
+        """
+        Detects the basketball in a video using the sample HSV range.
+
+        Runs headless by default: only a subset of the frames is sampled and
+        the rest is interpolated, see detect_sampled_frames.
+
+        Parameters:
+            video_path (str): Path to the video.
+            display (bool): Whether to show every frame with the detections in a window while
+                processing. Every frame is then processed.
+            annotated_output_path (str, optional): Path to write the video with the ball and the
+                9:16 viewport drawn on it, see display_x_coord_line_on_video.
+            stride (int): Distance in frames between the first samples when not displaying.
+            max_jump_ratio (float): Change of x, as a fraction of the frame width, that gets denser samples.
+
+        Returns:
+            dict: The ball x coordinate keyed by timestamp in milliseconds.
+        """
+        # Get lower_hsv and upper_hsv
+        lower_hsv, upper_hsv = self.get_average_hsv(BASKETBALL_SAMPLE_DIR)
+        if display:
+            basketball_detections = self._preview_video_basketball(
+                video_path, lower_hsv, upper_hsv
+            )
+        else:
+            basketball_detections = detect_sampled_frames(
+                video_path,
+                lambda frames: self.locate_basketballs(frames, lower_hsv, upper_hsv),
+                stride,
+                max_jump_ratio,
+            )
+        if annotated_output_path:
+            self.display_x_coord_line_on_video(
+                video_path, basketball_detections, output_path=annotated_output_path
+            )
+        return basketball_detections
+
+    def _preview_video_basketball(self, video_path, lower_hsv, upper_hsv):
+        # Detects the basketball in every frame, showing each one with its detections
         # Load your video
         cap = cv2.VideoCapture(video_path)
 
         # Get the frame rate of the video
         fps = cap.get(cv2.CAP_PROP_FPS)
-
-        # Get lower_hsv and upper_hsv
-        lower_hsv, upper_hsv = self.get_average_hsv("resources/image/basketball_sample")
         # Initialize a dictionary to hold timestamp (key) and X coordinate (value)
         basketball_detections = {}
 
@@ -148,163 +210,295 @@ class ImageProcessor:
             print(f"{timestamp}: {x_coord}")
         return basketball_detections
 
-    def detect_video_basketball_pytorch(self, video_path):
-        model = torch.hub.load("ultralytics/yolov5", "yolov5l", pretrained=True)
-
-        # Load video
-        cap = cv2.VideoCapture(video_path)
-
+    def detect_video_basketball_pytorch(
+        self,
+        video_path,
+        model_size=DEFAULT_MODEL_SIZE,
+        batch_size=DEFAULT_BATCH_SIZE,
+        threads=None,
+        stride=DEFAULT_FRAME_STRIDE,
+        max_jump_ratio=DEFAULT_MAX_JUMP_RATIO,
+        annotated_output_path=None,
+    ):
+        """
+        Detects the basketball in a video with YOLOv5, confirmed by the sample HSV range.
+
+        Runs headless on the CPU with a BallDetector, which loads the model once per process.
+        Only a subset of the frames is sampled and the rest is interpolated, see detect_sampled_frames.
+
+        Parameters:
+            video_path (str): Path to the video.
+            model_size (str): YOLOv5 size: n, s, m or l. Smaller is faster and less accurate.
+            batch_size (int): Number of frames sent to the model at once.
+            threads (int, optional): Number of threads torch may use. Defaults to torch's own.
+            stride (int): Distance in frames between the first samples. 1 runs the model on every frame.
+            max_jump_ratio (float): Change of x, as a fraction of the frame width, that gets denser samples.
+            annotated_output_path (str, optional): Path to write the video with the ball and the
+                9:16 viewport drawn on it, see display_x_coord_line_on_video.
+
+        Returns:
+            dict: The ball x coordinate keyed by timestamp in milliseconds.
+        """
         # Get lower_hsv and upper_hsv
-        lower_hsv, upper_hsv = self.get_average_hsv("resources/image/basketball_sample")
-
-        # Initialize a dictionary for detections
-        basketball_detections = {}
-
-        # Get the frame rate of the video
-        fps = cap.get(cv2.CAP_PROP_FPS)
-
-        frame_number = 0
-
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Detect objects in the frame
-            results = model(frame)
-
-            # Process and display results
-            for det in results.xyxy[0]:
-                # Extract the bounding box and class label
-                x1, y1, x2, y2, conf, cls_id = det
-                label = results.names[int(cls_id)]
-
-                # Filter for 'sports ball'
-                if label == "sports ball":
-                    # Inside YOLO detection loop after identifying 'sports ball'
-                    x1, y1, x2, y2 = map(int, det[:4])
-                    cropped_frame = frame[y1:y2, x1:x2]
-                    hsv_frame = cv2.cvtColor(cropped_frame, cv2.COLOR_BGR2HSV)
-                    mask = cv2.inRange(hsv_frame, lower_hsv, upper_hsv)
-
-                    # Morphological opening
-                    kernel = np.ones((5, 5), np.uint8)
-                    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
-
-                    # Find contours
-                    contours, _ = cv2.findContours(
-                        mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE
-                    )
-                    for contour in contours:
-                        # Draw circle on original frame
-                        (x, y), radius = cv2.minEnclosingCircle(contour)
-                        center = (
-                            int(x) + x1,
-                            int(y) + y1,
-                        )  # Adjust coordinates for original frame
-                        cv2.circle(frame, center, int(radius), (0, 255, 0), 2)
-                        # Calculate the timestamp for the current frame
-                        timestamp = int(
-                            round(frame_number / fps * 1000)
-                        )  # Convert to milliseconds
-
-                        # Store the x-coordinate of the detected basketball's center
-                        basketball_detections[timestamp] = center[0]
-
-                    # Draw a rectangle and put a label on the frame
-                    cv2.rectangle(
-                        frame, (int(x1), int(y1)), (int(x2), int(y2)), (255, 0, 0), 2
-                    )
-                    cv2.putText(
-                        frame,
-                        label,
-                        (int(x1), int(y1 - 10)),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.5,
-                        (255, 0, 0),
-                        2,
-                    )
+        lower_hsv, upper_hsv = self.get_average_hsv(BASKETBALL_SAMPLE_DIR)
+        detector = BallDetector(model_size, batch_size, threads)
+        basketball_detections = detector.detect_video(
+            video_path, lower_hsv, upper_hsv, stride, max_jump_ratio
+        )
+        if annotated_output_path:
+            self.display_x_coord_line_on_video(
+                video_path, basketball_detections, output_path=annotated_output_path
+            )
+        return basketball_detections
 
-            frame_number += 1
-            # Display the frame
-            cv2.imshow("Frame", frame)
-            if cv2.waitKey(1) == ord("q"):
-                break
+    def save_detections(self, video_path, basketball_detections):
+        """
+        Writes the basketball detections of a clip to the ``_detections.json`` file next to it.
 
-        cap.release()
-        cv2.destroyAllWindows()
-        # Outside the while loop
-        for timestamp, x_coord in basketball_detections.items():
-            print(f"{timestamp}: {x_coord}")
+        Parameters:
+            video_path (str): Path to the clip.
+            basketball_detections (dict): Ball x coordinate keyed by timestamp in milliseconds.
 
-        return basketball_detections
+        Returns:
+            str: Path of the detections file.
+        """
+        detections_path = get_detections_path(video_path)
+        # Written under a temporary name so an interrupted run is not taken as up to date
+        temp_path = detections_path + ".part"
+        with open(temp_path, "w") as f:
+            json.dump(basketball_detections, f, indent=4)
+        os.replace(temp_path, detections_path)
+        return detections_path
+
+    def detect_clips(
+        self,
+        video_paths,
+        workers=None,
+        use_yolo=True,
+        model_size=DEFAULT_MODEL_SIZE,
+        batch_size=DEFAULT_BATCH_SIZE,
+        stride=DEFAULT_FRAME_STRIDE,
+        max_jump_ratio=DEFAULT_MAX_JUMP_RATIO,
+    ):
+        """
+        Detects the basketball in many clips on a process pool and saves the detections next to each clip.
+
+        Every worker computes the HSV range and loads the YOLO model once,
+        then detects one clip at a time. When workers are forked, the model
+        is loaded before the pool starts so they share its weights instead
+        of each loading a copy. The cores are split between the workers'
+        torch threads. Clips whose ``_detections.json`` is newer than the
+        clip are skipped.
+
+        Parameters:
+            video_paths (list): Paths of the clips.
+            workers (int, optional): Number of clips detected at the same time. Defaults to the number of cores.
+            use_yolo (bool): Whether to detect with YOLOv5 or only with the HSV range.
+            model_size (str): YOLOv5 size: n, s, m or l.
+            batch_size (int): Number of frames sent to the model at once.
+            stride (int): Distance in frames between the first samples.
+            max_jump_ratio (float): Change of x, as a fraction of the frame width, that gets denser samples.
+
+        Returns:
+            dict: The path of each clip's detections file keyed by clip path, for the clips detected or up to date.
+        """
+        workers = workers or os.cpu_count()
+        detections_paths = {}
+        pending_paths = []
+        for video_path in video_paths:
+            if is_up_to_date(get_detections_path(video_path), video_path):
+                detections_paths[video_path] = get_detections_path(video_path)
+            else:
+                pending_paths.append(video_path)
+        logger.console(
+            f"Detecting the ball in {len(pending_paths)} clips with {workers} workers, "
+            f"{len(detections_paths)} already up to date"
+        )
+        if not pending_paths:
+            return detections_paths
+
+        if use_yolo and multiprocessing.get_start_method() == "fork":
+            # Loaded once here, the forked workers share the weights copy-on-write
+            get_yolo_model(model_size)
+        started_at = time.monotonic()
+        total_frames = 0
+        detected = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_detection_worker,
+            initargs=(use_yolo, model_size, batch_size, max(os.cpu_count() // workers, 1)),
+        ) as executor:
+            futures = {
+                executor.submit(_detect_clip, video_path, stride, max_jump_ratio): video_path
+                for video_path in pending_paths
+            }
+            for future, video_path in futures.items():
+                try:
+                    stats = future.result()
+                    total_frames += stats["frames"]
+                    detections_paths[video_path] = stats["detections_path"]
+                    detected += 1
+                except Exception as e:
+                    failed += 1
+                    logger.error(f"Failed to detect the ball in {video_path}: {e}")
+
+        elapsed = time.monotonic() - started_at
+        logger.console(
+            f"Detected the ball in {detected} clips ({failed} failed) in {elapsed:.1f}s "
+            f"({total_frames / elapsed if elapsed > 0 else 0:.1f} fps overall)"
+        )
+        return detections_paths
 
     def draw_line_at_x(self, frame, x_coord):
         """Draw a blue vertical line at the specified X coordinate."""
         height = frame.shape[0]
         cv2.line(frame, (x_coord, 0), (x_coord, height), (255, 0, 0), 2)
 
-    def display_x_coord_line_on_video(self, video_path, x_coordinates):
+    def display_x_coord_line_on_video(
+        self, video_path, x_coordinates, display=False, output_path=None
+    ):
+        """
+        Draws the basketball's x coordinate and the 9:16 viewport following it on every frame of a video.
+
+        Runs headless by default: the annotated frames are written to
+        output_path with cv2.VideoWriter, at the speed frames are decoded.
+
+        Parameters:
+            video_path (str): Path to the video.
+            x_coordinates (dict): Ball x coordinate keyed by timestamp in milliseconds.
+            display (bool): Whether to also show the annotated frames in a window.
+            output_path (str, optional): Path to write the annotated video to.
+        """
+        if not (display or output_path):
+            logger.console("Pass display=True or an output_path to see the annotated video")
+            return
+        if not x_coordinates:
+            logger.console(f"No basketball detections to draw on {video_path}")
+            return
+
         # Load your video
         cap = cv2.VideoCapture(video_path)
 
         # Get video dimensions
-        ret, frame = cap.read()
-        video_height, video_width = frame.shape[:2]
-        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Reset to first frame
+        video_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        video_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        writer = None
+        if output_path:
+            writer = cv2.VideoWriter(
+                output_path,
+                cv2.VideoWriter_fourcc(*ANNOTATED_VIDEO_FOURCC),
+                cap.get(cv2.CAP_PROP_FPS),
+                (video_width, video_height),
+            )
 
         # Calculate new width for a 9:16 aspect ratio
         new_width = int(video_height * 9 / 16)
 
+        # Timestamps sorted once, so the closest one is found with a binary search on every frame
+        timestamps = sorted(x_coordinates)
+
         # Initialize the last known X coordinate
         last_known_x_coord = None
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Get the current timestamp in milliseconds
-            timestamp = int(cap.get(cv2.CAP_PROP_POS_MSEC))
-
-            # Find the closest timestamp in the dictionary
-            closest_timestamp = min(
-                x_coordinates.keys(), key=lambda k: abs(k - timestamp)
-            )
-
-            # Update the last known X coordinate if within the threshold
-            if abs(timestamp - closest_timestamp) < 100:  # 100 ms threshold
-                last_known_x_coord = x_coordinates[closest_timestamp]
+        try:
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
 
-            # Use the last known X coordinate if available
-            if last_known_x_coord is not None:
-                x_coord = last_known_x_coord
+                # Get the current timestamp in milliseconds
+                timestamp = int(cap.get(cv2.CAP_PROP_POS_MSEC))
 
-                # Calculate the viewport edges
-                left_edge = max(
-                    0, min(x_coord - new_width // 2, video_width - new_width)
+                # Find the closest timestamp in the dictionary
+                index = bisect.bisect_left(timestamps, timestamp)
+                closest_timestamp = min(
+                    timestamps[max(index - 1, 0) : index + 1],
+                    key=lambda k: abs(k - timestamp),
                 )
-                right_edge = left_edge + new_width
 
-                # Darken areas outside the viewport
-                frame[:, :left_edge] = frame[:, :left_edge] // 2  # Darken left side
-                frame[:, right_edge:] = frame[:, right_edge:] // 2  # Darken right side
+                # Update the last known X coordinate if within the threshold
+                if abs(timestamp - closest_timestamp) < 100:  # 100 ms threshold
+                    last_known_x_coord = x_coordinates[closest_timestamp]
 
-                # Draw vertical lines at the edges of the viewport
-                cv2.line(
-                    frame, (left_edge, 0), (left_edge, video_height), (0, 255, 0), 2
-                )
-                cv2.line(
-                    frame, (right_edge, 0), (right_edge, video_height), (0, 255, 0), 2
-                )
+                # Use the last known X coordinate if available
+                if last_known_x_coord is not None:
+                    x_coord = last_known_x_coord
 
-                # Draw the blue line at the basketball's position
-                self.draw_line_at_x(frame, x_coord)
+                    # Calculate the viewport edges
+                    left_edge = max(
+                        0, min(x_coord - new_width // 2, video_width - new_width)
+                    )
+                    right_edge = left_edge + new_width
 
-            cv2.imshow("Video", frame)
+                    # Darken areas outside the viewport
+                    frame[:, :left_edge] = frame[:, :left_edge] // 2  # Darken left side
+                    frame[:, right_edge:] = frame[:, right_edge:] // 2  # Darken right side
 
-            if cv2.waitKey(25) & 0xFF == ord("q"):
-                break
+                    # Draw vertical lines at the edges of the viewport
+                    cv2.line(
+                        frame, (left_edge, 0), (left_edge, video_height), (0, 255, 0), 2
+                    )
+                    cv2.line(
+                        frame, (right_edge, 0), (right_edge, video_height), (0, 255, 0), 2
+                    )
 
-        cap.release()
-        cv2.destroyAllWindows()
+                    # Draw the blue line at the basketball's position
+                    self.draw_line_at_x(frame, x_coord)
+
+                if writer:
+                    writer.write(frame)
+
+                if display:
+                    cv2.imshow("Video", frame)
+                    if cv2.waitKey(25) & 0xFF == ord("q"):
+                        break
+        finally:
+            cap.release()
+            if writer:
+                writer.release()
+                logger.console(f"Annotated video written to {output_path}")
+            if display:
+                cv2.destroyAllWindows()
+
+
+# State of each detect_clips worker process, set once by _init_detection_worker
+_worker_state = {}
+
+
+def _init_detection_worker(use_yolo, model_size, batch_size, threads):
+    image_processor = ImageProcessor()
+    _worker_state["image_processor"] = image_processor
+    _worker_state["hsv_range"] = image_processor.get_average_hsv(BASKETBALL_SAMPLE_DIR)
+    _worker_state["detector"] = (
+        BallDetector(model_size, batch_size, threads) if use_yolo else None
+    )
+
+
+def _detect_clip(video_path, stride, max_jump_ratio):
+    # Module-level so it can be sent to worker processes
+    image_processor = _worker_state["image_processor"]
+    lower_hsv, upper_hsv = _worker_state["hsv_range"]
+    detector = _worker_state["detector"]
+    started_at = time.monotonic()
+    if detector:
+        basketball_detections = detector.detect_video(
+            video_path, lower_hsv, upper_hsv, stride, max_jump_ratio
+        )
+    else:
+        basketball_detections = detect_sampled_frames(
+            video_path,
+            lambda frames: image_processor.locate_basketballs(frames, lower_hsv, upper_hsv),
+            stride,
+            max_jump_ratio,
+        )
+    elapsed = time.monotonic() - started_at
+    cap = cv2.VideoCapture(video_path)
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    detections_path = image_processor.save_detections(video_path, basketball_detections)
+    fps = frames / elapsed if elapsed > 0 else 0
+    logger.console(
+        f"Detected the ball in {len(basketball_detections)} of {frames} frames of "
+        f"{os.path.basename(video_path)} at {fps:.1f} fps"
+    )
+    return {"frames": frames, "seconds": round(elapsed, 2), "fps": round(fps, 1), "detections_path": detections_path}
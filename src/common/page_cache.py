@@ -0,0 +1,352 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.parse
+import requests
+from common.logger import logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CACHE_DIR = "output/cache/pages"
+DEFAULT_MAX_SIZE_BYTES = 1024 * 1024 * 1024
+DEFAULT_TTL = 5 * 60
+
+# NBA gameStatus values found in the game cards and box scores
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+TTL_SCHEDULED = 30 * 60
+TTL_LIVE = 60
+# Final games never change, their pages are kept until evicted
+TTL_FINAL = None
+
+IGNORED_QUERY_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_content"}
+
+
+def get_game_ttl(game_status):
+    """
+    Returns how long pages of a game may be served from the cache.
+
+    Parameters:
+        game_status (int): The NBA gameStatus (1 scheduled, 2 live, 3 final).
+
+    Returns:
+        int: TTL in seconds, or None for pages that never expire.
+    """
+    if game_status == GAME_STATUS_FINAL:
+        return TTL_FINAL
+    if game_status == GAME_STATUS_SCHEDULED:
+        return TTL_SCHEDULED
+    return TTL_LIVE
+
+
+def normalize_url(url, relevant_params=None):
+    """
+    Normalizes a URL so equivalent URLs share a cache entry.
+
+    Lowercases the scheme and host, drops the fragment and tracking parameters
+    and sorts the query parameters.
+
+    Parameters:
+        url (str): The URL to normalize.
+        relevant_params (list[str], optional): If given, only these query parameters are kept.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key not in IGNORED_QUERY_PARAMS
+        and (relevant_params is None or key in relevant_params)
+    ]
+    return urllib.parse.urlunsplit(
+        (
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path or "/",
+            urllib.parse.urlencode(sorted(query)),
+            "",
+        )
+    )
+
+
+def make_cached_response(url, content):
+    """
+    Wraps cached page content in a requests.Response so callers cannot tell it from a fetched page.
+    """
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers["X-Cache"] = "HIT"
+    return response
+
+
+class PageCache:
+    """
+    Persistent, size-bounded cache of fetched pages and scraping results.
+
+    Entries are indexed in SQLite by a key derived from the normalized URL,
+    while their bodies are stored once per content hash under ``blobs/``, so
+    identical payloads fetched from different URLs share the same file.
+    When the blobs exceed ``max_size_bytes`` the least recently used entries
+    are evicted. Bodies are zstd-compressed when the ``zstandard`` package is
+    installed.
+
+    Attributes:
+        directory (str): Directory holding the index and the blobs.
+        max_size_bytes (int): Maximum total size of the stored blobs.
+        compress (bool): Whether new bodies are zstd-compressed.
+    """
+
+    def __init__(
+        self,
+        directory=DEFAULT_CACHE_DIR,
+        max_size_bytes=DEFAULT_MAX_SIZE_BYTES,
+        compress=True,
+    ):
+        """
+        The constructor for PageCache class.
+
+        Parameters:
+            directory (str): Directory holding the index and the blobs.
+            max_size_bytes (int): Maximum total size of the stored blobs.
+            compress (bool): Whether new bodies are zstd-compressed, if zstandard is installed.
+        """
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.compress = compress and zstandard is not None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "blobs"), exist_ok=True)
+        self._connection = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"), check_same_thread=False
+        )
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    blob TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    compressed INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def make_key(url, namespace="page", extra=None, relevant_params=None):
+        """
+        Builds the cache key of a URL.
+
+        Parameters:
+            url (str): The URL the entry belongs to.
+            namespace (str): Kind of entry, so a page and a result scraped from it do not collide.
+            extra (optional): JSON-serializable values the entry also depends on (e.g. filters).
+            relevant_params (list[str], optional): Query parameters the entry depends on. Defaults to all.
+
+        Returns:
+            str: The hex digest identifying the entry.
+        """
+        key_source = json.dumps(
+            [namespace, normalize_url(url, relevant_params), extra], sort_keys=True
+        )
+        return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+    def _blob_path(self, blob):
+        return os.path.join(self.directory, "blobs", blob[:2], blob)
+
+    def get(self, url, namespace="page", extra=None, relevant_params=None):
+        """
+        Returns the cached body for a URL.
+
+        Parameters:
+            url (str): The URL the entry belongs to.
+            namespace (str): Kind of entry.
+            extra (optional): JSON-serializable values the entry also depends on.
+            relevant_params (list[str], optional): Query parameters the entry depends on. Defaults to all.
+
+        Returns:
+            bytes: The cached body, or None if it is missing or expired.
+        """
+        key = self.make_key(url, namespace, extra, relevant_params)
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT blob, compressed, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (row[2] is not None and row[2] < now):
+                self.misses += 1
+                return None
+            blob, compressed, _ = row
+            try:
+                with open(self._blob_path(blob), "rb") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._connection.commit()
+                self.misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits += 1
+        if compressed:
+            if zstandard is None:
+                logger.error(f"Cached entry for {url} is zstd-compressed but zstandard is not installed")
+                return None
+            content = zstandard.ZstdDecompressor().decompress(content)
+        return content
+
+    def put(self, url, content, ttl=DEFAULT_TTL, namespace="page", extra=None, relevant_params=None):
+        """
+        Stores the body of a URL.
+
+        Parameters:
+            url (str): The URL the entry belongs to.
+            content (bytes): The body to store.
+            ttl (int): Time in seconds the entry stays valid, None for no expiry.
+            namespace (str): Kind of entry.
+            extra (optional): JSON-serializable values the entry also depends on.
+            relevant_params (list[str], optional): Query parameters the entry depends on. Defaults to all.
+        """
+        key = self.make_key(url, namespace, extra, relevant_params)
+        blob = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(blob)
+        with self._lock:
+            existing = self._connection.execute(
+                "SELECT size, compressed FROM entries WHERE blob = ? LIMIT 1", (blob,)
+            ).fetchone()
+            if existing and os.path.exists(blob_path):
+                # Same content already stored for another URL
+                size, compressed = existing
+            else:
+                stored_content = (
+                    zstandard.ZstdCompressor().compress(content)
+                    if self.compress
+                    else content
+                )
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                # Write to a temporary file first so readers never see a partial blob
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(stored_content)
+                os.replace(temp_path, blob_path)
+                size, compressed = len(stored_content), self.compress
+            now = time.time()
+            self._connection.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (key, url, blob, size, compressed, stored_at, expires_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    url,
+                    blob,
+                    size,
+                    int(compressed),
+                    now,
+                    now + ttl if ttl is not None else None,
+                    now,
+                ),
+            )
+            self._connection.commit()
+            self._evict()
+
+    def set_ttl(self, url, ttl, namespace="page", extra=None, relevant_params=None):
+        """
+        Changes the expiry of an existing entry, counted from when it was stored.
+
+        Useful when the right TTL is only known after parsing the page (e.g. a final game).
+        """
+        key = self.make_key(url, namespace, extra, relevant_params)
+        with self._lock:
+            self._connection.execute(
+                "UPDATE entries SET expires_at = CASE WHEN ? IS NULL THEN NULL ELSE stored_at + ? END WHERE key = ?",
+                (ttl, ttl, key),
+            )
+            self._connection.commit()
+
+    def get_json(self, url, namespace, extra=None, relevant_params=None):
+        content = self.get(url, namespace, extra, relevant_params)
+        return json.loads(content) if content is not None else None
+
+    def put_json(self, url, data, namespace, ttl=DEFAULT_TTL, extra=None, relevant_params=None):
+        content = json.dumps(data, sort_keys=True).encode("utf-8")
+        self.put(url, content, ttl, namespace, extra, relevant_params)
+
+    def _evict(self):
+        blobs = self._connection.execute(
+            "SELECT blob, MAX(size), MAX(last_access) FROM entries GROUP BY blob ORDER BY MAX(last_access)"
+        ).fetchall()
+        total_size = sum(size for _, size, _ in blobs)
+        for blob, size, _ in blobs:
+            if total_size <= self.max_size_bytes:
+                break
+            self._connection.execute("DELETE FROM entries WHERE blob = ?", (blob,))
+            try:
+                os.remove(self._blob_path(blob))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+        self._connection.commit()
+
+    def get_stats(self):
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "size_bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_UNSET = object()
+_default_cache = _UNSET
+_default_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """
+    Returns the process-wide PageCache, creating it on first use.
+
+    Returns:
+        PageCache: The shared cache, or None if caching was disabled with set_page_cache(None).
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is _UNSET:
+            _default_cache = PageCache()
+        return _default_cache
+
+
+def set_page_cache(cache):
+    """
+    Replaces the process-wide PageCache.
+
+    Parameters:
+        cache (PageCache): The cache the fetchers should consult, or None to disable caching.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
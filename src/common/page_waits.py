@@ -0,0 +1,178 @@
+import threading
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import (
+    TimeoutException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+)
+
+DEFAULT_POLL_FREQUENCY = 0.1
+
+
+class WaitRecorder:
+    """
+    Collects how long each kind of page wait actually took.
+    """
+
+    def __init__(self):
+        """
+        The constructor for WaitRecorder class.
+        """
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name, seconds, timed_out=False):
+        with self._lock:
+            stats = self._waits.setdefault(
+                name, {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0}
+            )
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            if timed_out:
+                stats["timeouts"] += 1
+
+    def summary(self):
+        """
+        Summarizes the recorded waits.
+
+        Returns:
+            dict: For every wait name, its count, mean, max and total seconds and number of timeouts.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": stats["count"],
+                    "mean": round(stats["total"] / stats["count"], 3),
+                    "max": round(stats["max"], 3),
+                    "total": round(stats["total"], 3),
+                    "timeouts": stats["timeouts"],
+                }
+                for name, stats in self._waits.items()
+            }
+
+
+_default_recorder = WaitRecorder()
+
+
+def get_wait_recorder():
+    """
+    Returns the process-wide WaitRecorder used by the Selenium fetchers.
+    """
+    return _default_recorder
+
+
+class PageWaiter:
+    """
+    Waits on concrete page conditions instead of fixed sleeps.
+
+    Every wait returns as soon as its condition holds, gives up after its
+    timeout without raising, and records its duration in a WaitRecorder.
+
+    Attributes:
+        driver (webdriver.Chrome): The driver whose page is observed.
+        recorder (WaitRecorder): Where wait durations are recorded.
+    """
+
+    def __init__(self, driver, recorder=None, poll_frequency=DEFAULT_POLL_FREQUENCY):
+        """
+        The constructor for PageWaiter class.
+
+        Parameters:
+            driver (webdriver.Chrome): The driver whose page is observed.
+            recorder (WaitRecorder, optional): Where wait durations are recorded. Defaults to the shared recorder.
+            poll_frequency (float): Seconds between two checks of a condition.
+        """
+        self.driver = driver
+        self.recorder = recorder or get_wait_recorder()
+        self.poll_frequency = poll_frequency
+
+    def _wait(self, name, condition, timeout):
+        started_at = time.monotonic()
+        try:
+            result = WebDriverWait(
+                self.driver,
+                timeout,
+                poll_frequency=self.poll_frequency,
+                ignored_exceptions=(
+                    NoSuchElementException,
+                    StaleElementReferenceException,
+                ),
+            ).until(condition)
+            timed_out = False
+        except TimeoutException:
+            result = None
+            timed_out = True
+        self.recorder.record(name, time.monotonic() - started_at, timed_out)
+        return result
+
+    def wait_for_attribute_change(self, locator, attribute, previous_value, timeout=5):
+        """
+        Waits until an element's attribute is set to something other than ``previous_value``.
+
+        Parameters:
+            locator (tuple): Selenium locator of the element, e.g. ``(By.ID, "video")``.
+            attribute (str): Name of the attribute to observe.
+            previous_value (str): Value the attribute had before the triggering action.
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            str: The new attribute value, or None if it did not change in time.
+        """
+
+        def attribute_changed(driver):
+            value = driver.find_element(*locator).get_attribute(attribute)
+            return value if value and value != previous_value else False
+
+        return self._wait(f"{attribute}_change", attribute_changed, timeout)
+
+    def wait_for_attribute_value(self, locator, attribute, expected_value, timeout=5):
+        """
+        Waits until an element's attribute equals ``expected_value``.
+
+        Parameters:
+            locator (tuple): Selenium locator of the element.
+            attribute (str): Name of the attribute to observe.
+            expected_value (str): Value to wait for.
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            bool: True if the attribute reached the expected value in time.
+        """
+
+        def attribute_matches(driver):
+            return (
+                driver.find_element(*locator).get_attribute(attribute)
+                == expected_value
+            )
+
+        return bool(
+            self._wait(f"{attribute}={expected_value}", attribute_matches, timeout)
+        )
+
+    def wait_for_row_count_stable(self, locator, stable_for=0.5, timeout=5):
+        """
+        Waits until at least one row is present and the row count stops changing.
+
+        Parameters:
+            locator (tuple): Selenium locator matching every row.
+            stable_for (float): Time in seconds the count must stay unchanged.
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            int: The number of rows when the wait ended.
+        """
+        state = {"count": -1, "since": time.monotonic()}
+
+        def row_count_stable(driver):
+            count = len(driver.find_elements(*locator))
+            now = time.monotonic()
+            if count != state["count"]:
+                state["count"] = count
+                state["since"] = now
+                return False
+            return count > 0 and now - state["since"] >= stable_for
+
+        self._wait("row_count_stable", row_count_stable, timeout)
+        return max(state["count"], 0)
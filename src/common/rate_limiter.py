@@ -0,0 +1,48 @@
+import threading
+import time
+import urllib.parse
+
+
+class RateLimiter:
+    """
+    Spaces out requests to the same host so concurrent workers do not burst it.
+
+    Attributes:
+        requests_per_second (float): Maximum number of requests started per host each second.
+    """
+
+    def __init__(self, requests_per_second=1.0):
+        """
+        The constructor for RateLimiter class.
+
+        Parameters:
+            requests_per_second (float): Maximum number of requests started per host each second.
+                A value of 0 or None disables rate limiting.
+        """
+        self.requests_per_second = requests_per_second
+        self._lock = threading.Lock()
+        self._next_slot = {}
+
+    def wait(self, url):
+        """
+        Blocks until a request to the host of ``url`` is allowed to start.
+
+        Parameters:
+            url (str): URL about to be requested.
+
+        Returns:
+            float: Time spent waiting, in seconds.
+        """
+        if not self.requests_per_second:
+            return 0.0
+        host = urllib.parse.urlparse(url).netloc
+        interval = 1.0 / self.requests_per_second
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            # Reserve the slot before sleeping so other threads queue up behind it
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
@@ -0,0 +1,354 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import ffmpeg
+import numpy as np
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+from common.utilities import clean_basketball_coordinates
+from common.utilities import get_detections_path
+from common.utilities import is_up_to_date
+from common.video_editor import compute_camera_path
+from common.ffmpeg_renderer import concatenate_clips
+from common.render_profiles import get_render_profile
+from common.logger import logger
+
+VERTICAL_DIR = "vertical"
+VERTICAL_REEL_FILENAME = "vertical_highlight.mp4"
+
+
+def load_ball_positions(detections_path):
+    """
+    Loads basketball detections and keeps the positions used to drive the camera.
+
+    Parameters:
+        detections_path (str): Path to a JSON file of ball x coordinates keyed by timestamp in milliseconds.
+
+    Returns:
+        dict: The cleaned ball x coordinates keyed by timestamp in milliseconds.
+    """
+    with open(detections_path) as f:
+        basketball_detections = {int(k): v for k, v in json.load(f).items()}
+    return clean_basketball_coordinates(basketball_detections)
+
+
+def get_game_clips(directory):
+    """
+    Returns the downloaded clips of a game directory, in playing order.
+
+    Only the files starting with a number and ending with .mp4 are clips,
+    the rest are the rendered highlight videos.
+    """
+    return [
+        os.path.join(directory, filename)
+        for filename in sorted(os.listdir(directory))
+        if filename[0].isnumeric() and filename.endswith(".mp4")
+    ]
+
+
+def detect_ball_positions(video_path):
+    """
+    Detects the basketball in a clip and saves the detections next to it.
+
+    Parameters:
+        video_path (str): Path to the clip.
+
+    Returns:
+        str: Path of the detections file.
+    """
+    # ImageProcessor pulls in torch, so it is only loaded when a clip needs detecting
+    from common.image_processor import ImageProcessor
+
+    image_processor = ImageProcessor()
+    basketball_detections = image_processor.detect_video_basketball(video_path)
+    logger.console(
+        f"Detected {len(basketball_detections)} basketball frames in {os.path.basename(video_path)}"
+    )
+    return image_processor.save_detections(video_path, basketball_detections)
+
+
+def _read_frame(stream, buffer):
+    # Fills the buffer with the next frame, returns False at the end of the video
+    view = memoryview(buffer).cast("B")
+    filled = 0
+    while filled < len(view):
+        read = stream.readinto(view[filled:])
+        if not read:
+            return False
+        filled += read
+    return True
+
+
+def reframe_video(
+    video_path, output_path, ball_positions, ease_factor=0.05, render_profile=None
+):
+    """
+    Reframes a clip to 9:16 following the ball, piping raw frames between two ffmpeg processes.
+
+    Frames are decoded by one ffmpeg process into a preallocated buffer, the
+    crop window from compute_camera_path is applied by slicing, and the
+    cropped frame is copied into a second preallocated buffer that is
+    written to the encoder's stdin. No per-frame objects are created, so the
+    Python side only moves memory. The audio is taken from the original clip.
+
+    Parameters:
+        video_path (str): Path to the clip.
+        output_path (str): Path to save the vertical clip.
+        ball_positions (dict): Ball x coordinate keyed by timestamp in milliseconds.
+        ease_factor (float): Fraction of the distance to the ball the camera moves on each frame.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        dict: The number of ``frames`` written, the ``seconds`` taken and the resulting ``fps``.
+    """
+    render_profile = render_profile or get_render_profile()
+    infos = ffmpeg_parse_infos(video_path)
+    width, height = infos["video_size"]
+    fps = infos["video_fps"]
+    frame_count = infos["video_nframes"]
+    # Calculate the new width for a 9:16 aspect ratio, rounded down to an even width for yuv420p
+    new_width = int(height * 9 / 16) // 2 * 2
+    # Keep the camera centered when the ball was never found
+    ball_positions = ball_positions or {0: width // 2}
+    camera_path = compute_camera_path(
+        ball_positions, frame_count, fps, width, new_width, ease_factor
+    )
+
+    started_at = time.monotonic()
+    decoder = (
+        ffmpeg.input(video_path)
+        .output("pipe:", format="rawvideo", pix_fmt="rgb24")
+        .global_args("-loglevel", "error", "-nostats")
+        .run_async(pipe_stdout=True)
+    )
+    frames = ffmpeg.input(
+        "pipe:",
+        format="rawvideo",
+        pix_fmt="rgb24",
+        s=f"{new_width}x{height}",
+        framerate=fps,
+    )
+    streams = [frames.video]
+    if infos.get("audio_found"):
+        streams.append(ffmpeg.input(video_path).audio)
+    encoder = (
+        ffmpeg.output(*streams, output_path, pix_fmt="yuv420p", **render_profile.ffmpeg_params())
+        .global_args("-loglevel", "error", "-nostats")
+        .overwrite_output()
+        .run_async(pipe_stdin=True)
+    )
+
+    frame = np.empty((height, width, 3), dtype=np.uint8)
+    cropped = np.empty((height, new_width, 3), dtype=np.uint8)
+    frame_index = 0
+    try:
+        while _read_frame(decoder.stdout, frame):
+            current_x = camera_path[min(frame_index, frame_count - 1)]
+            np.copyto(cropped, frame[:, current_x : current_x + new_width])
+            encoder.stdin.write(cropped.data)
+            frame_index += 1
+    except BrokenPipeError:
+        # The encoder exited early, its return code is checked below
+        pass
+    finally:
+        for pipe in (encoder.stdin, decoder.stdout):
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+        decoder.wait()
+        encoder.wait()
+    if encoder.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed to encode {output_path}")
+
+    elapsed = time.monotonic() - started_at
+    return {
+        "frames": frame_index,
+        "seconds": round(elapsed, 2),
+        "fps": round(frame_index / elapsed, 1) if elapsed > 0 else 0,
+    }
+
+
+def _reframe_clip(video_path, output_path, ease_factor, render_profile):
+    # Module-level so it can be sent to worker processes
+    ball_positions = load_ball_positions(get_detections_path(video_path))
+    # Written under a temporary name so an interrupted run leaves no truncated clip behind
+    temp_path = os.path.splitext(output_path)[0] + ".part.mp4"
+    stats = reframe_video(video_path, temp_path, ball_positions, ease_factor, render_profile)
+    os.replace(temp_path, output_path)
+    logger.console(
+        f"Reframed {os.path.basename(video_path)}: {stats['frames']} frames at {stats['fps']} fps"
+    )
+    return stats
+
+
+def reframe_directory(
+    directory, output_directory=None, workers=None, ease_factor=0.05, render_profile=None
+):
+    """
+    Reframes every clip of a game directory that has basketball detections, using a process pool.
+
+    Parameters:
+        directory (str): Directory with the game clips and their ``_detections.json`` files.
+        output_directory (str, optional): Directory to save the vertical clips in. Defaults to
+            ``{directory}/vertical``.
+        workers (int, optional): Number of clips reframed at the same time. Defaults to the number of cores.
+        ease_factor (float): Fraction of the distance to the ball the camera moves on each frame.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        dict: The path of each vertical clip keyed by the path of its source clip.
+    """
+    output_directory = output_directory or os.path.join(directory, VERTICAL_DIR)
+    os.makedirs(output_directory, exist_ok=True)
+
+    video_paths = []
+    for video_path in get_game_clips(directory):
+        if not os.path.exists(get_detections_path(video_path)):
+            logger.console(f"Skipping {os.path.basename(video_path)}, it has no basketball detections")
+            continue
+        video_paths.append(video_path)
+
+    started_at = time.monotonic()
+    results = _reframe_clips_in_pool(
+        _reframe_clip, video_paths, output_directory, workers, ease_factor, render_profile
+    )
+    total_frames = sum(stats["frames"] for stats in results.values())
+
+    elapsed = time.monotonic() - started_at
+    logger.console(
+        f"Reframed {len(results)} of {len(video_paths)} clips in {elapsed:.1f}s "
+        f"({total_frames / elapsed if elapsed > 0 else 0:.1f} fps overall)"
+    )
+    return {
+        video_path: os.path.join(output_directory, os.path.basename(video_path))
+        for video_path in results
+    }
+
+
+def _reframe_clips_in_pool(
+    reframe_clip, video_paths, output_directory, workers, ease_factor, render_profile
+):
+    """
+    Runs a reframing function on every clip on a process pool.
+
+    The cores are split between the encoders running at the same time,
+    unless the render profile sets its own number of threads.
+
+    Parameters:
+        reframe_clip (callable): Module-level function called in a worker process as
+            ``reframe_clip(video_path, output_path, ease_factor, render_profile)``.
+        video_paths (list): Paths of the clips.
+        output_directory (str): Directory each output is written to, under the name of its clip.
+        workers (int, optional): Number of clips processed at the same time. Defaults to the number of cores.
+        ease_factor (float): Fraction of the distance to the ball the camera moves on each frame.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        dict: What reframe_clip returned for each clip, keyed by clip path. Clips that raised are
+            logged and left out.
+    """
+    workers = workers or os.cpu_count()
+    render_profile = render_profile or get_render_profile()
+    if not render_profile.threads:
+        # Split the cores between the encoders running at the same time
+        render_profile = render_profile.with_threads(max(os.cpu_count() // workers, 1))
+    logger.console(f"Reframing {len(video_paths)} clips with {workers} workers")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                reframe_clip,
+                video_path,
+                os.path.join(output_directory, os.path.basename(video_path)),
+                ease_factor,
+                render_profile,
+            ): video_path
+            for video_path in video_paths
+        }
+        for future, video_path in futures.items():
+            try:
+                results[video_path] = future.result()
+            except Exception as e:
+                logger.error(f"Failed to reframe {video_path}: {e}")
+    return results
+
+
+def _export_vertical_clip(video_path, output_path, ease_factor, render_profile):
+    # Module-level so it can be sent to worker processes, returns None when the clip is up to date
+    detections_path = get_detections_path(video_path)
+    if not is_up_to_date(detections_path, video_path):
+        detect_ball_positions(video_path)
+    if is_up_to_date(output_path, video_path, detections_path):
+        return None
+    # Written under a temporary name so an interrupted export is not taken as up to date
+    temp_path = os.path.splitext(output_path)[0] + ".part.mp4"
+    stats = reframe_video(
+        video_path, temp_path, load_ball_positions(detections_path), ease_factor, render_profile
+    )
+    os.replace(temp_path, output_path)
+    logger.console(
+        f"Reframed {os.path.basename(video_path)}: {stats['frames']} frames at {stats['fps']} fps"
+    )
+    return stats
+
+
+def export_vertical_game(
+    directory, output_directory=None, workers=None, ease_factor=0.05, render_profile=None
+):
+    """
+    Exports a 9:16 version of every clip of a game directory and joins them into a vertical reel.
+
+    Clips are processed in parallel on a process pool. Each one uses the
+    detections cached in its ``_detections.json`` file, running the
+    detection first when the file is missing or older than the clip.
+    Clips whose vertical version is newer than the clip and its detections
+    are skipped, and the reel is only rebuilt when one of its clips changed.
+
+    Parameters:
+        directory (str): Game directory, e.g. output/nba/videos/{date}/{game_slug}.
+        output_directory (str, optional): Directory to save the vertical clips and reel in.
+            Defaults to ``{directory}/vertical``.
+        workers (int, optional): Number of clips processed at the same time. Defaults to the number of cores.
+        ease_factor (float): Fraction of the distance to the ball the camera moves on each frame.
+        render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+
+    Returns:
+        dict: The vertical ``clips`` in playing order, the ``reel`` path (None if it could not be
+            rendered) and the number of clips ``rendered``, ``skipped`` and ``failed``.
+    """
+    output_directory = output_directory or os.path.join(directory, VERTICAL_DIR)
+    os.makedirs(output_directory, exist_ok=True)
+
+    video_paths = get_game_clips(directory)
+    logger.console(f"Exporting {len(video_paths)} vertical clips of {directory}")
+    started_at = time.monotonic()
+    results = _reframe_clips_in_pool(
+        _export_vertical_clip, video_paths, output_directory, workers, ease_factor, render_profile
+    )
+    clips = [
+        os.path.join(output_directory, os.path.basename(video_path))
+        for video_path in video_paths
+        if video_path in results
+    ]
+    rendered = sum(1 for stats in results.values() if stats is not None)
+    skipped = len(results) - rendered
+    failed = len(video_paths) - len(results)
+
+    reel_path = os.path.join(output_directory, VERTICAL_REEL_FILENAME)
+    if not clips:
+        reel_path = None
+    elif rendered or not is_up_to_date(reel_path, *clips):
+        reel_path = concatenate_clips(clips, reel_path, render_profile or get_render_profile())
+    logger.console(
+        f"Exported {rendered} vertical clips ({skipped} up to date, {failed} failed) "
+        f"in {time.monotonic() - started_at:.1f}s"
+    )
+    return {
+        "clips": clips,
+        "reel": reel_path,
+        "rendered": rendered,
+        "skipped": skipped,
+        "failed": failed,
+    }
@@ -0,0 +1,97 @@
+import os
+
+PROFILE_FAST_PREVIEW = "fast-preview"
+PROFILE_PUBLISH = "publish"
+PROFILE_ARCHIVE = "archive"
+
+
+class RenderProfile:
+    """
+    Encoder settings of a final render.
+
+    Every profile encodes with libx264 and AAC, which are available in any
+    ffmpeg build, so renders behave the same on every machine.
+
+    Attributes:
+        name (str): Name of the profile.
+        preset (str): x264 preset, trading encoding speed for compression.
+        crf (int): x264 constant rate factor, lower is higher quality.
+        threads (int): Encoder threads, 0 lets the encoder use every core.
+        audio_bitrate (str): AAC bitrate, e.g. "160k".
+    """
+
+    def __init__(self, name, preset, crf, audio_bitrate, threads=0):
+        """
+        The constructor for RenderProfile class.
+
+        Parameters:
+            name (str): Name of the profile.
+            preset (str): x264 preset, trading encoding speed for compression.
+            crf (int): x264 constant rate factor, lower is higher quality.
+            audio_bitrate (str): AAC bitrate, e.g. "160k".
+            threads (int): Encoder threads, 0 lets the encoder use every core.
+        """
+        self.name = name
+        self.preset = preset
+        self.crf = crf
+        self.audio_bitrate = audio_bitrate
+        self.threads = threads
+
+    def with_threads(self, threads):
+        """
+        Returns a copy of the profile using the given number of encoder threads.
+        """
+        return RenderProfile(self.name, self.preset, self.crf, self.audio_bitrate, threads)
+
+    def moviepy_params(self):
+        """
+        Returns the keyword arguments of moviepy's write_videofile for this profile.
+        """
+        return {
+            "codec": "libx264",
+            "preset": self.preset,
+            "threads": self.threads or os.cpu_count(),
+            "audio_codec": "aac",
+            "audio_bitrate": self.audio_bitrate,
+            "ffmpeg_params": ["-crf", str(self.crf)],
+        }
+
+    def ffmpeg_params(self):
+        """
+        Returns the output options of an ffmpeg-python output for this profile.
+        """
+        return {
+            "vcodec": "libx264",
+            "preset": self.preset,
+            "crf": self.crf,
+            "threads": self.threads,
+            "acodec": "aac",
+            "audio_bitrate": self.audio_bitrate,
+        }
+
+
+RENDER_PROFILES = {
+    PROFILE_FAST_PREVIEW: RenderProfile(PROFILE_FAST_PREVIEW, "ultrafast", 28, "96k"),
+    PROFILE_PUBLISH: RenderProfile(PROFILE_PUBLISH, "medium", 21, "160k"),
+    PROFILE_ARCHIVE: RenderProfile(PROFILE_ARCHIVE, "slow", 16, "320k"),
+}
+
+
+def get_render_profile(name=PROFILE_PUBLISH):
+    """
+    Returns a render profile by name.
+
+    Parameters:
+        name (str): One of the RENDER_PROFILES names.
+
+    Returns:
+        RenderProfile: The profile.
+
+    Raises:
+        ValueError: If there is no profile with that name.
+    """
+    if name not in RENDER_PROFILES:
+        raise ValueError(
+            f"Unknown render profile {name}, expected one of {', '.join(RENDER_PROFILES)}"
+        )
+    return RENDER_PROFILES[name]
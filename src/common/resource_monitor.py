@@ -0,0 +1,118 @@
+import os
+import resource
+import threading
+from common.logger import logger
+
+PROC_STATM_PATH = "/proc/self/statm"
+PROC_FD_DIR = "/proc/self/fd"
+
+
+def get_rss_bytes():
+    """
+    Returns the resident memory of the current process, or None if /proc is not available.
+    """
+    try:
+        with open(PROC_STATM_PATH) as f:
+            resident_pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return resident_pages * resource.getpagesize()
+
+
+def get_open_fd_count():
+    """
+    Returns the number of file descriptors open in the current process, or None if /proc is not available.
+    """
+    try:
+        return len(os.listdir(PROC_FD_DIR))
+    except OSError:
+        return None
+
+
+class ResourceMonitor:
+    """
+    Samples the memory and open file descriptors of the process while a block of code runs.
+
+    A background thread reads /proc at a fixed interval and keeps the
+    peaks, so short-lived spikes between two log lines are not missed.
+    The peak RSS of finished child processes, such as the ffmpeg readers
+    and writers, comes from getrusage.
+
+    Usage:
+        with ResourceMonitor("render") as monitor:
+            ...
+        monitor.get_stats()
+
+    Attributes:
+        name (str): Name of the monitored task, used in the log.
+        interval (float): Seconds between two samples.
+    """
+
+    def __init__(self, name, interval=0.2):
+        """
+        The constructor for ResourceMonitor class.
+
+        Parameters:
+            name (str): Name of the monitored task, used in the log.
+            interval (float): Seconds between two samples.
+        """
+        self.name = name
+        self.interval = interval
+        self.peak_rss_bytes = 0
+        self.peak_open_fds = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        rss_bytes = get_rss_bytes()
+        open_fds = get_open_fd_count()
+        if rss_bytes is not None:
+            self.peak_rss_bytes = max(self.peak_rss_bytes, rss_bytes)
+        if open_fds is not None:
+            self.peak_open_fds = max(self.peak_open_fds, open_fds)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.sample()
+
+    def get_stats(self):
+        """
+        Returns the peaks observed so far.
+
+        Returns:
+            dict: ``peak_rss_mb`` and ``peak_open_fds`` of this process and ``children_peak_rss_mb``,
+                the largest peak RSS of its finished child processes.
+        """
+        # ru_maxrss is in kilobytes on Linux
+        children_peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return {
+            "peak_rss_mb": round(self.peak_rss_bytes / 1024 / 1024, 1),
+            "peak_open_fds": self.peak_open_fds,
+            "children_peak_rss_mb": round(children_peak_rss / 1024, 1),
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.console(
+            f"{self.name}: peak RSS {stats['peak_rss_mb']} MB, {stats['peak_open_fds']} open fds at most, "
+            f"largest child process peak RSS {stats['children_peak_rss_mb']} MB"
+        )
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        self.log_stats()
@@ -20,8 +20,13 @@ from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 import json
 from parser.json_parser import JSONParser
-
-BUTTON_COOKIE_BANNER = "onetrust-accept-btn-handler"
+from common.driver_pool import get_driver_pool
+from common.http_client import get_http_client
+from common.page_cache import DEFAULT_TTL
+from common.page_cache import get_page_cache
+from common.page_cache import make_cached_response
+from common.fixture_store import get_fixture_store
+from common.page_waits import PageWaiter
 
 
 def test_twitter():
@@ -112,19 +117,41 @@ def get_files_in_directory(directory):
     return files
 
 
-def fetch_html_content(url):
+def fetch_html_content(url, http_client=None, page_cache=None, ttl=DEFAULT_TTL):
     """
     Fetches the HTML content of the given URL using a simple HTTP request.
+    Pages found in the page cache are served from disk without a request.
 
     Parameters:
         url (str): The URL to fetch the HTML content from.
+        http_client (HttpClient, optional): Client to send the request with. Defaults to the shared client.
+        page_cache (PageCache, optional): Cache to consult and fill. Defaults to the shared cache.
+        ttl (int): Time in seconds a fetched page stays valid in the cache, None for no expiry.
 
     Returns:
         requests.Response: The response object, or None if the fetch fails.
     """
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.replaying:
+        return make_cached_response(url, fixture_store.load_page(url))
+
+    page_cache = page_cache or get_page_cache()
+    if page_cache:
+        content = page_cache.get(url)
+        if content is not None:
+            logger.info(f"Serving {url} from the page cache")
+            if fixture_store:
+                fixture_store.save_page(url, content)
+            return make_cached_response(url, content)
+
+    http_client = http_client or get_http_client()
     try:
-        response = requests.get(url)
+        response = http_client.get(url)
         if response.status_code == 200:
+            if page_cache:
+                page_cache.put(url, response.content, ttl)
+            if fixture_store:
+                fixture_store.save_page(url, response.content)
             return response
         else:
             print(
@@ -136,7 +163,15 @@ def fetch_html_content(url):
         return None
 
 
-def fetch_dynamic_html_content(url, element_id, timeout=10, additional_wait_time=0):
+def fetch_dynamic_html_content(
+    url,
+    element_id,
+    timeout=10,
+    additional_wait_time=0,
+    driver_pool=None,
+    page_cache=None,
+    ttl=DEFAULT_TTL,
+):
     """
     Fetches the HTML content of a page with dynamic content (JavaScript loaded) using Selenium.
 
@@ -145,40 +180,183 @@ def fetch_dynamic_html_content(url, element_id, timeout=10, additional_wait_time
         element_id (str): The ID of a specific element to wait for, indicating the page has loaded.
         timeout (int): Maximum time to wait for the element to load.
         additional_wait_time (int): Additional time to wait after the element is found, in seconds.
+        driver_pool (DriverPool, optional): Pool to borrow the browser from. Defaults to the shared pool.
+        page_cache (PageCache, optional): Cache to consult and fill. Defaults to the shared cache.
+        ttl (int): Time in seconds the rendered page stays valid in the cache, None for no expiry.
 
     Returns:
         str: The HTML content of the page after dynamic content is loaded, or None if an error occurs.
     """
-    # Setup the WebDriver (this uses Chrome)
-    driver = webdriver.Chrome()
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.replaying:
+        return fixture_store.load_json("dynamic_pages", url, element_id)
+
+    page_cache = page_cache or get_page_cache()
+    if page_cache:
+        content = page_cache.get(url, namespace="dynamic_page", extra=element_id)
+        if content is not None:
+            if fixture_store:
+                fixture_store.save_json(
+                    "dynamic_pages", url, content.decode("utf-8"), element_id
+                )
+            return content.decode("utf-8")
 
-    try:
-        driver.get(url)
+    driver_pool = driver_pool or get_driver_pool()
 
-        # Wait for a specific element to be loaded
-        WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((By.ID, element_id))
-        )
+    with driver_pool.borrow() as session:
+        driver = session.driver
+        try:
+            driver.get(url)
+
+            # Wait for a specific element to be loaded
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.ID, element_id))
+            )
+
+            # Optional: wait a bit more if needed
+            time.sleep(additional_wait_time)
+
+            # Get the page source after dynamic content is loaded
+            html_content = driver.page_source
+            if page_cache:
+                page_cache.put(
+                    url,
+                    html_content.encode("utf-8"),
+                    ttl,
+                    namespace="dynamic_page",
+                    extra=element_id,
+                )
+            if fixture_store:
+                fixture_store.save_json("dynamic_pages", url, html_content, element_id)
+            return html_content
+        except TimeoutException:
+            print(f"Timeout while waiting for the element with ID {element_id} to load.")
+            return []
+        except WebDriverException as e:
+            print(f"Web driver error: {e}")
+            session.healthy = False
+            return []
+        except Exception as e:
+            print(f"Error fetching dynamic content: {e}")
+            return None
+
+
+def extract_video_entries_from_payload(payload):
+    """
+    Extracts the video URLs (and their play descriptions when available) from a video metadata JSON payload.
+
+    The NBA stats video endpoints return ``resultSets.Meta.videoUrls`` with the
+    clip URLs in the same order as ``resultSets.playlist``, which holds the play
+    descriptions. Any other payload is searched for ``.mp4`` URLs.
+
+    Parameters:
+        payload (dict | list): The decoded JSON response.
+
+    Returns:
+        list: A list of dicts with ``url`` and ``description`` (None if unknown) keys, in payload order.
+    """
+    result_sets = payload.get("resultSets") if isinstance(payload, dict) else None
+    if isinstance(result_sets, dict):
+        video_urls = JSONParser.extract_value(result_sets, ["Meta", "videoUrls"]) or []
+        playlist = result_sets.get("playlist") or []
+        entries = []
+        for idx, video_url_data in enumerate(video_urls):
+            url = (
+                video_url_data.get("lurl")
+                or video_url_data.get("murl")
+                or video_url_data.get("surl")
+            )
+            if not url:
+                continue
+            description = playlist[idx].get("dsc") if idx < len(playlist) else None
+            entries.append({"url": url, "description": description})
+        if entries:
+            return entries
+
+    entries = []
+    pending = [payload]
+    while pending:
+        value = pending.pop(0)
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, list):
+            pending.extend(value)
+        elif isinstance(value, str) and value.startswith("http") and ".mp4" in value:
+            if not any(entry["url"] == value for entry in entries):
+                entries.append({"url": value, "description": None})
+    return entries
+
+
+def fetch_video_entries_from_network_log(driver, url_keyword="/stats/video"):
+    """
+    Reads the video metadata responses the page loaded from the Chrome performance log.
+
+    The driver must have been started with performance logging enabled (see DriverPool).
+    Reading the log drains it, so entries from previous pages are not returned twice.
+
+    Parameters:
+        driver (webdriver.Chrome): The driver whose network traffic is inspected.
+        url_keyword (str): Substring identifying the video metadata requests.
+
+    Returns:
+        list: The video entries of every matching response, see extract_video_entries_from_payload.
+    """
+    entries = []
+    for log_entry in driver.get_log("performance"):
+        log = json.loads(log_entry["message"])["message"]
+        if log["method"] != "Network.responseReceived":
+            continue
+        response = log["params"].get("response", {})
+        if url_keyword not in response.get("url", ""):
+            continue
+        try:
+            body = driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": log["params"]["requestId"]}
+            )
+            entries += extract_video_entries_from_payload(json.loads(body["body"]))
+        except (WebDriverException, ValueError, KeyError) as e:
+            logger.info(f"Could not read video metadata response {response.get('url')}: {e}")
+    return entries
 
-        # Optional: wait a bit more if needed
-        time.sleep(additional_wait_time)
-
-        # Get the page source after dynamic content is loaded
-        html_content = driver.page_source
-        return html_content
-    except TimeoutException:
-        print(f"Timeout while waiting for the element with ID {element_id} to load.")
-        driver.quit()
-        return []
-    except WebDriverException as e:
-        print(f"Web driver error: {e}")
-        driver.quit()
-        return []
-    except Exception as e:
-        print(f"Error fetching dynamic content: {e}")
-        return None
-    finally:
-        driver.quit()
+
+def match_rows_to_video_entries(row_texts, entries):
+    """
+    Assigns captured video entries to table rows.
+
+    Entries whose description appears in a row's text are matched to that row.
+    When no entry has a description and there is exactly one entry per row,
+    they are matched by position.
+
+    Parameters:
+        row_texts (list[str]): Text of every row that has a video, in table order.
+        entries (list): Video entries, see extract_video_entries_from_payload.
+
+    Returns:
+        list: The video URL of each row, or None for rows that could not be matched.
+    """
+    if not any(entry["description"] for entry in entries):
+        if len(entries) == len(row_texts):
+            return [entry["url"] for entry in entries]
+        return [None] * len(row_texts)
+
+    unused_entries = list(entries)
+    row_video_urls = []
+    for row_text in row_texts:
+        row_text = row_text.lower()
+        matched_entry = next(
+            (
+                entry
+                for entry in unused_entries
+                if entry["description"] and entry["description"].lower() in row_text
+            ),
+            None,
+        )
+        if matched_entry:
+            unused_entries.remove(matched_entry)
+            row_video_urls.append(matched_entry["url"])
+        else:
+            row_video_urls.append(None)
+    return row_video_urls
 
 
 def fetch_video_urls_from_table(
@@ -189,86 +367,140 @@ def fetch_video_urls_from_table(
     keywords=None,
     wait_time=5,
     additional_wait_time=5,
+    driver_pool=None,
+    use_network_capture=True,
+    page_cache=None,
+    rate_limiter=None,
 ):
     """
     Fetches video URLs from a table on a web page using Selenium, with error handling.
 
+    When the browser records its network traffic, the URLs are first read from
+    the video metadata responses the page loaded, and only the rows that could
+    not be resolved that way are clicked.
+
     Parameters:
         page_url (str): URL of the page to load.
         table_class (str): Class of the table containing the video links.
         row_class (str): Class of the rows in the table to interact with.
         video_id (str): ID of the video element where the src is updated.
         keywords (list[str], optional): List of keywords to filter the rows.
-        wait_time (int): Time in seconds to wait for the video to load after each click.
-        additional_wait_time (int): Additional time to wait after the element is found, in seconds.
+        wait_time (int): Maximum time in seconds to wait for the video to load after each click.
+        additional_wait_time (int): Maximum time in seconds to wait for the rows to finish loading
+            after the table is found.
+        driver_pool (DriverPool, optional): Pool to borrow the browser from. Defaults to the shared pool.
+        use_network_capture (bool): Whether to read the URLs from the captured network traffic before clicking.
+        page_cache (PageCache, optional): Cache to consult and fill. Defaults to the shared cache.
+            The video URLs of an event never change, so they are cached without expiry.
+        rate_limiter (RateLimiter, optional): Limiter waited on before the page is loaded. Cached
+            results are returned without waiting.
 
     Returns:
         list: A list of video URLs, or an empty list if an error occurs.
     """
-    driver = webdriver.Chrome()
-
-    try:
-        driver.get(page_url)
-        # Handling the cookie banner
+    cache_extra = {"row_class": row_class, "keywords": keywords}
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.replaying:
+        return fixture_store.load_json("video_urls", page_url, cache_extra)
+
+    page_cache = page_cache or get_page_cache()
+    if page_cache:
+        cached_video_urls = page_cache.get_json(
+            page_url, namespace="video_urls", extra=cache_extra
+        )
+        if cached_video_urls:
+            if fixture_store:
+                fixture_store.save_json("video_urls", page_url, cached_video_urls, cache_extra)
+            return cached_video_urls
+
+    driver_pool = driver_pool or get_driver_pool()
+    if rate_limiter:
+        # Before borrowing the browser, so no browser sits idle while its worker waits
+        rate_limiter.wait(page_url)
+
+    with driver_pool.borrow() as session:
+        driver = session.driver
+        waiter = PageWaiter(driver)
+        video_rows_locator = (By.CSS_SELECTOR, f".{row_class}[data-has-video='true']")
+        use_network_capture = use_network_capture and session.captures_network
         try:
+            if use_network_capture:
+                # Drain the log so only this page's traffic is inspected
+                driver.get_log("performance")
+            driver.get(page_url)
+            # Handling the cookie banner, only the first page of each session shows it
+            driver_pool.dismiss_cookie_banner(session, wait_time)
+
+            # Wait for the table to load after handling cookie banner
             WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((By.ID, BUTTON_COOKIE_BANNER))
+                EC.presence_of_element_located((By.CLASS_NAME, table_class))
             )
-            close_cookie_banner_button = driver.find_element(
-                By.ID, BUTTON_COOKIE_BANNER
+            # The rows keep being added for a moment after the table itself shows up
+            waiter.wait_for_row_count_stable(
+                video_rows_locator, timeout=additional_wait_time
             )
-            close_cookie_banner_button.click()
         except TimeoutException:
-            print(
-                "No cookie banner found or timeout occurred while waiting for cookie banner."
-            )
-        except NoSuchElementException:
-            print("Cookie banner close button not found.")
-        except Exception as e:
-            print(f"Error while handling cookie banner: {e}")
+            print(f"Timeout while waiting for the table with class {table_class} to load.")
+            return []
+        except WebDriverException as e:
+            print(f"Web driver error: {e}")
+            session.healthy = False
+            return []
 
-        # Wait for the table to load after handling cookie banner
-        WebDriverWait(driver, wait_time).until(
-            EC.presence_of_element_located((By.CLASS_NAME, table_class))
-        )
-        # Optional: wait a bit more because sometimes the video takes time to load after clicking cookie banner
-        time.sleep(additional_wait_time)
-    except TimeoutException:
-        print(f"Timeout while waiting for the table with class {table_class} to load.")
-        driver.quit()
-        return []
-    except WebDriverException as e:
-        print(f"Web driver error: {e}")
-        driver.quit()
-        return []
-
-    video_urls = []
-    try:
-        video_rows = driver.find_elements(
-            By.CSS_SELECTOR, f".{row_class}[data-has-video='true']"
-        )
-        for row in video_rows:
-            # Check for keywords if provided
-            if keywords and not any(
-                keyword.lower() in row.text.lower() for keyword in keywords
+        video_urls = []
+        try:
+            video_rows = driver.find_elements(*video_rows_locator)
+            row_texts = [row.text for row in video_rows]
+            captured_video_urls = [None] * len(video_rows)
+            if use_network_capture:
+                captured_video_urls = match_rows_to_video_entries(
+                    row_texts, fetch_video_entries_from_network_log(driver)
+                )
+            captured_rows = 0
+            clicked_rows = 0
+            for row, row_text, captured_video_url in zip(
+                video_rows, row_texts, captured_video_urls
             ):
-                continue  # Skip this row if no keywords match
-
-            clickable_element = row.find_element(
-                By.CSS_SELECTOR, ".EventsTable_play__dtRDi"
-            )
-            ActionChains(driver).move_to_element(clickable_element).click().perform()
-            time.sleep(1)
-            video_url = driver.find_element(By.ID, video_id).get_attribute("src")
-            if video_url:
-                video_urls.append(video_url)
-    except NoSuchElementException as e:
-        print(f"Error finding elements: {e}")
-    except Exception as e:
-        print(f"An error occurred: {e}")
-    finally:
-        driver.quit()
+                # Check for keywords if provided
+                if keywords and not any(
+                    keyword.lower() in row_text.lower() for keyword in keywords
+                ):
+                    continue  # Skip this row if no keywords match
+
+                if captured_video_url:
+                    captured_rows += 1
+                    video_urls.append(captured_video_url)
+                    continue
+
+                clicked_rows += 1
+                clickable_element = row.find_element(
+                    By.CSS_SELECTOR, ".EventsTable_play__dtRDi"
+                )
+                previous_video_url = driver.find_element(By.ID, video_id).get_attribute(
+                    "src"
+                )
+                ActionChains(driver).move_to_element(clickable_element).click().perform()
+                video_url = waiter.wait_for_attribute_change(
+                    (By.ID, video_id), "src", previous_video_url, timeout=wait_time
+                )
+                # None when the click did not load a new video, the src still holds the previous row's
+                if video_url:
+                    video_urls.append(video_url)
+            if use_network_capture:
+                logger.info(
+                    f"Resolved {captured_rows} video urls from network traffic, clicked {clicked_rows} rows"
+                )
+        except NoSuchElementException as e:
+            print(f"Error finding elements: {e}")
+        except Exception as e:
+            print(f"An error occurred: {e}")
 
+    if page_cache and video_urls:
+        page_cache.put_json(
+            page_url, video_urls, namespace="video_urls", ttl=None, extra=cache_extra
+        )
+    if fixture_store:
+        fixture_store.save_json("video_urls", page_url, video_urls, cache_extra)
     return video_urls
 
 
@@ -283,6 +515,9 @@ def fetch_play_videos_from_play_by_play_table(
     keywords=None,
     wait_time=5,
     additional_wait_time=5,
+    driver_pool=None,
+    page_cache=None,
+    cache_ttl=DEFAULT_TTL,
 ):
     """
     Fetches the video events from a play-by-play table on a web page using Selenium, with error handling.
@@ -301,83 +536,111 @@ def fetch_play_videos_from_play_by_play_table(
     words_to_exclude (list[str], optional): List of words to exclude from row text matching.
     keywords (list[str], optional): List of keywords to filter the rows.
     wait_time (int): Time in seconds to wait for elements to load.
-    additional_wait_time (int): Additional time to wait after elements are found, in seconds.
+    additional_wait_time (int): Maximum time in seconds to wait for the rows to finish loading,
+        both after the table is found and after the "All" tab is clicked.
+    driver_pool (DriverPool, optional): Pool to borrow the browser from. Defaults to the shared pool.
+    page_cache (PageCache, optional): Cache to consult and fill. Defaults to the shared cache.
+    cache_ttl (int): Time in seconds the events stay valid in the cache, None for no expiry.
     """
-    driver = webdriver.Chrome()
+    cache_extra = [row_class, special_keywords, players, words_to_exclude, keywords]
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.replaying:
+        return fixture_store.load_json("play_by_play_events", page_url, cache_extra)
+
+    page_cache = page_cache or get_page_cache()
+    if page_cache:
+        cached_event_data = page_cache.get_json(
+            page_url, namespace="play_by_play_events", extra=cache_extra
+        )
+        if cached_event_data:
+            if fixture_store:
+                fixture_store.save_json(
+                    "play_by_play_events", page_url, cached_event_data, cache_extra
+                )
+            return cached_event_data
 
-    try:
-        driver.get(page_url)
-        # Handling the cookie banner
+    driver_pool = driver_pool or get_driver_pool()
+
+    with driver_pool.borrow() as session:
+        driver = session.driver
+        waiter = PageWaiter(driver)
+        rows_locator = (By.CSS_SELECTOR, f".{row_class}")
         try:
+            driver.get(page_url)
+            # Handling the cookie banner, only the first page of each session shows it
+            driver_pool.dismiss_cookie_banner(session, wait_time)
+
+            # Wait for the table to load after handling cookie banner
             WebDriverWait(driver, wait_time).until(
-                EC.presence_of_element_located((By.ID, BUTTON_COOKIE_BANNER))
+                EC.presence_of_element_located((By.CLASS_NAME, table_class))
             )
-            close_cookie_banner_button = driver.find_element(
-                By.ID, BUTTON_COOKIE_BANNER
-            )
-            close_cookie_banner_button.click()
+            # The rows keep being added for a moment after the table itself shows up
+            waiter.wait_for_row_count_stable(rows_locator, timeout=additional_wait_time)
+            # Looking for this button
+            # <button type="button" data-is-active-tab="false" class="GamePlayByPlay_tab__BboK4" style="width: 20%;">ALL</button>
+            try:
+                # Wait for the buttons to be present
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_all_elements_located(
+                        (By.CSS_SELECTOR, f"button.{button_all_class}")
+                    )
+                )
+
+                # Find and click the specific button with the text "ALL"
+                all_button_locator = (
+                    By.XPATH,
+                    f"//button[contains(@class, '{button_all_class}') and contains(text(), 'ALL')]",
+                )
+                all_button = driver.find_element(*all_button_locator)
+                logger.console("Clicking ALL button")
+                all_button.click()
+                waiter.wait_for_attribute_value(
+                    all_button_locator,
+                    "data-is-active-tab",
+                    "true",
+                    timeout=additional_wait_time,
+                )
+                # The table with all the events is re-rendered after the tab becomes active
+                waiter.wait_for_row_count_stable(
+                    rows_locator, timeout=additional_wait_time
+                )
+            except NoSuchElementException:
+                logger.error("Button with text 'ALL' not found")
+            except TimeoutException:
+                logger.error("Timeout waiting for buttons to be present")
+            except WebDriverException as e:
+                logger.error(f"Web driver error: {e}")
         except TimeoutException:
             logger.error(
-                "No cookie banner found or timeout occurred while waiting for cookie banner."
+                f"Timeout while waiting for the table with class {table_class} to load."
             )
-        except NoSuchElementException:
-            logger.error("Cookie banner close button not found.")
-        except Exception as e:
-            logger.error(f"Error while handling cookie banner: {e}")
-
-        # Wait for the table to load after handling cookie banner
-        WebDriverWait(driver, wait_time).until(
-            EC.presence_of_element_located((By.CLASS_NAME, table_class))
-        )
-        # Optional: wait a bit more because sometimes the video takes time to load after clicking cookie banner
-        time.sleep(additional_wait_time)
-        # Looking for this button
-        # <button type="button" data-is-active-tab="false" class="GamePlayByPlay_tab__BboK4" style="width: 20%;">ALL</button>
+            return []
+        except WebDriverException as e:
+            logger.error(f"Web driver error: {e}")
+            session.healthy = False
+            return []
+        video_play_by_play_event_data = []
         try:
-            # Wait for the buttons to be present
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, f"button.{button_all_class}")
-                )
+            video_rows = driver.find_elements(*rows_locator)
+            video_play_by_play_event_data = process_play_by_play_video_rows(
+                video_rows, special_keywords, players, words_to_exclude, keywords
             )
 
-            # Find and click the specific button with the text "ALL"
-            all_button = driver.find_element(
-                By.XPATH,
-                f"//button[contains(@class, '{button_all_class}') and contains(text(), 'ALL')]",
-            )
-            logger.console("Clicking ALL button")
-            all_button.click()
-        except NoSuchElementException:
-            logger.error("Button with text 'ALL' not found")
-        except TimeoutException:
-            logger.error("Timeout waiting for buttons to be present")
-        except WebDriverException as e:
-            logger.error(f"Web driver error: {e}")
-        # Optional: wait a bit more because sometimes the table with all the events takes time to load after clicking the "ALL" button
-        time.sleep(additional_wait_time)
-    except TimeoutException:
-        logger.error(
-            f"Timeout while waiting for the table with class {table_class} to load."
+        except Exception as e:
+            logger.error(f"An error occurred during row iteration: {e}")
+
+    if page_cache and video_play_by_play_event_data:
+        page_cache.put_json(
+            page_url,
+            video_play_by_play_event_data,
+            namespace="play_by_play_events",
+            ttl=cache_ttl,
+            extra=cache_extra,
         )
-        driver.quit()
-        return []
-    except WebDriverException as e:
-        logger.error(f"Web driver error: {e}")
-        driver.quit()
-        return []
-    video_play_by_play_event_data = []
-    try:
-        video_rows = driver.find_elements(By.CSS_SELECTOR, f".{row_class}")
-        video_play_by_play_event_data = process_play_by_play_video_rows(
-            video_rows, special_keywords, players, words_to_exclude, keywords
+    if fixture_store:
+        fixture_store.save_json(
+            "play_by_play_events", page_url, video_play_by_play_event_data, cache_extra
         )
-
-    except Exception as e:
-        logger.error(f"An error occurred during row iteration: {e}")
-    finally:
-        driver.quit()
-
     return video_play_by_play_event_data
 
 
@@ -438,6 +701,91 @@ def process_play_by_play_video_rows(
     return video_play_by_play_event_data
 
 
+def format_play_by_play_clock(clock):
+    """
+    Formats an ISO 8601 game clock (e.g. "PT06M28.00S") the way the play-by-play table shows it ("06:28").
+
+    Parameters:
+        clock (str): The clock value from the play-by-play JSON.
+
+    Returns:
+        str: The formatted clock, or the input unchanged if it is not an ISO 8601 duration.
+    """
+    match = regex.match(r"^PT(\d+)M(\d+)(?:\.\d+)?S$", clock or "")
+    if not match:
+        return clock
+    return f"{int(match.group(1)):02d}:{int(match.group(2)):02d}"
+
+
+def process_play_by_play_actions(
+    actions,
+    game_id,
+    base_url,
+    season,
+    special_keywords=None,
+    players=None,
+    words_to_exclude=None,
+    keywords=None,
+):
+    """
+    Builds play-by-play video events from the actions of the box score's ``playByPlay`` JSON.
+
+    Produces the same records as process_play_by_play_video_rows, without a browser.
+
+    Parameters:
+        actions (list): The ``playByPlay.actions`` list from the box score page's __NEXT_DATA__.
+        game_id (str): The Game ID the actions belong to.
+        base_url (str): The NBA base URL the event pages live under.
+        season (str): The season of the game (e.g. "2023-24").
+        special_keywords (list[str], optional): List of special keywords to match actions, these will override normal keyword matching.
+        players (list[str], optional): List of player names to filter the actions.
+        words_to_exclude (list[str], optional): List of words to exclude from description matching.
+        keywords (list[str], optional): List of keywords to filter the actions.
+
+    Returns:
+        list: A list of dicts with ``pos``, ``title``, ``clock`` and ``page_url`` keys.
+    """
+    video_play_by_play_event_data = []
+    logger.console(f"Iterating through {len(actions)} play-by-play actions...")
+    for action in actions:
+        description = action.get("description")
+        action_number = action.get("actionNumber")
+        if not action.get("videoAvailable") or not description or action_number is None:
+            continue
+
+        if not should_include_row_based_on_filters(
+            description, special_keywords, players, words_to_exclude, keywords
+        ):
+            continue
+
+        query = urllib.parse.urlencode(
+            {
+                "CFID": "",
+                "CFPARAMS": "",
+                "GameEventID": action_number,
+                "GameID": game_id,
+                "Season": season,
+                "flag": 1,
+                "title": description,
+            },
+            quote_via=urllib.parse.quote,
+        )
+        video_event_clock = format_play_by_play_clock(action.get("clock"))
+        logger.info(f"{video_event_clock} {description} | Pos: {action_number}")
+
+        video_play_by_play_event_data.append(
+            {
+                "pos": str(action_number).zfill(3),
+                # Remove from title everything inside parenthesis
+                "title": regex.sub(r"\(.*\)", "", description.strip()),
+                "clock": video_event_clock,
+                "page_url": f"{base_url}/stats/events?{query}",
+            }
+        )
+
+    return video_play_by_play_event_data
+
+
 def should_include_row_based_on_filters(
     row_text, special_keywords=None, players=None, words_to_exclude=None, keywords=None
 ):
@@ -479,6 +827,26 @@ def clean_basketball_coordinates(x_coordinates, min_time_difference=1000):
     return cleaned_coordinates
 
 
+DETECTIONS_SUFFIX = "_detections.json"
+
+
+def get_detections_path(video_path):
+    """
+    Returns the path of the basketball detections stored next to a clip.
+    """
+    return os.path.splitext(video_path)[0] + DETECTIONS_SUFFIX
+
+
+def is_up_to_date(path, *source_paths):
+    """
+    Returns True if a file exists and is newer than every file it is derived from.
+    """
+    if not os.path.exists(path):
+        return False
+    modified_at = os.path.getmtime(path)
+    return all(os.path.getmtime(source_path) <= modified_at for source_path in source_paths)
+
+
 def json_stats_to_html_image(stats_json, output_image_path):
     """
     Converts player statistics JSON into a styled HTML table and then renders it as an image.
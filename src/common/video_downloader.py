@@ -1,6 +1,6 @@
-import requests
 import os
 from bs4 import BeautifulSoup
+from common.http_client import get_http_client
 
 
 class VideoDownloader:
@@ -22,7 +22,9 @@ class VideoDownloader:
         return None
 
     @staticmethod
-    def download_video(video_url, output_directory="videos", filename=None):
+    def download_video(
+        video_url, output_directory="videos", filename=None, http_client=None
+    ):
         """
         Downloads the video from the given URL.
 
@@ -30,6 +32,7 @@ class VideoDownloader:
             video_url (str): URL of the video to be downloaded.
             output_directory (str): Directory to save the downloaded video.
             filename (str, optional): Custom filename for the downloaded video. If None, the filename is derived from the URL.
+            http_client (HttpClient, optional): Client to download with. Defaults to the shared client.
 
         Returns:
             str: Filename of the downloaded video, or None if the download fails.
@@ -42,8 +45,9 @@ class VideoDownloader:
             output_directory, filename if filename else video_url.split("/")[-1]
         )
 
+        http_client = http_client or get_http_client()
         try:
-            with requests.get(video_url, stream=True) as r:
+            with http_client.get(video_url, stream=True) as r:
                 r.raise_for_status()
                 with open(local_filename, "wb") as f:
                     for chunk in r.iter_content(chunk_size=8192):
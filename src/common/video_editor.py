@@ -1,6 +1,7 @@
 from moviepy.editor import (
     VideoFileClip,
     AudioFileClip,
+    AudioClip,
     concatenate_videoclips,
     TextClip,
     CompositeVideoClip,
@@ -8,19 +9,40 @@ from moviepy.editor import (
     ImageClip,
     vfx,
 )
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
 from common.utilities import json_stats_to_html_image
+from common.asset_cache import get_asset_cache
+from common.render_profiles import get_render_profile
+from common.resource_monitor import ResourceMonitor
 import ffmpeg
+import os
+import shutil
+import time
 import traceback
 import numpy as np
+from scipy.signal import lfilter
+from PIL import Image
 from common.logger import logger
 
 MAX_DURATION = 16  # Maximum duration of each clip in seconds
+CLIP_FPS = 30
+AUDIO_SAMPLE_RATE = 44100
+# Segments written by the grouped highlight render, removed once joined
+GROUP_SEGMENTS_DIR = ".groups"
+# Stats images among the highlight clips, sized from their header instead of opened as clips
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
 
 
 class VideoEditor:
     @staticmethod
     def create_highlight_video(
-        video_paths, output_path, box_score_data, image_duration=5
+        video_paths,
+        output_path,
+        box_score_data,
+        image_duration=5,
+        trim_clips=True,
+        render_profile=None,
+        max_open_clips=None,
     ):
         """
         Creates a video from a list of video paths and adds stats as text overlay in a table format.
@@ -30,105 +52,56 @@ class VideoEditor:
             output_path (str): Path to save the final video.
             box_score_data (dict): JSON object containing player statistics.
             image_duration (int): Duration for which the image is displayed.
+            trim_clips (bool): Whether to trim the clips to MAX_DURATION. Pass False for clips
+                already trimmed by preprocess_clip.
+            render_profile (RenderProfile, optional): Encoder settings. Defaults to the publish profile.
+            max_open_clips (int, optional): Render the video in groups of at most this many clips,
+                closing the readers of each group once it is written, so memory and open files do
+                not grow with the number of clips. Defaults to opening every clip at once.
 
         Returns:
             None
         """
-        try:
-            if len(box_score_data) > 0:
-                stats_home_team_json = {
-                    "players": box_score_data[0]["game"]["homeTeam"]["players"]
-                }
-                # Generate HTML table image from stats JSON
-                stats_home_team_image_path = f"{output_path}/stats_home_team_image.png"
-                json_stats_to_html_image(
-                    stats_home_team_json, stats_home_team_image_path
-                )
-
-                stats_away_team_json = {
-                    "players": box_score_data[0]["game"]["awayTeam"]["players"]
-                }
-                # Generate HTML table image from stats JSON
-                stats_away_team_image_path = f"{output_path}/stats_away_team_image.png"
-                json_stats_to_html_image(
-                    stats_away_team_json, stats_away_team_image_path
+        render_profile = render_profile or get_render_profile()
+        final_video_path = f"{output_path}/final_highlight_logo.mp4"
+        opened_clips = []
+        with ResourceMonitor("Highlight video render"):
+            try:
+                stats_image_paths = create_stats_images(box_score_data, output_path)
+
+                video_paths.sort()
+                width, height = ffmpeg_parse_infos(video_paths[0])["video_size"]
+                logger.console(f"Width: {width}, Height: {height}")
+
+                clip_openers = get_highlight_clip_openers(
+                    video_paths,
+                    (width, height),
+                    stats_image_paths,
+                    image_duration,
+                    trim_clips,
                 )
-
-            video_paths.sort()
-            video_clips = []
-
-            # Resize intro video to size of game clips
-            sample_game_clip = VideoFileClip(video_paths[0])
-            width, height = sample_game_clip.size
-            logger.console(f"Width: {width}, Height: {height}")
-
-            input_video_path = "resources/video/intro.mp4"
-            output_video_path = "resources/video/intro_correct_size.mp4"
-
-            resize(input_video_path, output_video_path, width, height)
-
-            # Get the intro video
-            intro_clip = VideoFileClip("resources/video/intro_correct_size.mp4")
-            intro_audio = AudioFileClip("resources/audio/intro.mp3").audio_fadeout(5)
-            outro_audio = AudioFileClip("resources/audio/outro.mp3").audio_fadeout(7)
-            intro_clip = intro_clip.set_audio(intro_audio)
-            video_clips.append(intro_clip)
-
-            # Process videos
-            # Before processing the videos, order the paths in alphabetical order to make sure they are in the right time sequence
-            for videopath in video_paths:
-                logger.console(f"Processing video: {videopath}")
-                videofilename = videopath.split("/")[-1]
-                # Keep only the ones that start with a number and and with .mp4 (These are the videos previously downloaded)
-                if videofilename[0].isnumeric() and videofilename.endswith(".mp4"):
-                    video_clip = trim_clip(videopath, MAX_DURATION)
-                    video_clips.append(video_clip)
-
-            # Prepare and add image clips with outro audio
-            if (
-                "stats_home_team_image_path" in locals()
-                and "stats_away_team_image_path" in locals()
-            ):
-                # Create an ImageClip with the stats image
-                stats_home_team_image_clip = ImageClip(
-                    stats_home_team_image_path
-                ).set_duration(image_duration)
-                stats_away_team_image_clip = ImageClip(
-                    stats_away_team_image_path
-                ).set_duration(image_duration)
-
-                # Create composite clips for images with outro audio
-                stats_home_team_video = CompositeVideoClip(
-                    [stats_home_team_image_clip]
-                ).set_audio(outro_audio)
-                stats_away_team_video = CompositeVideoClip([stats_away_team_image_clip])
-                image_clips = [stats_home_team_video, stats_away_team_video]
-                video_clips += image_clips
-
-            # Concatenate all clips
-            final_video_clip = concatenate_videoclips(video_clips, method="compose")
-
-            # Generate the logo clip
-            video_size = (width, height)
-            total_duration = sum(clip.duration for clip in video_clips)
-            logo_clip = create_logo_clip(
-                "resources/image/logo.png", video_size, total_duration
-            )
-
-            # Add the logo clip to the final composition
-            final_video_clip = CompositeVideoClip([final_video_clip, logo_clip])
-
-            # Write final video file
-            final_video_clip.write_videofile(
-                f"{output_path}/final_highlight_logo.mp4", codec="libx264", fps=30
-            )
-
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
-            traceback.print_exc()
+                if max_open_clips:
+                    write_highlight_video_in_groups(
+                        clip_openers,
+                        (width, height),
+                        final_video_path,
+                        max_open_clips,
+                        render_profile,
+                    )
+                else:
+                    video_clips = [open_clip(opened_clips) for open_clip in clip_openers]
+                    write_highlight_clips(
+                        video_clips, (width, height), final_video_path, render_profile
+                    )
+
+            except Exception as e:
+                logger.error(f"An error occurred: {e}")
+                traceback.print_exc()
+            finally:
+                close_clips(opened_clips)
 
     @staticmethod
-    def edit_video(video_path, output_path, ball_positions):
+    def edit_video(video_path, output_path, ball_positions, render_profile=None):
         # Load your video
         clip = VideoFileClip(video_path)
 
@@ -139,7 +112,17 @@ class VideoEditor:
         panned_clip = horizontal_pan_with_smooth_motion(clip, ball_positions, new_width)
 
         # Export the video with the panning effect
-        panned_clip.write_videofile(output_path, codec="libx264", fps=30)
+        render_profile = render_profile or get_render_profile()
+        started_at = time.monotonic()
+        panned_clip.write_videofile(
+            output_path, fps=30, **render_profile.moviepy_params()
+        )
+        elapsed = time.monotonic() - started_at
+        frames = int(panned_clip.duration * 30)
+        logger.console(
+            f"Reframed {os.path.basename(video_path)}: {frames} frames at {frames / elapsed:.1f} fps"
+        )
+        return {"frames": frames, "seconds": round(elapsed, 2), "fps": round(frames / elapsed, 1)}
 
 
 def horizontal_pan(clip, start_x, end_x, new_width):
@@ -161,49 +144,63 @@ def horizontal_pan(clip, start_x, end_x, new_width):
     return new_clip
 
 
-def horizontal_pan_with_smooth_motion(
-    clip, ball_positions, new_width, ease_factor=0.05
+def compute_camera_path(
+    ball_positions, frame_count, fps, frame_width, new_width, ease_factor=0.05
 ):
-    # Convert ball_positions to arrays for interpolation
-    times = np.array(list(ball_positions.keys()))
-    positions = np.array([ball_positions[t] for t in times])
+    """
+    Precomputes the left edge of the crop window for every frame of a clip.
 
-    # Current position of the camera
-    current_camera_x = 0
+    The camera follows the ball with an exponential easing: on each frame it
+    moves ``ease_factor`` of the way from its current position to the ball,
+    starting from x=0. This recurrence is a first-order IIR filter, so the
+    whole trajectory is computed with a single lfilter call instead of frame
+    by frame, and it does not depend on the order frames are rendered in.
 
-    # This function applies a horizontal panning effect based on the ball's position
-    def make_frame(t):
-        nonlocal current_camera_x
+    Parameters:
+        ball_positions (dict): Ball x coordinate keyed by timestamp in milliseconds.
+        frame_count (int): Number of frames of the clip.
+        fps (float): Frame rate of the clip.
+        frame_width (int): Width of the clip's frames.
+        new_width (int): Width of the crop window.
+        ease_factor (float): Fraction of the distance to the ball the camera moves on each frame.
 
-        # Convert t to milliseconds
-        t_milliseconds = t * 1000
+    Returns:
+        np.ndarray: The left x coordinate of the crop window for each frame, as integers.
+    """
+    times = np.array(sorted(ball_positions.keys()), dtype=float)
+    positions = np.array([ball_positions[t] for t in sorted(ball_positions.keys())], dtype=float)
+    frame_times_milliseconds = np.arange(frame_count) * 1000 / fps
 
-        # Check if the timestamp is very close to the video duration
-        if clip.duration - t < 0.1:  # 0.1 is an arbitrary small threshold
-            logger.console(f"Time {t} exceeds clip duration, returning last frame")
-            # If close to the end, return the last frame
-            return clip.get_frame(clip.duration)
+    # Interpolate to find the ball's position on every frame
+    targets = np.interp(frame_times_milliseconds, times, positions)
 
-        # Interpolate to find the ball's position at time t
-        target_x = np.interp(t_milliseconds, times, positions)
+    # camera[n] = camera[n - 1] + (targets[n] - camera[n - 1]) * ease_factor, with camera[-1] = 0
+    camera_x = lfilter([ease_factor], [1, ease_factor - 1], targets)
 
-        # Smoothly adjust the camera's position towards the target
-        # using an easing factor for gradual movement
-        current_camera_x += (target_x - current_camera_x) * ease_factor
+    # Left edge of the crop window so that the camera position is centered
+    left_x = np.clip(camera_x - new_width // 2, 0, frame_width - new_width)
+    return left_x.astype(np.int64)
 
-        # Calculate the left x-coordinate of the cropping area
-        # so that the ball is centered
-        current_x = max(
-            0, min(current_camera_x - new_width // 2, clip.size[0] - new_width)
-        )
 
-        # Crop and return the frame
-        return clip.crop(
-            x1=current_x, y1=0, x2=current_x + new_width, y2=clip.size[1]
-        ).get_frame(t)
+def horizontal_pan_with_smooth_motion(
+    clip, ball_positions, new_width, ease_factor=0.05
+):
+    frame_count = int(clip.duration * clip.fps) + 1
+    camera_path = compute_camera_path(
+        ball_positions, frame_count, clip.fps, clip.size[0], new_width, ease_factor
+    )
+    # The last frames cannot always be decoded, the end of the clip repeats the last safe frame
+    last_frame_time = max(clip.duration - 0.1, 0)
+
+    # This function applies a horizontal panning effect based on the ball's position
+    def make_frame(get_frame, t):
+        frame_index = min(int(round(t * clip.fps)), frame_count - 1)
+        current_x = camera_path[frame_index]
+        # Crop by slicing the decoded frame
+        return get_frame(min(t, last_frame_time))[:, current_x : current_x + new_width]
 
     # Create a new clip with the modified frames
-    new_clip = clip.fl(lambda gf, t: make_frame(t))
+    new_clip = clip.fl(make_frame)
     return new_clip
 
 
@@ -241,8 +238,7 @@ def create_logo_clip(
         ImageClip: An ImageClip of the logo.
     """
     # Resize image to make it fit in the corner
-    output_image_path = "resources/image/logo_resized.png"
-    resize(logo_path, output_image_path, *logo_size)
+    output_image_path = get_asset_cache().get_resized(logo_path, *logo_size)
 
     # Load and set the logo image
     logo = ImageClip(output_image_path)
@@ -291,3 +287,341 @@ def trim_clip(videopath, max_duration):
         video_clip = video_clip.subclip(start_time, video_clip.duration)
 
     return video_clip
+
+
+def get_highlight_clip_openers(
+    video_paths, video_size, stats_image_paths, image_duration=5, trim_clips=True
+):
+    """
+    Returns a function opening each clip of the highlight video, in playing order.
+
+    Nothing is opened until a function is called. Each function takes a list
+    and appends every clip and audio reader it opens to it, so the caller
+    can close them with close_clips once the clip is written. The video or
+    image each function opens is its ``source_path`` attribute.
+
+    Parameters:
+        video_paths (list): Paths of the game clips, sorted in playing order.
+        video_size (tuple): Size of the video (width, height).
+        stats_image_paths (tuple): The (home team, away team) stats image paths, or None.
+        image_duration (int): Duration for which each stats image is displayed.
+        trim_clips (bool): Whether to trim the clips to MAX_DURATION.
+
+    Returns:
+        list: Functions returning the intro clip, the game clips and the stats image clips.
+    """
+    # Resize intro video to size of game clips
+    intro_video_path = get_asset_cache().get_resized(
+        "resources/video/intro.mp4", *video_size
+    )
+
+    def open_intro(opened):
+        # Get the intro video
+        intro_clip = VideoFileClip(intro_video_path)
+        intro_audio = AudioFileClip("resources/audio/intro.mp3")
+        opened += [intro_clip, intro_audio]
+        return intro_clip.set_audio(intro_audio.audio_fadeout(5))
+
+    def open_game_clip(opened, videopath):
+        logger.console(f"Processing video: {videopath}")
+        if trim_clips:
+            video_clip = trim_clip(videopath, MAX_DURATION)
+        else:
+            video_clip = VideoFileClip(videopath)
+        opened.append(video_clip)
+        return video_clip
+
+    def open_stats_image(opened, image_path, with_outro):
+        # Create an ImageClip with the stats image
+        image_clip = ImageClip(image_path).set_duration(image_duration)
+        stats_video = CompositeVideoClip([image_clip])
+        if with_outro:
+            outro_audio = AudioFileClip("resources/audio/outro.mp3")
+            opened.append(outro_audio)
+            stats_video = stats_video.set_audio(outro_audio.audio_fadeout(7))
+        return stats_video
+
+    clip_openers = [_with_source_path(open_intro, intro_video_path)]
+    # Process videos
+    # Before processing the videos, order the paths in alphabetical order to make sure they are in the right time sequence
+    for videopath in video_paths:
+        videofilename = videopath.split("/")[-1]
+        # Keep only the ones that start with a number and and with .mp4 (These are the videos previously downloaded)
+        if videofilename[0].isnumeric() and videofilename.endswith(".mp4"):
+            clip_openers.append(
+                _with_source_path(
+                    lambda opened, videopath=videopath: open_game_clip(opened, videopath),
+                    videopath,
+                )
+            )
+
+    # Prepare and add image clips with outro audio
+    if stats_image_paths:
+        stats_home_team_image_path, stats_away_team_image_path = stats_image_paths
+        clip_openers.append(
+            _with_source_path(
+                lambda opened: open_stats_image(opened, stats_home_team_image_path, True),
+                stats_home_team_image_path,
+            )
+        )
+        clip_openers.append(
+            _with_source_path(
+                lambda opened: open_stats_image(opened, stats_away_team_image_path, False),
+                stats_away_team_image_path,
+            )
+        )
+    return clip_openers
+
+
+def _with_source_path(open_clip, source_path):
+    open_clip.source_path = source_path
+    return open_clip
+
+
+def close_clips(clips):
+    """
+    Closes clips and audio readers, stopping their ffmpeg processes, and empties the list.
+    """
+    for clip in clips:
+        try:
+            clip.close()
+        except Exception as e:
+            logger.error(f"Could not close a clip: {e}")
+    clips.clear()
+
+
+def _silent_audio(duration):
+    # Stereo silence, for segments that must have an audio track
+    return AudioClip(
+        lambda t: np.zeros((len(t), 2)) if isinstance(t, np.ndarray) else np.zeros(2),
+        duration=duration,
+        fps=AUDIO_SAMPLE_RATE,
+    )
+
+
+def write_highlight_clips(video_clips, video_size, output_video_path, render_profile):
+    """
+    Concatenates clips, adds the logo and writes them to a file.
+
+    Parameters:
+        video_clips (list): The clips, in playing order.
+        video_size (tuple): Size of the video (width, height).
+        output_video_path (str): Path to save the video.
+        render_profile (RenderProfile): Encoder settings.
+    """
+    # Concatenate all clips
+    final_video_clip = concatenate_videoclips(video_clips, method="compose")
+
+    # Generate the logo clip
+    total_duration = sum(clip.duration for clip in video_clips)
+    logo_clip = create_logo_clip(
+        "resources/image/logo.png", video_size, total_duration
+    )
+
+    # Add the logo clip to the final composition
+    final_video_clip = CompositeVideoClip([final_video_clip, logo_clip])
+
+    # Write final video file
+    final_video_clip.write_videofile(
+        output_video_path,
+        fps=CLIP_FPS,
+        **render_profile.moviepy_params(),
+    )
+
+
+def _get_canvas_size(clip_openers):
+    # Size "compose" gives to the concatenation of every clip: the largest width and height.
+    # Read from the file headers, opening every clip would start an ffmpeg reader for each
+    width = height = 0
+    for open_clip in clip_openers:
+        source_path = open_clip.source_path
+        if source_path.lower().endswith(IMAGE_EXTENSIONS):
+            with Image.open(source_path) as image:
+                clip_width, clip_height = image.size
+        else:
+            clip_width, clip_height = ffmpeg_parse_infos(source_path)["video_size"]
+        width, height = max(width, clip_width), max(height, clip_height)
+    return width, height
+
+
+def write_highlight_video_in_groups(
+    clip_openers, video_size, final_video_path, max_open_clips, render_profile
+):
+    """
+    Writes the highlight video in groups of clips, keeping at most max_open_clips clips open.
+
+    Each group is opened, concatenated with the logo and written to its own
+    segment, then its clips are closed before the next group is opened.
+    Every segment is centered on the size concatenating every clip at once
+    would give, has an audio track and the same encoder settings, so they
+    are joined without re-encoding.
+
+    Parameters:
+        clip_openers (list): The functions returned by get_highlight_clip_openers.
+        video_size (tuple): Size of the video (width, height).
+        final_video_path (str): Path to save the final video.
+        max_open_clips (int): Maximum number of clips open at the same time.
+        render_profile (RenderProfile): Encoder settings.
+    """
+    segments_directory = os.path.join(os.path.dirname(final_video_path), GROUP_SEGMENTS_DIR)
+    os.makedirs(segments_directory, exist_ok=True)
+    canvas_size = _get_canvas_size(clip_openers)
+    segment_paths = []
+    try:
+        for group_start in range(0, len(clip_openers), max_open_clips):
+            opened = []
+            try:
+                group = [
+                    open_clip(opened)
+                    for open_clip in clip_openers[group_start : group_start + max_open_clips]
+                ]
+                group_duration = sum(clip.duration for clip in group)
+                group_clip = CompositeVideoClip(
+                    [
+                        concatenate_videoclips(group, method="compose").set_position("center"),
+                        create_logo_clip("resources/image/logo.png", video_size, group_duration),
+                    ],
+                    size=canvas_size,
+                )
+                if group_clip.audio is None:
+                    group_clip = group_clip.set_audio(_silent_audio(group_duration))
+                segment_path = os.path.join(segments_directory, f"{len(segment_paths):04d}.mp4")
+                group_clip.write_videofile(
+                    segment_path,
+                    fps=CLIP_FPS,
+                    **render_profile.moviepy_params(),
+                )
+                segment_paths.append(segment_path)
+            finally:
+                close_clips(opened)
+            logger.console(
+                f"Wrote clips {group_start + 1} to {group_start + len(group)} of {len(clip_openers)}"
+            )
+        join_segments(segment_paths, segments_directory, final_video_path)
+    finally:
+        shutil.rmtree(segments_directory, ignore_errors=True)
+
+
+def create_stats_images(box_score_data, output_path):
+    """
+    Renders the player statistics of both teams as table images.
+
+    Parameters:
+        box_score_data (list): The box score data returned by fetch_box_score_data.
+        output_path (str): Directory to save the images in.
+
+    Returns:
+        tuple: The (home team, away team) image paths, or None if there is no box score data.
+    """
+    if len(box_score_data) == 0:
+        return None
+    stats_home_team_json = {
+        "players": box_score_data[0]["game"]["homeTeam"]["players"]
+    }
+    # Generate HTML table image from stats JSON
+    stats_home_team_image_path = f"{output_path}/stats_home_team_image.png"
+    json_stats_to_html_image(stats_home_team_json, stats_home_team_image_path)
+
+    stats_away_team_json = {
+        "players": box_score_data[0]["game"]["awayTeam"]["players"]
+    }
+    # Generate HTML table image from stats JSON
+    stats_away_team_image_path = f"{output_path}/stats_away_team_image.png"
+    json_stats_to_html_image(stats_away_team_json, stats_away_team_image_path)
+    return stats_home_team_image_path, stats_away_team_image_path
+
+
+def get_clip_trim_range(duration, max_duration):
+    """
+    Computes the part of a clip kept by trim_clip.
+
+    Parameters:
+        duration (float): Duration of the clip in seconds.
+        max_duration (int): Maximum duration of the trimmed clip in seconds.
+
+    Returns:
+        tuple: The (start, end) times in seconds.
+    """
+    end = duration - 1 if duration > 1 else duration
+    start = max(end - max_duration, 0)
+    return start, end
+
+
+def preprocess_clip(
+    input_path, output_path, max_duration=MAX_DURATION, width=None, height=None
+):
+    """
+    Trims, scales and normalizes a single downloaded clip with ffmpeg.
+
+    The clip is trimmed like trim_clip and re-encoded at CLIP_FPS with
+    stereo AAC audio, so every preprocessed clip can be concatenated without
+    further conversion.
+
+    Parameters:
+        input_path (str): Path to the downloaded clip.
+        output_path (str): Path to save the preprocessed clip.
+        max_duration (int): Maximum duration of the preprocessed clip in seconds.
+        width (int, optional): Width to scale the clip to. Defaults to the clip's own size.
+        height (int, optional): Height to scale the clip to. Defaults to the clip's own size.
+
+    Returns:
+        str: The output path.
+    """
+    infos = ffmpeg_parse_infos(input_path)
+    start, end = get_clip_trim_range(infos["duration"], max_duration)
+    source = ffmpeg.input(input_path, ss=start, t=end - start)
+    video = source.video.filter("fps", fps=CLIP_FPS)
+    if width and height:
+        video = video.filter("scale", width, height)
+    streams = [video]
+    if infos.get("audio_found"):
+        streams.append(source.audio)
+    # Write to a temporary file first so a crashed run never leaves a truncated clip behind
+    temp_path = f"{output_path}.part.mp4"
+    (
+        ffmpeg.output(
+            *streams,
+            temp_path,
+            vcodec="libx264",
+            pix_fmt="yuv420p",
+            acodec="aac",
+            ar=AUDIO_SAMPLE_RATE,
+            ac=2,
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+def join_segments(segment_paths, segments_directory, final_video_path):
+    """
+    Joins video segments with the concat demuxer without re-encoding them.
+
+    The segments must share their codec parameters. The list of segments is
+    written to segments_directory and the output is renamed into place once
+    it is complete.
+
+    Parameters:
+        segment_paths (list): Paths of the segments, in playing order.
+        segments_directory (str): Directory to write the concat list in.
+        final_video_path (str): Path to save the joined video.
+    """
+    concat_list_path = os.path.join(segments_directory, "segments.txt")
+    with open(concat_list_path, "w") as f:
+        for segment_path in segment_paths:
+            f.write(f"file '{os.path.abspath(segment_path)}'\n")
+    temp_path = final_video_path.replace(".mp4", ".part.mp4")
+    (
+        ffmpeg.input(concat_list_path, f="concat", safe=0)
+        .output(
+            temp_path,
+            c="copy",
+            **{"bsf:a": "aac_adtstoasc"},
+            movflags="+faststart",
+        )
+        .overwrite_output()
+        .run(quiet=True)
+    )
+    os.replace(temp_path, final_video_path)
@@ -0,0 +1,108 @@
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from common.driver_pool import get_driver_pool
+from common.rate_limiter import RateLimiter
+from common.utilities import fetch_video_urls_from_table
+from common.logger import logger
+
+EVENTS_TABLE_CLASS = "Crom_table__p1iZz"
+EVENTS_ROW_CLASS = "EventsTable_row__Gs8B9"
+EVENTS_VIDEO_ID = "vjs_video_3_html5_api"
+
+
+class VideoUrlResolver:
+    """
+    Resolves the video URLs of many play-by-play events concurrently.
+
+    Each event page is loaded in its own browser borrowed from a DriverPool, so
+    up to ``concurrency`` pages are scraped at the same time while a per-host
+    RateLimiter keeps the request rate polite. Events whose video URLs are
+    cached are resolved without loading their page, so they are not throttled.
+
+    Attributes:
+        concurrency (int): Maximum number of event pages resolved at the same time.
+        driver_pool (DriverPool): Pool the workers borrow their browsers from.
+        rate_limiter (RateLimiter): Limiter applied before every page load.
+        page_cache (PageCache): Cache of the resolved video URLs, None for the shared cache.
+    """
+
+    def __init__(
+        self, concurrency=None, requests_per_second=2.0, driver_pool=None, page_cache=None
+    ):
+        """
+        The constructor for VideoUrlResolver class.
+
+        Parameters:
+            concurrency (int, optional): Maximum number of event pages resolved at the same time.
+                Defaults to the size of the driver pool.
+            requests_per_second (float): Maximum number of page loads started per host each second.
+            driver_pool (DriverPool, optional): Pool to borrow browsers from. Defaults to the shared pool.
+            page_cache (PageCache, optional): Cache of the resolved video URLs. Defaults to the shared cache.
+        """
+        self.driver_pool = driver_pool or get_driver_pool()
+        self.concurrency = concurrency or self.driver_pool.size
+        if self.concurrency > self.driver_pool.size:
+            logger.console(
+                f"Resolver concurrency {self.concurrency} exceeds the driver pool size {self.driver_pool.size}, "
+                "extra workers will wait for a free browser"
+            )
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.page_cache = page_cache
+
+    def _resolve_event(self, event_data):
+        started_at = time.monotonic()
+        video_urls = fetch_video_urls_from_table(
+            event_data["page_url"],
+            EVENTS_TABLE_CLASS,
+            EVENTS_ROW_CLASS,
+            EVENTS_VIDEO_ID,
+            driver_pool=self.driver_pool,
+            page_cache=self.page_cache,
+            rate_limiter=self.rate_limiter,
+        )
+        logger.console(
+            f"Resolved {len(video_urls)} video urls for event {event_data['pos']} in {time.monotonic() - started_at:.2f}s"
+        )
+        return video_urls
+
+    def resolve(self, events, on_resolved=None):
+        """
+        Resolves the video URLs of every event.
+
+        Parameters:
+            events (list): Play-by-play event dicts with at least ``pos`` and ``page_url``.
+            on_resolved (callable, optional): Called as ``on_resolved(event_data, video_urls)``
+                from the worker thread as soon as each event is resolved.
+
+        Returns:
+            OrderedDict: The video URL list of each event keyed by its ``pos``, in ``pos`` order.
+                Events that failed to resolve map to an empty list.
+        """
+        results = {}
+        if not events:
+            return OrderedDict()
+
+        started_at = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {
+                executor.submit(self._resolve_event, event_data): event_data
+                for event_data in events
+            }
+            for future in as_completed(futures):
+                event_data = futures[future]
+                try:
+                    video_urls = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Failed to resolve video urls for event {event_data['pos']}: {e}"
+                    )
+                    video_urls = []
+                results[event_data["pos"]] = video_urls
+                if on_resolved:
+                    on_resolved(event_data, video_urls)
+
+        logger.console(
+            f"Resolved {len(events)} events with {self.concurrency} workers in {time.monotonic() - started_at:.2f}s"
+        )
+        return OrderedDict(sorted(results.items()))
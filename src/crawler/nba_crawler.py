@@ -2,12 +2,21 @@ import os
 import requests
 import json
 from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from common.utilities import fetch_html_content
 from common.utilities import fetch_dynamic_html_content
 from common.utilities import fetch_video_urls_from_table
 from common.utilities import fetch_play_videos_from_play_by_play_table
+from common.utilities import process_play_by_play_actions
+from common.driver_pool import get_driver_pool
+from common.video_url_resolver import VideoUrlResolver
+from common.page_waits import get_wait_recorder
+from common.page_cache import DEFAULT_TTL
+from common.page_cache import TTL_FINAL
+from common.page_cache import get_game_ttl
+from common.page_cache import get_page_cache
+from common.fixture_store import get_fixture_store
 from common.logger import logger
 
 load_dotenv()
@@ -19,8 +28,13 @@ def fetch_game_data(date):
         raise ValueError("NBA_BASE_URL is not set in the environment variables.")
 
     url = f"{base_url}/games/?date={date}"
+    # Every game of a past date is final, so its games page never changes
+    if datetime.strptime(date, "%Y-%m-%d").date() < datetime.now().date() - timedelta(days=1):
+        ttl = TTL_FINAL
+    else:
+        ttl = DEFAULT_TTL
     try:
-        response = fetch_html_content(url)
+        response = fetch_html_content(url, ttl=ttl)
         if response:
             print("Fetched games HTML content successfully.")
             # Write response to a file with the date
@@ -33,6 +47,9 @@ def fetch_game_data(date):
     soup = BeautifulSoup(response.content, "html.parser")
     script_tag = soup.find("script", {"id": "__NEXT_DATA__"})
     data = json.loads(script_tag.string if script_tag else "{}")
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.recording:
+        fixture_store.save_json("next_data", url, data)
 
     games_data = []
 
@@ -142,6 +159,9 @@ def fetch_box_score_data(url):
     soup = BeautifulSoup(response.content, "html.parser")
     script_tag = soup.find("script", {"id": "__NEXT_DATA__"})
     data = json.loads(script_tag.string if script_tag else "{}")
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.recording:
+        fixture_store.save_json("next_data", url, data)
 
     box_score_data = []
 
@@ -151,8 +171,14 @@ def fetch_box_score_data(url):
     game_data = page_props.get("game", {})
     play_by_play_data = page_props.get("playByPlay", {})
 
+    # Keep live box scores fresh, final ones are served from the cache from now on
+    page_cache = get_page_cache()
+    if page_cache:
+        page_cache.set_ttl(url, get_game_ttl(game_data.get("gameStatus")))
+
     game_info = {
         "gameId": game_data.get("gameId"),
+        "gameStatus": game_data.get("gameStatus"),
         "period": game_data.get("period"),
         "homeTeam": game_data.get("homeTeam"),
         "awayTeam": game_data.get("awayTeam"),
@@ -165,17 +191,78 @@ def fetch_box_score_data(url):
     return box_score_data
 
 
+def extract_play_by_play_events(
+    box_score_data,
+    special_keywords=None,
+    players=None,
+    words_to_exclude=None,
+    keywords=None,
+):
+    """
+    Extracts the play-by-play video events from box score data, without a browser.
+
+    Parameters:
+    box_score_data (list): The box score data returned by fetch_box_score_data.
+    special_keywords (list[str], optional): List of special keywords to match actions, these will override normal keyword matching.
+    players (list[str], optional): List of player names to filter the actions.
+    words_to_exclude (list[str], optional): List of words to exclude from description matching.
+    keywords (list): A list of keywords to filter the play-by-play events. Defaults to None.
+    Returns:
+    list: A list of play-by-play events, or an empty list if the box score has no play-by-play actions.
+    """
+    base_url = os.getenv("NBA_BASE_URL")
+    if not base_url:
+        raise ValueError("NBA_BASE_URL is not set in the environment variables.")
+    season = os.getenv("NBA_SEASON")
+
+    play_by_play_events = []
+    for game in box_score_data or []:
+        game_info = game.get("game", {})
+        actions = (game_info.get("playByPlay") or {}).get("actions") or []
+        play_by_play_events += process_play_by_play_actions(
+            actions,
+            game_info.get("gameId"),
+            base_url,
+            season,
+            special_keywords,
+            players,
+            words_to_exclude,
+            keywords,
+        )
+    return play_by_play_events
+
+
 def fetch_game_play_by_play_data(
-    url, special_keywords=None, players=None, words_to_exclude=None, keywords=None
+    url,
+    special_keywords=None,
+    players=None,
+    words_to_exclude=None,
+    keywords=None,
+    driver_pool=None,
+    concurrency=None,
+    requests_per_second=2.0,
+    box_score_data=None,
+    on_event_resolved=None,
 ):
     """
     Fetches the play-by-play data from the given URL.
+    When box score data with play-by-play actions is given, the events are read from it and
+    the play-by-play page is not loaded in a browser; only the event videos are resolved.
     Parameters:
     url (str): The URL to fetch the play-by-play data from.
     special_keywords (list[str], optional): List of special keywords to match rows, these will override normal keyword matching.
     players (list[str], optional): List of player names to filter the rows.
     words_to_exclude (list[str], optional): List of words to exclude from row text matching.
     keywords (list): A list of keywords to filter the play-by-play events. Defaults to None.
+    driver_pool (DriverPool, optional): Pool the play-by-play page and every event page borrow
+        their browser from. Defaults to the shared pool.
+    concurrency (int, optional): Maximum number of event pages resolved at the same time.
+        Defaults to the size of the driver pool.
+    requests_per_second (float): Maximum number of event pages loaded per host each second.
+    box_score_data (list, optional): The box score data returned by fetch_box_score_data.
+    on_event_resolved (callable, optional): Called as ``on_event_resolved(event_data, video_urls)``
+        as soon as the videos of each event are resolved, so their download can start before
+        the remaining events are resolved.
     Returns:
     list: A list of play-by-play events extracted from the box score page HTML.
     """
@@ -185,32 +272,86 @@ def fetch_game_play_by_play_data(
 
     url = f"{base_url}{url}"
     print(f"Fetching play-by-play data from: {url}")
+    fixture_extra = [special_keywords, players, words_to_exclude, keywords]
+    fixture_store = get_fixture_store()
+    if fixture_store and fixture_store.replaying:
+        play_by_play_data = fixture_store.load_json("play_by_play", url, fixture_extra)
+        # None was recorded for a game without matching events or whose fetch failed
+        if not play_by_play_data:
+            return None
+        if on_event_resolved:
+            for event_data in play_by_play_data:
+                on_event_resolved(event_data, event_data.get("video_urls", []))
+        return play_by_play_data
+
+    def record(result):
+        # Every outcome is recorded, so replaying the night never misses a game
+        if fixture_store:
+            fixture_store.save_json("play_by_play", url, result, fixture_extra)
+        return result
+
+    driver_pool = driver_pool or get_driver_pool()
     try:
-        play_by_play_data = fetch_play_videos_from_play_by_play_table(
-            url,
-            "GamePlayByPlay_hasPlays__LgdnK",
-            "GamePlayByPlayRow_article__asoO2",
-            "GamePlayByPlay_tab__BboK4",
-            special_keywords,
-            players,
-            words_to_exclude,
-            keywords,
+        play_by_play_data = extract_play_by_play_events(
+            box_score_data, special_keywords, players, words_to_exclude, keywords
         )
         if play_by_play_data:
+            logger.console(
+                f"Found {len(play_by_play_data)} play-by-play events in the box score data"
+            )
+        elif box_score_data and any(
+            (game.get("game", {}).get("playByPlay") or {}).get("actions")
+            for game in box_score_data
+        ):
+            logger.console("No play-by-play event in the box score data matches the filters")
+            return record(None)
+        else:
+            game_status = (
+                box_score_data[0].get("game", {}).get("gameStatus")
+                if box_score_data
+                else None
+            )
+            play_by_play_data = fetch_play_videos_from_play_by_play_table(
+                url,
+                "GamePlayByPlay_hasPlays__LgdnK",
+                "GamePlayByPlayRow_article__asoO2",
+                "GamePlayByPlay_tab__BboK4",
+                special_keywords,
+                players,
+                words_to_exclude,
+                keywords,
+                driver_pool=driver_pool,
+                cache_ttl=(
+                    get_game_ttl(game_status) if game_status else DEFAULT_TTL
+                ),
+            )
+        if play_by_play_data:
+            logger.console(f"Resolving videos for {len(play_by_play_data)} events")
+            resolver = VideoUrlResolver(
+                concurrency=concurrency,
+                requests_per_second=requests_per_second,
+                driver_pool=driver_pool,
+            )
+            resolved_video_urls = resolver.resolve(
+                play_by_play_data, on_resolved=on_event_resolved
+            )
             for event_data in play_by_play_data:
-                logger.console(f"Processing event: {event_data['title']}")
-                video_urls = fetch_video_urls_from_table(
-                    event_data["page_url"],
-                    "Crom_table__p1iZz",
-                    "EventsTable_row__Gs8B9",
-                    "vjs_video_3_html5_api",
-                )
+                video_urls = resolved_video_urls.get(event_data["pos"])
                 if video_urls:
                     event_data["video_urls"] = video_urls
-            return play_by_play_data
+            metrics = driver_pool.get_metrics()
+            logger.console(
+                f"Browser reuse: {metrics['pages_served']} pages over {metrics['sessions_launched']} sessions"
+            )
+            for wait_name, wait_stats in get_wait_recorder().summary().items():
+                logger.console(
+                    f"Page wait {wait_name}: {wait_stats['count']} waits, mean {wait_stats['mean']}s, "
+                    f"max {wait_stats['max']}s, {wait_stats['timeouts']} timeouts"
+                )
+            return record(play_by_play_data)
         else:
             print("Failed to fetch play-by-play data.")
-            return None
+            return record(None)
     except requests.exceptions.RequestException as e:
         print(f"Request failed: {e}")
-        return None
+        return record(None)
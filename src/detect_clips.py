@@ -0,0 +1,60 @@
+import argparse
+from common.image_processor import ImageProcessor
+from common.reframer import get_game_clips
+from common.ball_detector import YOLO_MODELS
+from common.ball_detector import DEFAULT_MODEL_SIZE
+from common.detection_sampler import DEFAULT_FRAME_STRIDE
+from common.detection_sampler import DEFAULT_BATCH_SIZE
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Detect the basketball in the clips of a game and save the detections next to each clip"
+    )
+    parser.add_argument(
+        "--directory",
+        required=True,
+        help="Specify the game directory with the downloaded clips (e.g. output/nba/videos/DATE/GAME)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Specify the number of clips detected at the same time (defaults to the number of cores)",
+    )
+    parser.add_argument(
+        "--model_size",
+        choices=list(YOLO_MODELS),
+        default=DEFAULT_MODEL_SIZE,
+        help="Specify the YOLOv5 model size, smaller is faster and less accurate",
+    )
+    parser.add_argument(
+        "--hsv",
+        action="store_true",
+        help="Specify to detect the ball with its HSV range only, without YOLOv5",
+    )
+    parser.add_argument(
+        "--stride",
+        type=int,
+        default=DEFAULT_FRAME_STRIDE,
+        help="Specify the distance in frames between the first sampled frames (1 samples every frame)",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Specify the number of frames sent to the model at once",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    ImageProcessor().detect_clips(
+        get_game_clips(args.directory),
+        workers=args.workers,
+        use_yolo=not args.hsv,
+        model_size=args.model_size,
+        batch_size=args.batch_size,
+        stride=args.stride,
+    )
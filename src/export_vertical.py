@@ -0,0 +1,51 @@
+import argparse
+from common.reframer import export_vertical_game
+from common.render_profiles import get_render_profile
+from common.render_profiles import RENDER_PROFILES
+from common.render_profiles import PROFILE_PUBLISH
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Export 9:16 versions of the clips of a game and a vertical highlight reel"
+    )
+    parser.add_argument(
+        "--directory",
+        required=True,
+        help="Specify the game directory with the downloaded clips (e.g. output/nba/videos/DATE/GAME)",
+    )
+    parser.add_argument(
+        "--output_dir",
+        default=None,
+        help="Specify the directory the vertical clips and reel are written to (defaults to DIRECTORY/vertical)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Specify the number of clips processed at the same time (defaults to the number of cores)",
+    )
+    parser.add_argument(
+        "--ease_factor",
+        type=float,
+        default=0.05,
+        help="Specify the fraction of the distance to the ball the camera moves on each frame",
+    )
+    parser.add_argument(
+        "--render_profile",
+        choices=list(RENDER_PROFILES),
+        default=PROFILE_PUBLISH,
+        help="Specify the encoder settings of the vertical clips and reel",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    export_vertical_game(
+        args.directory,
+        args.output_dir,
+        workers=args.workers,
+        ease_factor=args.ease_factor,
+        render_profile=get_render_profile(args.render_profile),
+    )
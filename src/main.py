@@ -11,8 +11,22 @@ from crawler.nba_crawler import fetch_game_play_by_play_data
 from data_processor.nba.game_data_processor import GameDataProcessor
 from data_processor.nba.box_score_data_processor import BoxScoreDataProcessor
 from common.player_data_utilities import PlayerDataUtils
-from common.video_downloader import VideoDownloader
-from common.utilities import get_files_in_directory
+from common.download_manager import DownloadManager
+from common.game_scheduler import GameScheduler
+from common.clip_pipeline import ClipPipeline
+from common.ffmpeg_renderer import create_highlight_video_ffmpeg
+from common.ffmpeg_renderer import create_highlight_video_stream_copy
+from common.ffmpeg_renderer import create_highlight_video_segmented
+from common.ffmpeg_renderer import create_highlight_video_incremental
+from common.ffmpeg_renderer import RENDER_BACKENDS
+from common.ffmpeg_renderer import RENDER_BACKEND_FFMPEG
+from common.ffmpeg_renderer import RENDER_BACKEND_COPY
+from common.ffmpeg_renderer import RENDER_BACKEND_SEGMENTED
+from common.ffmpeg_renderer import RENDER_BACKEND_INCREMENTAL
+from common.render_profiles import get_render_profile
+from common.render_profiles import RENDER_PROFILES
+from common.render_profiles import PROFILE_PUBLISH
+from common.ffmpeg_renderer import RENDER_BACKEND_MOVIEPY
 from common.utilities import test_twitter
 from common.utilities import clean_basketball_coordinates
 from common.utilities import write_to_file
@@ -22,6 +36,13 @@ from common.image_utilities import ImageUtilities
 from common.image_processor import ImageProcessor
 from common.image_thumbnail_creator import ImageThumbnailCreator
 from common.logger import logger
+from common.driver_pool import DriverPool
+from common.driver_pool import set_driver_pool
+from common.page_cache import set_page_cache
+from common.fixture_store import FixtureStore
+from common.fixture_store import set_fixture_store
+from common.fixture_store import MODE_RECORD
+from common.fixture_store import MODE_REPLAY
 from common.video_player import VideoPlayer
 from common.video_gui import BasketballVideoGUI
 from PIL import Image, ImageDraw, ImageFont
@@ -44,34 +65,25 @@ def init_directories(date):
     os.makedirs(os.path.join(OUTPUT_DIR, TESTS_DIR), exist_ok=True)
 
 
-def process_game_data(
-    game_data,
-    date,
-    special_keywords,
-    players,
-    words_to_exclude,
-    keywords,
-    max_games=None,
-    team=None,
-):
+def select_games(game_data, max_games=None, team=None):
+    """
+    Picks the games to process from the game cards of a date.
+
+    Parameters:
+        game_data (list): The game cards returned by fetch_game_data.
+        max_games (int, optional): Maximum number of game cards to consider.
+        team (str, optional): Team slug or game id a game must match to be selected.
+
+    Returns:
+        list: Tuples of (game slug, game card) for the selected games.
+    """
+    games = []
     for idx, game_card in enumerate(game_data):
         write_to_file(game_card, f"{OUTPUT_NBA_DIR}/game_card_{idx}.json")
         if max_games is not None and idx >= max_games:
             break
-        actions_path = ["gameCard", "actions"]
         game_data_processor = GameDataProcessor([game_card])
-        actions = game_data_processor.get_actions(actions_path)
-        tags_path = [
-            "gameCard",
-            "hero_configuration",
-            "gameRecap",
-            "taxonomy",
-            "tags",
-        ]
-        game_tags = game_data_processor.get_game_tags(tags_path)
         game_id = game_data_processor.get_game_id()
-        logger.console(f"Game ID: {game_id}")
-        logger.console(f"Words to exclude: {words_to_exclude}")
         game_slug = game_data_processor.get_game_slug(
             [
                 "gameCard",
@@ -81,108 +93,277 @@ def process_game_data(
                 "games",
             ]
         )
-        logger.console(f"Game slug: {game_slug}")
         if team is not None:
             if game_slug.find(team) == -1 and game_id.find(team) == -1:
                 continue
-                
-        box_score_url = game_data_processor.get_box_score_url(actions)
-        box_score_data = fetch_box_score_data(box_score_url)
-        filename = f"{OUTPUT_NBA_DIR}/raw/nba_box_score_{game_slug}_{date}.json"
-        logger.console(f"Saving box score data to {filename}")
-        # Write data to file
-        with open(filename, "w", encoding="utf-8") as file:
-            json.dump(box_score_data, file, ensure_ascii=False, indent=4)
-        logger.console(f"Data nba_box_score saved to {filename}")
-
-        home_team = game_data_processor.get_game_team_data(home=True)
-        away_team = game_data_processor.get_game_team_data(home=False)
-        # Check if home_team has the attribute "teamTricode", if so, print it
-        if "teamTricode" in home_team:
-            team1_slug = home_team["teamTricode"].lower()
-            logger.console(f"Home team tricode: {home_team['teamTricode']}")
-        if "teamTricode" in away_team:
-            logger.console(f"Away team tricode: {away_team['teamTricode']}")
-            team2_slug = away_team["teamTricode"].lower()
-        logger.console(f"Home team: {home_team}")
-        logger.console(f"Away team: {away_team}")
-        if "teamSubtitle" in home_team:
-            logger.console(f"Home team subtitle: {home_team['teamSubtitle']}")
-            team1_record = home_team["teamSubtitle"]
-        if "teamSubtitle" in away_team:
-            logger.console(f"Away team subtitle: {away_team['teamSubtitle']}")
-            team2_record = away_team["teamSubtitle"]
-        if "teamLeader" in home_team:
-            if "playerSlug" in home_team["teamLeader"]:
-                logger.console(
-                    f"Home team leader: {home_team['teamLeader']['playerSlug'].split('-', 1)[1].lower()}"
-                )
-                #Get everything after the first "-"
-                team1_player_slug = home_team["teamLeader"]["playerSlug"]
-                team1_player_slug = home_team["teamLeader"]["playerSlug"].split('-', 1)[1].lower()
-        if "teamLeader" in away_team:
-            if "playerSlug" in away_team["teamLeader"]:
-                logger.console(
-                    f"Away team leader: {away_team['teamLeader']['playerSlug'].split('-', 1)[1].lower()}"
-                )
-                team2_player_slug = away_team["teamLeader"]["playerSlug"].split('-', 1)[1].lower()
-                
-        # If players is empty, get key players
-        if not players:
-            # Get key players
-            box_score_data_processor = BoxScoreDataProcessor(box_score_data)
-            key_players = box_score_data_processor.get_key_players(game_tags)
-            # Print key players
-            for player in key_players:
-                logger.console(f"{player['familyName']}")
-            lead_stats_players = box_score_data_processor.get_lead_stats_players()
-            all_key_players = PlayerDataUtils.combine_players(
-                "personId", key_players, lead_stats_players
+        games.append((game_slug, game_card))
+    return games
+
+
+def prepare_game(
+    game_card,
+    date,
+    special_keywords,
+    players,
+    words_to_exclude,
+    keywords,
+    download_manager,
+    render_backend=RENDER_BACKEND_MOVIEPY,
+    render_profile=PROFILE_PUBLISH,
+    max_open_clips=None,
+):
+    """
+    Runs the network-bound part of a game: box score, play-by-play scraping, clip downloads
+    and the preprocessing of each clip as soon as it is downloaded.
+
+    Parameters:
+        game_card (dict): The game card of the game.
+        date (str): The date of the game, in YYYY-MM-DD format.
+        special_keywords (list): Keywords that select a play on their own.
+        players (list): Player last names used with keywords. If empty, the key players of the game are used.
+        words_to_exclude (list): Words that exclude a play.
+        keywords (list): Keywords used together with the player names.
+        download_manager (DownloadManager): Manager the clip downloads go through.
+        render_backend (str): Backend render_game assembles the highlight video with.
+        render_profile (str): Name of the render profile render_game encodes with.
+        max_open_clips (int, optional): Maximum number of clips the moviepy backend keeps open.
+
+    Returns:
+        dict: The arguments of render_game, or None if the game has no clips to render.
+    """
+    actions_path = ["gameCard", "actions"]
+    game_data_processor = GameDataProcessor([game_card])
+    actions = game_data_processor.get_actions(actions_path)
+    tags_path = [
+        "gameCard",
+        "hero_configuration",
+        "gameRecap",
+        "taxonomy",
+        "tags",
+    ]
+    game_tags = game_data_processor.get_game_tags(tags_path)
+    game_id = game_data_processor.get_game_id()
+    logger.console(f"Game ID: {game_id}")
+    logger.console(f"Words to exclude: {words_to_exclude}")
+    game_slug = game_data_processor.get_game_slug(
+        [
+            "gameCard",
+            "hero_configuration",
+            "gameRecap",
+            "taxonomy",
+            "games",
+        ]
+    )
+    logger.console(f"Game slug: {game_slug}")
+
+    box_score_url = game_data_processor.get_box_score_url(actions)
+    box_score_data = fetch_box_score_data(box_score_url)
+    filename = f"{OUTPUT_NBA_DIR}/raw/nba_box_score_{game_slug}_{date}.json"
+    logger.console(f"Saving box score data to {filename}")
+    # Write data to file
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(box_score_data, file, ensure_ascii=False, indent=4)
+    logger.console(f"Data nba_box_score saved to {filename}")
+
+    team1_slug = team2_slug = None
+    team1_record = team2_record = None
+    team1_player_slug = team2_player_slug = None
+    home_team = game_data_processor.get_game_team_data(home=True)
+    away_team = game_data_processor.get_game_team_data(home=False)
+    # Check if home_team has the attribute "teamTricode", if so, print it
+    if "teamTricode" in home_team:
+        team1_slug = home_team["teamTricode"].lower()
+        logger.console(f"Home team tricode: {home_team['teamTricode']}")
+    if "teamTricode" in away_team:
+        logger.console(f"Away team tricode: {away_team['teamTricode']}")
+        team2_slug = away_team["teamTricode"].lower()
+    logger.console(f"Home team: {home_team}")
+    logger.console(f"Away team: {away_team}")
+    if "teamSubtitle" in home_team:
+        logger.console(f"Home team subtitle: {home_team['teamSubtitle']}")
+        team1_record = home_team["teamSubtitle"]
+    if "teamSubtitle" in away_team:
+        logger.console(f"Away team subtitle: {away_team['teamSubtitle']}")
+        team2_record = away_team["teamSubtitle"]
+    if "teamLeader" in home_team:
+        if "playerSlug" in home_team["teamLeader"]:
+            logger.console(
+                f"Home team leader: {home_team['teamLeader']['playerSlug'].split('-', 1)[1].lower()}"
             )
+            #Get everything after the first "-"
+            team1_player_slug = home_team["teamLeader"]["playerSlug"].split('-', 1)[1].lower()
+    if "teamLeader" in away_team:
+        if "playerSlug" in away_team["teamLeader"]:
+            logger.console(
+                f"Away team leader: {away_team['teamLeader']['playerSlug'].split('-', 1)[1].lower()}"
+            )
+            team2_player_slug = away_team["teamLeader"]["playerSlug"].split('-', 1)[1].lower()
 
-        all_players_lastnames = PlayerDataUtils.get_players_lastnames(all_key_players)
-        logger.console(f"All players lastnames: {all_players_lastnames}")
-        play_by_play_url = game_data_processor.get_play_by_play_url(actions)
-        logger.console(
-            f"Looking for special_keywords in play by play: {special_keywords}"
+    # If players is empty, get key players
+    if not players:
+        # Get key players
+        box_score_data_processor = BoxScoreDataProcessor(box_score_data)
+        key_players = box_score_data_processor.get_key_players(game_tags)
+        # Print key players
+        for player in key_players:
+            logger.console(f"{player['familyName']}")
+        lead_stats_players = box_score_data_processor.get_lead_stats_players()
+        all_key_players = PlayerDataUtils.combine_players(
+            "personId", key_players, lead_stats_players
         )
-        play_by_play_data = fetch_game_play_by_play_data(
+        all_players_lastnames = PlayerDataUtils.get_players_lastnames(all_key_players)
+    else:
+        all_players_lastnames = players
+    logger.console(f"All players lastnames: {all_players_lastnames}")
+    play_by_play_url = game_data_processor.get_play_by_play_url(actions)
+    logger.console(
+        f"Looking for special_keywords in play by play: {special_keywords}"
+    )
+    # Clips are downloaded and preprocessed while the remaining events are still being resolved
+    directory = f"{OUTPUT_NBA_VIDEOS_DIR}/{date}/{game_slug}"
+    with ClipPipeline(download_manager, directory) as clip_pipeline:
+        fetch_game_play_by_play_data(
             play_by_play_url,
             special_keywords,
             all_players_lastnames,
             words_to_exclude,
             keywords,
+            box_score_data=box_score_data,
+            on_event_resolved=clip_pipeline.on_event_resolved,
         )
+    video_paths = clip_pipeline.close()
+
+    if not video_paths:
+        logger.console(f"No videos found for {game_slug}")
+        return None
+    return {
+        "directory": directory,
+        "video_paths": video_paths,
+        "render_backend": render_backend,
+        "render_profile": render_profile,
+        "max_open_clips": max_open_clips,
+        "box_score_data": box_score_data,
+        "thumbnail": {
+            "team1_name": team1_slug,
+            "team2_name": team2_slug,
+            "player1": team1_player_slug,
+            "player2": team2_player_slug,
+            "team1_score": team1_record,
+            "team2_score": team2_record,
+        },
+    }
+
 
-        for event_data in play_by_play_data:
-            for event_data_video_url in event_data.get("video_urls", []):
-                logger.console(
-                    f"Starting download play-by-play event video url: {event_data_video_url}"
-                )
-                VideoDownloader.download_video(
-                    event_data_video_url,
-                    f"{OUTPUT_NBA_VIDEOS_DIR}/{date}/{game_slug}",
-                    f"{event_data['pos']}_{event_data['clock']}_{event_data['title']}.mp4",
-                )
-
-        directory = f"{OUTPUT_NBA_VIDEOS_DIR}/{date}/{game_slug}"
-        video_paths = get_files_in_directory(directory)
+def render_game(render_job):
+    """
+    Runs the CPU-bound part of a game: the highlight video and its thumbnail.
+
+    Parameters:
+        render_job (dict): The dict returned by prepare_game.
+    """
+    directory = render_job["directory"]
+    render_profile = get_render_profile(render_job["render_profile"])
+    if render_job["render_backend"] == RENDER_BACKEND_FFMPEG:
+        create_highlight_video_ffmpeg(
+            render_job["video_paths"],
+            directory,
+            render_job["box_score_data"],
+            trim_clips=False,
+            render_profile=render_profile,
+        )
+    elif render_job["render_backend"] == RENDER_BACKEND_SEGMENTED:
+        create_highlight_video_segmented(
+            render_job["video_paths"],
+            directory,
+            render_job["box_score_data"],
+            trim_clips=False,
+            render_profile=render_profile,
+        )
+    elif render_job["render_backend"] == RENDER_BACKEND_INCREMENTAL:
+        create_highlight_video_incremental(
+            render_job["video_paths"],
+            directory,
+            render_job["box_score_data"],
+            trim_clips=False,
+            render_profile=render_profile,
+        )
+    elif render_job["render_backend"] == RENDER_BACKEND_COPY:
+        create_highlight_video_stream_copy(
+            render_job["video_paths"],
+            directory,
+            render_job["box_score_data"],
+            trim_clips=False,
+        )
+    else:
         VideoEditor.create_highlight_video(
-            video_paths, f"{OUTPUT_NBA_VIDEOS_DIR}/{date}/{game_slug}", box_score_data
+            render_job["video_paths"],
+            directory,
+            render_job["box_score_data"],
+            trim_clips=False,
+            render_profile=render_profile,
+            max_open_clips=render_job["max_open_clips"],
         )
-        # The game_slug has both teams, so we need to split it by the @
-        # game_slug_split = game_slug.split("@")
-        # team1_slug = game_slug_split[0]
-        # team2_slug = game_slug_split[1]
-        # logger.console(f"Team 1 slug: {team1_slug}")
-        # logger.console(f"Team 2 slug: {team2_slug}")
-        
-        thumbnail = ImageThumbnailCreator(team1_name=team1_slug, team2_name=team2_slug, player1=team1_player_slug, player2=team2_player_slug, team1_score=team1_record, team2_score=team2_record)
-        thumbnail.save()
+    thumbnail = ImageThumbnailCreator(**render_job["thumbnail"])
+    thumbnail.save(f"{directory}/nba_highlight_thumbnail.png")
+
+
+def process_game_data(
+    game_data,
+    date,
+    special_keywords,
+    players,
+    words_to_exclude,
+    keywords,
+    max_games=None,
+    team=None,
+    download_workers=4,
+    io_workers=2,
+    cpu_workers=1,
+    render_backend=RENDER_BACKEND_MOVIEPY,
+    render_profile=PROFILE_PUBLISH,
+    max_open_clips=None,
+):
+    games = select_games(game_data, max_games, team)
+    logger.console(f"Processing {len(games)} games")
+    download_manager = DownloadManager(max_workers=download_workers)
+    scheduler = GameScheduler(io_workers=io_workers, cpu_workers=cpu_workers)
+    try:
+        results = scheduler.run(
+            games,
+            lambda game_card: prepare_game(
+                game_card,
+                date,
+                special_keywords,
+                players,
+                words_to_exclude,
+                keywords,
+                download_manager,
+                render_backend,
+                render_profile,
+                max_open_clips,
+            ),
+            render_game,
+        )
+    finally:
+        download_manager.log_stats()
+        download_manager.close()
+    return results
 
 
 def handle_nba(
-    league, date, special_keywords, players, words_to_exclude, keywords, max_games, team
+    league,
+    date,
+    special_keywords,
+    players,
+    words_to_exclude,
+    keywords,
+    max_games,
+    team,
+    io_workers=2,
+    cpu_workers=1,
+    render_backend=RENDER_BACKEND_MOVIEPY,
+    render_profile=PROFILE_PUBLISH,
+    max_open_clips=None,
 ):
     try:
         init_directories(date)
@@ -196,7 +377,12 @@ def handle_nba(
                 words_to_exclude,
                 keywords,
                 max_games,
-                team
+                team,
+                io_workers=io_workers,
+                cpu_workers=cpu_workers,
+                render_backend=render_backend,
+                render_profile=render_profile,
+                max_open_clips=max_open_clips,
             )
         else:
             logger.console("No game data found")
@@ -205,7 +391,19 @@ def handle_nba(
 
 
 def main(
-    league, date, special_keywords, players, words_to_exclude, keywords, max_games, team
+    league,
+    date,
+    special_keywords,
+    players,
+    words_to_exclude,
+    keywords,
+    max_games,
+    team,
+    io_workers=2,
+    cpu_workers=1,
+    render_backend=RENDER_BACKEND_MOVIEPY,
+    render_profile=PROFILE_PUBLISH,
+    max_open_clips=None,
 ):
     if league.upper() == "NBA":
         input_video = "/home/irving/webdev/irving/sportlight/output/nba/videos/175_06:28_James 2' Running Dunk .mp4"
@@ -243,7 +441,12 @@ def main(
         #     words_to_exclude,
         #     keywords,
         #     max_games,
-        #     team
+        #     team,
+        #     io_workers=io_workers,
+        #     cpu_workers=cpu_workers,
+        #     render_backend=render_backend,
+        #     render_profile=render_profile,
+        #     max_open_clips=max_open_clips,
         # )
         # MAKE IMAGES TRANSPARENT
         imageUtilities = ImageUtilities()
@@ -323,11 +526,88 @@ def parse_arguments():
         help="Specify the team slug or the game id to process",
     )
 
+    parser.add_argument(
+        "--io_workers",
+        type=int,
+        default=2,
+        help="Specify the number of games scraped and downloaded at the same time",
+    )
+
+    parser.add_argument(
+        "--cpu_workers",
+        type=int,
+        default=1,
+        help="Specify the number of games rendered at the same time, each in its own process",
+    )
+
+    parser.add_argument(
+        "--render_backend",
+        choices=RENDER_BACKENDS,
+        default=RENDER_BACKEND_MOVIEPY,
+        help="Specify how the highlight video is assembled: with moviepy, with a single ffmpeg filtergraph that never decodes frames in Python, or by stream copying the clips when they share codec parameters (no logo overlay, written to final_highlight.mp4), or by encoding the segments of the ffmpeg timeline in parallel, optionally reusing the segments of earlier builds (incremental)",
+    )
+
+    parser.add_argument(
+        "--render_profile",
+        choices=list(RENDER_PROFILES),
+        default=PROFILE_PUBLISH,
+        help="Specify the encoder settings of the highlight video: fast-preview, publish or archive",
+    )
+
+    parser.add_argument(
+        "--max_open_clips",
+        type=int,
+        default=None,
+        help="Specify the maximum number of clips the moviepy backend keeps open, rendering the video in groups of that many clips. By default every clip is opened at once",
+    )
+
+    parser.add_argument(
+        "--browser_pool_size",
+        type=int,
+        default=2,
+        help="Specify the maximum number of Chrome sessions kept alive and reused by the crawlers. Event videos are resolved with this many browsers in parallel",
+    )
+
+    parser.add_argument(
+        "--headed",
+        action="store_true",
+        help="Launch the crawler browsers with a visible window instead of headless mode",
+    )
+
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Always fetch pages and scrape videos again instead of serving them from output/cache",
+    )
+
+    fixture_group = parser.add_mutually_exclusive_group()
+    fixture_group.add_argument(
+        "--record",
+        metavar="FIXTURE_DIR",
+        default=None,
+        help="Store every fetched page, __NEXT_DATA__ payload, video url resolution and downloaded clip in FIXTURE_DIR",
+    )
+    fixture_group.add_argument(
+        "--replay",
+        metavar="FIXTURE_DIR",
+        default=None,
+        help="Serve every page, video url resolution and download from a FIXTURE_DIR recorded with --record, without network",
+    )
+
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_arguments()
+    set_driver_pool(DriverPool(size=args.browser_pool_size, headless=not args.headed))
+    if args.no_cache:
+        set_page_cache(None)
+    if args.record:
+        set_fixture_store(FixtureStore(args.record, MODE_RECORD))
+    elif args.replay:
+        # Replayed runs must not depend on what happens to be in the page cache
+        set_page_cache(None)
+        set_fixture_store(FixtureStore(args.replay, MODE_REPLAY))
     main(
         args.league,
         args.date,
@@ -336,5 +616,10 @@ if __name__ == "__main__":
         args.words_to_exclude,
         args.keywords,
         args.max_games,
-        args.team
+        args.team,
+        io_workers=args.io_workers,
+        cpu_workers=args.cpu_workers,
+        render_backend=args.render_backend,
+        render_profile=args.render_profile,
+        max_open_clips=args.max_open_clips,
     )
@@ -0,0 +1,43 @@
+import argparse
+from common.asset_cache import AssetCache
+from common.asset_cache import COMMON_CLIP_RESOLUTIONS
+from common.asset_cache import DEFAULT_ASSET_CACHE_DIR
+from common.logger import logger
+
+
+def parse_resolution(value):
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid resolution {value}, expected WIDTHxHEIGHT (e.g. 1280x720)"
+        )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Generate the resized intro and logo used by the renders ahead of time"
+    )
+    parser.add_argument(
+        "--resolutions",
+        nargs="*",
+        type=parse_resolution,
+        default=COMMON_CLIP_RESOLUTIONS,
+        help="Specify the clip resolutions to generate the intro for, as WIDTHxHEIGHT",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        default=DEFAULT_ASSET_CACHE_DIR,
+        help="Specify the directory of the derived asset cache",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    asset_cache = AssetCache(args.cache_dir)
+    for path in asset_cache.prewarm(args.resolutions):
+        logger.console(f"Ready: {path}")
+    stats = asset_cache.get_stats()
+    logger.console(f"{stats['misses']} assets generated, {stats['hits']} already cached")
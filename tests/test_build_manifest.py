@@ -0,0 +1,63 @@
+from dotenv import load_dotenv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.common.build_manifest import BuildManifest, make_build_key
+
+load_dotenv()
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clip_path = os.path.join(self.directory.name, "001_clip.mp4")
+        self.manifest_path = os.path.join(self.directory.name, "manifest.json")
+        with open(self.clip_path, "wb") as f:
+            f.write(b"first take")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unchanged_file_is_not_hashed_again(self):
+        manifest = BuildManifest(self.manifest_path)
+        file_hash = manifest.get_file_hash(self.clip_path)
+        manifest.save([], None)
+
+        reloaded = BuildManifest(self.manifest_path)
+        with patch("src.common.build_manifest.hash_file") as hash_file:
+            self.assertEqual(reloaded.get_file_hash(self.clip_path), file_hash)
+            hash_file.assert_not_called()
+
+    def test_changed_file_is_hashed_again(self):
+        manifest = BuildManifest(self.manifest_path)
+        file_hash = manifest.get_file_hash(self.clip_path)
+        with open(self.clip_path, "wb") as f:
+            f.write(b"second take, longer")
+        self.assertNotEqual(manifest.get_file_hash(self.clip_path), file_hash)
+
+    def test_segments_round_trip(self):
+        segments = [{"kind": "clip", "source": self.clip_path, "trim": [0, 4.0], "key": "abc"}]
+        BuildManifest(self.manifest_path).save(segments, "final_highlight_logo.mp4")
+
+        reloaded = BuildManifest(self.manifest_path)
+        self.assertEqual(reloaded.segments, segments)
+        self.assertEqual(reloaded.get_segment_keys(), ["abc"])
+        self.assertEqual(reloaded.output, "final_highlight_logo.mp4")
+
+    def test_unreadable_manifest_starts_empty(self):
+        with open(self.manifest_path, "w") as f:
+            f.write("{not json")
+        manifest = BuildManifest(self.manifest_path)
+        self.assertEqual(manifest.segments, [])
+        self.assertIsNone(manifest.output)
+
+    def test_build_key_depends_on_every_part(self):
+        key = make_build_key("clip", "hash", 0, 4.0, {"crf": 21})
+        self.assertEqual(key, make_build_key("clip", "hash", 0, 4.0, {"crf": 21}))
+        self.assertNotEqual(key, make_build_key("clip", "hash", 0, 5.0, {"crf": 21}))
+        self.assertNotEqual(key, make_build_key("clip", "hash", 0, 4.0, {"crf": 16}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from dotenv import load_dotenv
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from src.common.clip_pipeline import ClipPipeline
+
+load_dotenv()
+
+
+class FailingDownloadManager:
+    # Every download fails with the error a missing replay fixture raises
+    max_workers = 1
+
+    def submit(self, video_url, output_directory, filename):
+        future = Future()
+        future.set_exception(LookupError(f"No recorded files for {video_url}"))
+        return future
+
+
+class SlowFirstDownloadManager:
+    # The first clip in play order lands last
+    max_workers = 2
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+    def _download(self, video_url, output_directory, filename):
+        time.sleep(0.3 if filename.startswith("001") else 0)
+        path = os.path.join(output_directory, filename)
+        with open(path, "wb") as f:
+            f.write(video_url.encode())
+        return path
+
+    def submit(self, video_url, output_directory, filename):
+        return self._executor.submit(self._download, video_url, output_directory, filename)
+
+
+CLIP_SIZES = {"001_10:00_dunk.mp4": [1280, 720], "002_09:00_layup.mp4": [960, 540]}
+# Size each fake preprocessed clip was scaled to, keyed by output path
+preprocessed_sizes = {}
+
+
+def parse_infos(path):
+    if os.path.dirname(path).endswith("preprocessed"):
+        return {"video_size": preprocessed_sizes[path]}
+    return {"video_size": CLIP_SIZES[os.path.basename(path)]}
+
+
+def preprocess(path, output_path, max_duration, width, height):
+    preprocessed_sizes[output_path] = [width, height]
+    with open(output_path, "wb") as f:
+        f.write(b"preprocessed")
+
+
+class TestClipPipeline(unittest.TestCase):
+    def test_failed_downloads_do_not_block_the_producer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pipeline = ClipPipeline(FailingDownloadManager(), directory, max_queued=2)
+            results = []
+
+            def produce():
+                for pos in range(6):
+                    event_data = {"pos": pos, "clock": "08:00", "title": "dunk"}
+                    pipeline.on_event_resolved(event_data, [f"https://example.com/{pos}.mp4"])
+                results.append(pipeline.close())
+
+            producer = threading.Thread(target=produce, daemon=True)
+            producer.start()
+            producer.join(timeout=10)
+            self.assertFalse(producer.is_alive())
+            self.assertEqual(results, [[]])
+            self.assertEqual(pipeline._failed, 6)
+
+    @patch("src.common.clip_pipeline.preprocess_clip", side_effect=preprocess)
+    @patch("src.common.clip_pipeline.ffmpeg_parse_infos", side_effect=parse_infos)
+    def test_clips_take_the_size_of_the_first_clip_in_play_order(self, *_):
+        with tempfile.TemporaryDirectory() as directory:
+            with ClipPipeline(SlowFirstDownloadManager(), directory) as pipeline:
+                pipeline.on_event_resolved({"pos": "001", "clock": "10:00", "title": "dunk"}, ["a"])
+                pipeline.on_event_resolved({"pos": "002", "clock": "09:00", "title": "layup"}, ["b"])
+            paths = pipeline.close()
+            self.assertEqual([os.path.basename(path) for path in paths], sorted(CLIP_SIZES))
+            self.assertEqual((pipeline.width, pipeline.height), (1280, 720))
+            self.assertEqual([preprocessed_sizes[path] for path in paths], [[1280, 720]] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+from dotenv import load_dotenv
+import unittest
+import numpy as np
+from src.common.video_editor import compute_camera_path
+
+load_dotenv()
+
+
+def reference_camera_path(ball_positions, frame_count, fps, frame_width, new_width, ease_factor):
+    # Frame by frame easing, as horizontal_pan_with_smooth_motion used to compute it
+    times = np.array(list(ball_positions.keys()))
+    positions = np.array([ball_positions[t] for t in times])
+    current_camera_x = 0
+    path = []
+    for frame_index in range(frame_count):
+        target_x = np.interp(frame_index * 1000 / fps, times, positions)
+        current_camera_x += (target_x - current_camera_x) * ease_factor
+        path.append(int(max(0, min(current_camera_x - new_width // 2, frame_width - new_width))))
+    return path
+
+
+class TestComputeCameraPath(unittest.TestCase):
+    def test_matches_frame_by_frame_easing(self):
+        ball_positions = {0: 300, 1000: 900, 2500: 1500, 4000: 200}
+        expected = reference_camera_path(ball_positions, 150, 30, 1920, 607, 0.05)
+        camera_path = compute_camera_path(ball_positions, 150, 30, 1920, 607, 0.05)
+        self.assertEqual(camera_path.tolist(), expected)
+
+    def test_crop_window_stays_inside_the_frame(self):
+        ball_positions = {0: -500, 2000: 5000}
+        camera_path = compute_camera_path(ball_positions, 120, 30, 1280, 405, 0.5)
+        self.assertGreaterEqual(camera_path.min(), 0)
+        self.assertLessEqual(camera_path.max(), 1280 - 405)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.detection_sampler import (
+    interpolate_samples,
+    plan_densification,
+    read_frames,
+)
+
+load_dotenv()
+
+
+class FakeCapture:
+    # Records how read_frames moves through a video of frame_count frames
+    def __init__(self, frame_count):
+        self.frame_count = frame_count
+        self.position = 0
+        self.seeks = []
+        self.grabs = 0
+
+    def get(self, prop):
+        return self.position
+
+    def set(self, prop, value):
+        self.seeks.append(value)
+        self.position = value
+
+    def grab(self):
+        if self.position >= self.frame_count:
+            return False
+        self.grabs += 1
+        self.position += 1
+        return True
+
+    def read(self):
+        if self.position >= self.frame_count:
+            return False, None
+        self.position += 1
+        return True, f"frame {self.position - 1}"
+
+
+class TestReadFrames(unittest.TestCase):
+    def test_grabs_short_gaps_and_seeks_long_ones(self):
+        cap = FakeCapture(300)
+        frames = list(read_frames(cap, [0, 5, 10, 200], seek_threshold=60))
+        self.assertEqual(frames, [(0, "frame 0"), (5, "frame 5"), (10, "frame 10"), (200, "frame 200")])
+        self.assertEqual(cap.grabs, 8)
+        self.assertEqual(cap.seeks, [200])
+
+    def test_seeks_back_to_earlier_frames(self):
+        cap = FakeCapture(300)
+        list(read_frames(cap, [100], seek_threshold=60))
+        frames = list(read_frames(cap, [50, 52], seek_threshold=60))
+        self.assertEqual(frames, [(50, "frame 50"), (52, "frame 52")])
+        self.assertEqual(cap.seeks, [100, 50])
+
+    def test_stops_at_the_end_of_the_video(self):
+        cap = FakeCapture(12)
+        frames = list(read_frames(cap, [0, 10, 20]))
+        self.assertEqual([frame_number for frame_number, _ in frames], [0, 10])
+
+
+class TestPlanDensification(unittest.TestCase):
+    def test_only_fast_moves_get_a_sample_in_between(self):
+        samples = {0: 100, 10: 110, 20: 400, 30: 405}
+        self.assertEqual(plan_densification(samples, max_jump=50), [15])
+
+    def test_gaps_with_a_missing_ball_or_next_to_each_other_are_kept(self):
+        samples = {0: 100, 10: None, 20: 900, 21: 100}
+        self.assertEqual(plan_densification(samples, max_jump=50), [])
+
+
+class TestInterpolateSamples(unittest.TestCase):
+    def test_fills_frames_between_found_samples(self):
+        detections = interpolate_samples({0: 100, 4: 200}, fps=25)
+        self.assertEqual(detections, {0: 100, 40: 125, 80: 150, 120: 175, 160: 200})
+
+    def test_does_not_interpolate_across_a_missing_ball(self):
+        detections = interpolate_samples({0: 100, 2: None, 4: 200, 6: 300}, fps=50)
+        self.assertEqual(detections, {0: 100, 80: 200, 100: 250, 120: 300})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+from dotenv import load_dotenv
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from src.common.download_manager import DownloadManager, FixtureMissingError
+from src.common.http_client import HttpClient
+
+load_dotenv()
+
+CLIP_BYTES = bytes(range(256)) * 400
+
+
+class RangeRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves CLIP_BYTES at every path, honoring Range requests.
+    The path /flaky drops the connection halfway through its first full response.
+    """
+
+    protocol_version = "HTTP/1.1"
+    requests_seen = []
+    flaky_failures = 0
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(CLIP_BYTES)))
+        self.end_headers()
+
+    def do_GET(self):
+        range_header = self.headers.get("Range")
+        RangeRequestHandler.requests_seen.append((self.path, range_header))
+        if range_header:
+            start = int(range_header.split("=")[1].split("-")[0])
+            if start >= len(CLIP_BYTES):
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = CLIP_BYTES[start:]
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(CLIP_BYTES) - 1}/{len(CLIP_BYTES)}"
+            )
+        else:
+            body = CLIP_BYTES
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.path == "/flaky" and not range_header and RangeRequestHandler.flaky_failures == 0:
+            RangeRequestHandler.flaky_failures += 1
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), RangeRequestHandler
+        )
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        RangeRequestHandler.requests_seen = []
+        RangeRequestHandler.flaky_failures = 0
+        self.output_directory = tempfile.mkdtemp()
+        self.manager = DownloadManager(
+            max_workers=3, http_client=HttpClient(backoff_factor=0), chunk_size=4096
+        )
+
+    def tearDown(self):
+        self.manager.close()
+
+    def read_file(self, filename):
+        with open(os.path.join(self.output_directory, filename), "rb") as f:
+            return f.read()
+
+    def test_downloads_in_parallel(self):
+        paths = self.manager.download_all(
+            [
+                {
+                    "url": f"{self.base_url}/clip{idx}.mp4",
+                    "output_directory": self.output_directory,
+                }
+                for idx in range(5)
+            ]
+        )
+        self.assertEqual(len(paths), 5)
+        for idx in range(5):
+            self.assertEqual(self.read_file(f"clip{idx}.mp4"), CLIP_BYTES)
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["completed"], 5)
+        self.assertEqual(stats["bytes_downloaded"], 5 * len(CLIP_BYTES))
+
+    def test_resumes_part_file_with_range_request(self):
+        with open(os.path.join(self.output_directory, "clip.mp4.part"), "wb") as f:
+            f.write(CLIP_BYTES[:1000])
+        path = self.manager.download(
+            f"{self.base_url}/clip.mp4", self.output_directory
+        )
+        self.assertEqual(self.read_file("clip.mp4"), CLIP_BYTES)
+        self.assertFalse(os.path.exists(path + ".part"))
+        self.assertEqual(RangeRequestHandler.requests_seen, [("/clip.mp4", "bytes=1000-")])
+        self.assertEqual(self.manager.get_stats()["resumed"], 1)
+
+    def test_resumes_after_dropped_connection(self):
+        self.manager.download(
+            f"{self.base_url}/flaky", self.output_directory, "flaky.mp4"
+        )
+        self.assertEqual(self.read_file("flaky.mp4"), CLIP_BYTES)
+        self.assertEqual(RangeRequestHandler.requests_seen[0], ("/flaky", None))
+        self.assertIsNotNone(RangeRequestHandler.requests_seen[-1][1])
+
+    def test_complete_part_file_is_finalized(self):
+        with open(os.path.join(self.output_directory, "clip.mp4.part"), "wb") as f:
+            f.write(CLIP_BYTES)
+        self.manager.download(f"{self.base_url}/clip.mp4", self.output_directory)
+        self.assertEqual(self.read_file("clip.mp4"), CLIP_BYTES)
+
+    def test_skips_existing_file(self):
+        with open(os.path.join(self.output_directory, "clip.mp4"), "wb") as f:
+            f.write(b"already here")
+        self.manager.download(f"{self.base_url}/clip.mp4", self.output_directory)
+        self.assertEqual(self.read_file("clip.mp4"), b"already here")
+        self.assertEqual(RangeRequestHandler.requests_seen, [])
+        self.assertEqual(self.manager.get_stats()["skipped"], 1)
+
+    def test_urls_sharing_a_file_name_are_downloaded_once(self):
+        paths = self.manager.download_all(
+            [
+                {
+                    "url": f"{self.base_url}/clip{idx}.mp4",
+                    "output_directory": self.output_directory,
+                    "filename": "001_08:00_dunk.mp4",
+                }
+                for idx in range(3)
+            ]
+        )
+        self.assertEqual(len(set(paths)), 1)
+        self.assertEqual(self.read_file("001_08:00_dunk.mp4"), CLIP_BYTES)
+        self.assertEqual(len(RangeRequestHandler.requests_seen), 1)
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["completed"], 1)
+        self.assertEqual(stats["skipped"], 2)
+
+    def test_replay_of_unrecorded_download_fails(self):
+        # A download that failed while recording has no fixture
+        store = MagicMock(replaying=True)
+        store.load_file.side_effect = FixtureMissingError("No recorded files")
+        with patch("src.common.download_manager.get_fixture_store", return_value=store):
+            path = self.manager.download(f"{self.base_url}/clip.mp4", self.output_directory)
+        self.assertIsNone(path)
+        self.assertEqual(RangeRequestHandler.requests_seen, [])
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["completed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+from dotenv import load_dotenv
+import threading
+import unittest
+from unittest.mock import patch
+from selenium.common.exceptions import WebDriverException
+from src.common.driver_pool import DriverPool
+
+load_dotenv()
+
+
+class FakeDriver:
+    # Stands in for webdriver.Chrome, answers the health check until it crashes
+    def __init__(self, options=None):
+        self.crashed = False
+        self.quit_count = 0
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def execute_script(self, script):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        return 1
+
+    def quit(self):
+        self.quit_count += 1
+
+
+class TestDriverPool(unittest.TestCase):
+    def setUp(self):
+        chrome_patch = patch("src.common.driver_pool.webdriver.Chrome", side_effect=FakeDriver)
+        self.chrome = chrome_patch.start()
+        self.addCleanup(chrome_patch.stop)
+
+    def make_pool(self, **kwargs):
+        pool = DriverPool(**kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_returned_session_is_borrowed_again(self):
+        pool = self.make_pool(size=2)
+        with pool.borrow() as first:
+            pass
+        with pool.borrow() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.chrome.call_count, 1)
+        self.assertEqual(pool.get_metrics()["pages_served"], 2)
+
+    def test_borrow_waits_for_a_free_browser(self):
+        pool = self.make_pool(size=1)
+        borrowed = threading.Event()
+        sessions = []
+
+        def borrow():
+            with pool.borrow() as session:
+                sessions.append(session)
+                borrowed.set()
+
+        with pool.borrow() as first:
+            thread = threading.Thread(target=borrow, daemon=True)
+            thread.start()
+            self.assertFalse(borrowed.wait(timeout=0.2))
+        thread.join(timeout=5)
+        self.assertEqual(sessions, [first])
+        self.assertEqual(self.chrome.call_count, 1)
+
+    def test_session_raising_a_webdriver_error_is_replaced(self):
+        pool = self.make_pool(size=1)
+        with self.assertRaises(WebDriverException):
+            with pool.borrow() as broken:
+                raise WebDriverException("tab crashed")
+        self.assertEqual(broken.driver.quit_count, 1)
+
+        with pool.borrow() as replacement:
+            self.assertIsNot(replacement, broken)
+        self.assertEqual(self.chrome.call_count, 2)
+
+    def test_idle_session_failing_its_health_check_is_replaced(self):
+        pool = self.make_pool(size=1)
+        with pool.borrow() as crashed:
+            pass
+        crashed.driver.crashed = True
+
+        with pool.borrow() as replacement:
+            self.assertIsNot(replacement, crashed)
+        self.assertEqual(crashed.driver.quit_count, 1)
+
+    def test_session_is_recycled_after_its_page_limit(self):
+        pool = self.make_pool(size=1, recycle_after=2)
+        sessions = []
+        for _ in range(3):
+            with pool.borrow() as session:
+                sessions.append(session)
+        self.assertIs(sessions[0], sessions[1])
+        self.assertIsNot(sessions[1], sessions[2])
+        self.assertEqual(sessions[0].driver.quit_count, 1)
+
+    def test_close_quits_every_browser(self):
+        pool = self.make_pool(size=2)
+        with pool.borrow() as borrowed:
+            with pool.borrow() as idle:
+                pass
+            pool.close()
+            self.assertEqual(idle.driver.quit_count, 1)
+            # Still in use, so quit once it is returned
+            self.assertEqual(borrowed.driver.quit_count, 0)
+        self.assertEqual(borrowed.driver.quit_count, 1)
+        self.assertEqual(pool.get_metrics()["sessions_launched"], 2)
+
+        with self.assertRaises(RuntimeError):
+            with pool.borrow():
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
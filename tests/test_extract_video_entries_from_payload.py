@@ -0,0 +1,86 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.utilities import extract_video_entries_from_payload
+from src.common.utilities import match_rows_to_video_entries
+
+load_dotenv()
+
+
+class TestExtractVideoEntriesFromPayload(unittest.TestCase):
+
+    def test_stats_video_payload(self):
+        payload = {
+            "resultSets": {
+                "Meta": {
+                    "videoUrls": [
+                        {"uuid": "a", "lurl": "https://videos.nba.com/a_1280x720.mp4"},
+                        {"uuid": "b", "murl": "https://videos.nba.com/b_960x540.mp4"},
+                    ]
+                },
+                "playlist": [
+                    {"ei": 175, "dsc": "James 2' Running Dunk (20 PTS)"},
+                    {"ei": 180, "dsc": "Davis 1' Alley Oop Dunk (12 PTS)"},
+                ],
+            }
+        }
+        self.assertEqual(
+            extract_video_entries_from_payload(payload),
+            [
+                {
+                    "url": "https://videos.nba.com/a_1280x720.mp4",
+                    "description": "James 2' Running Dunk (20 PTS)",
+                },
+                {
+                    "url": "https://videos.nba.com/b_960x540.mp4",
+                    "description": "Davis 1' Alley Oop Dunk (12 PTS)",
+                },
+            ],
+        )
+
+    def test_unknown_payload_collects_mp4_urls(self):
+        payload = {
+            "data": [
+                {"clip": "https://cdn.example.com/1.mp4"},
+                {"clip": "https://cdn.example.com/1.mp4"},
+                {"thumb": "https://cdn.example.com/1.jpg"},
+            ]
+        }
+        self.assertEqual(
+            extract_video_entries_from_payload(payload),
+            [{"url": "https://cdn.example.com/1.mp4", "description": None}],
+        )
+
+    def test_match_rows_by_description(self):
+        entries = [
+            {"url": "b.mp4", "description": "Davis 1' Alley Oop Dunk"},
+            {"url": "a.mp4", "description": "James 2' Running Dunk"},
+        ]
+        self.assertEqual(
+            match_rows_to_video_entries(
+                [
+                    "Q3 06:28 James 2' Running Dunk (20 PTS)",
+                    "Q3 05:10 Reaves 26' 3PT Jump Shot",
+                    "Q3 04:02 Davis 1' Alley Oop Dunk",
+                ],
+                entries,
+            ),
+            ["a.mp4", None, "b.mp4"],
+        )
+
+    def test_match_rows_by_position_without_descriptions(self):
+        entries = [
+            {"url": "a.mp4", "description": None},
+            {"url": "b.mp4", "description": None},
+        ]
+        self.assertEqual(
+            match_rows_to_video_entries(["row 1", "row 2"], entries),
+            ["a.mp4", "b.mp4"],
+        )
+        self.assertEqual(
+            match_rows_to_video_entries(["row 1", "row 2", "row 3"], entries),
+            [None, None, None],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
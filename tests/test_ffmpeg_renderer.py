@@ -0,0 +1,58 @@
+from dotenv import load_dotenv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import ffmpeg
+from src.common.ffmpeg_renderer import concatenate_clips, create_highlight_video_ffmpeg
+
+load_dotenv()
+
+CLIP_INFOS = {"video_size": [320, 180], "duration": 2.0, "audio_found": False}
+
+
+def build_segments(video_paths, *_):
+    clip = ffmpeg.input(video_paths[0])
+    return [(clip.video, clip.audio)]
+
+
+@patch("src.common.ffmpeg_renderer.ffmpeg_parse_infos", return_value=CLIP_INFOS)
+class TestFailedRenderCleanup(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # Not a video, so ffmpeg fails to render it
+        self.clip_path = os.path.join(self.directory.name, "001_10:00_dunk.mp4")
+        with open(self.clip_path, "wb") as f:
+            f.write(b"not a video")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def leave_part_file(self, path):
+        # As an interrupted earlier render would
+        with open(path, "wb") as f:
+            f.write(b"truncated")
+        return path
+
+    @patch("src.common.ffmpeg_renderer.add_logo", side_effect=lambda video, width: video)
+    @patch("src.common.ffmpeg_renderer.build_highlight_segments", side_effect=build_segments)
+    def test_failed_highlight_video_leaves_no_part_file(self, *_):
+        part_path = self.leave_part_file(
+            os.path.join(self.directory.name, "final_highlight_logo.part.mp4")
+        )
+        self.assertIsNone(create_highlight_video_ffmpeg([self.clip_path], self.directory.name, []))
+        self.assertFalse(os.path.exists(part_path))
+        self.assertFalse(
+            os.path.exists(os.path.join(self.directory.name, "final_highlight_logo.mp4"))
+        )
+
+    def test_failed_join_leaves_no_part_file(self, _):
+        output_path = os.path.join(self.directory.name, "joined.mp4")
+        part_path = self.leave_part_file(os.path.join(self.directory.name, "joined.part.mp4"))
+        self.assertIsNone(concatenate_clips([self.clip_path], output_path))
+        self.assertFalse(os.path.exists(part_path))
+        self.assertFalse(os.path.exists(output_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+from dotenv import load_dotenv
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+from src.common.fixture_store import (
+    MODE_RECORD,
+    MODE_REPLAY,
+    FixtureMissingError,
+    FixtureStore,
+)
+from src.crawler.nba_crawler import fetch_game_play_by_play_data
+
+load_dotenv()
+
+PLAY_BY_PLAY_URL = "https://www.nba.com/game/lal-vs-bos-0022300001/play-by-play"
+FILTERS = [["dunk"], ["James"], [], []]
+EVENTS = [
+    {
+        "pos": "175",
+        "clock": "06:28",
+        "title": "James 2' Running Dunk",
+        "video_urls": ["https://videos.nba.com/175.mp4"],
+    }
+]
+
+
+class TestFixtureStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.recorder = FixtureStore(self.directory.name, MODE_RECORD)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def replayer(self):
+        return FixtureStore(self.directory.name, MODE_REPLAY)
+
+    def test_replay_returns_what_was_recorded(self):
+        clip_path = os.path.join(self.directory.name, "downloaded.mp4")
+        with open(clip_path, "wb") as f:
+            f.write(b"clip bytes")
+        self.recorder.save_page(PLAY_BY_PLAY_URL, b"<html>page</html>")
+        self.recorder.save_json("play_by_play", PLAY_BY_PLAY_URL, EVENTS, FILTERS)
+        self.recorder.save_json("play_by_play", PLAY_BY_PLAY_URL, None, [[], [], [], []])
+        self.recorder.save_file(EVENTS[0]["video_urls"][0], clip_path)
+
+        replayer = self.replayer()
+        self.assertEqual(replayer.load_page(PLAY_BY_PLAY_URL), b"<html>page</html>")
+        self.assertEqual(replayer.load_json("play_by_play", PLAY_BY_PLAY_URL, FILTERS), EVENTS)
+        self.assertIsNone(replayer.load_json("play_by_play", PLAY_BY_PLAY_URL, [[], [], [], []]))
+        replayed_path = os.path.join(self.directory.name, "replayed.mp4")
+        replayer.load_file(EVENTS[0]["video_urls"][0], replayed_path)
+        with open(replayed_path, "rb") as f:
+            self.assertEqual(f.read(), b"clip bytes")
+
+        with open(os.path.join(self.directory.name, "index.jsonl")) as f:
+            kinds = [json.loads(line)["kind"] for line in f]
+        self.assertEqual(kinds, ["pages", "play_by_play", "play_by_play", "files"])
+
+    def test_missing_fixture_raises(self):
+        self.recorder.save_json("play_by_play", PLAY_BY_PLAY_URL, EVENTS, FILTERS)
+        replayer = self.replayer()
+        with self.assertRaises(FixtureMissingError):
+            replayer.load_page(PLAY_BY_PLAY_URL)
+        with self.assertRaises(FixtureMissingError):
+            replayer.load_json("play_by_play", PLAY_BY_PLAY_URL, [["block"], [], [], []])
+        destination_path = os.path.join(self.directory.name, "missing.mp4")
+        with self.assertRaises(FixtureMissingError):
+            replayer.load_file("https://videos.nba.com/missing.mp4", destination_path)
+
+    def test_replay_needs_an_existing_directory(self):
+        with self.assertRaises(FileNotFoundError):
+            FixtureStore(os.path.join(self.directory.name, "missing"), MODE_REPLAY)
+        with self.assertRaises(ValueError):
+            FixtureStore(self.directory.name, "live")
+
+
+class TestPlayByPlayReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        environment = patch.dict(os.environ, {"NBA_BASE_URL": "https://www.nba.com"})
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def replay(self, recorded_events):
+        FixtureStore(self.directory.name, MODE_RECORD).save_json(
+            "play_by_play", PLAY_BY_PLAY_URL, recorded_events, FILTERS
+        )
+        on_event_resolved = Mock()
+        with patch(
+            "src.crawler.nba_crawler.get_fixture_store",
+            return_value=FixtureStore(self.directory.name, MODE_REPLAY),
+        ):
+            events = fetch_game_play_by_play_data(
+                "/game/lal-vs-bos-0022300001/play-by-play",
+                *FILTERS,
+                on_event_resolved=on_event_resolved,
+            )
+        return events, on_event_resolved
+
+    def test_recorded_events_are_resolved_again(self):
+        events, on_event_resolved = self.replay(EVENTS)
+        self.assertEqual(events, EVENTS)
+        on_event_resolved.assert_called_once_with(EVENTS[0], EVENTS[0]["video_urls"])
+
+    def test_game_recorded_without_events_replays_as_none(self):
+        events, on_event_resolved = self.replay(None)
+        self.assertIsNone(events)
+        on_event_resolved.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
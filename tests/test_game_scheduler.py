@@ -0,0 +1,49 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.game_scheduler import GameScheduler
+
+load_dotenv()
+
+
+def scrape(game):
+    if game == "broken-scrape":
+        raise RuntimeError("box score missing")
+    if game == "no-clips":
+        return None
+    return {"game": game}
+
+
+def render(render_job):
+    if render_job["game"] == "broken-render":
+        raise RuntimeError("render failed")
+    return render_job["game"]
+
+
+class TestGameScheduler(unittest.TestCase):
+    def test_failures_are_isolated_per_game(self):
+        games = [
+            (name, name)
+            for name in ["lal-bos", "broken-scrape", "no-clips", "broken-render", "mia-nyk"]
+        ]
+        scheduler = GameScheduler(io_workers=2, cpu_workers=2, use_processes=False)
+        results = scheduler.run(games, scrape, render)
+
+        self.assertEqual(results["lal-bos"]["status"], "done")
+        self.assertEqual(results["mia-nyk"]["status"], "done")
+        self.assertEqual(results["no-clips"]["status"], "skipped")
+        self.assertEqual(results["broken-scrape"]["status"], "failed")
+        self.assertEqual(results["broken-scrape"]["stage"], "io")
+        self.assertEqual(results["broken-render"]["status"], "failed")
+        self.assertEqual(results["broken-render"]["stage"], "cpu")
+        self.assertIn("render failed", results["broken-render"]["error"])
+
+    def test_render_stage_runs_in_worker_processes(self):
+        scheduler = GameScheduler(io_workers=2, cpu_workers=2)
+        results = scheduler.run([("lal-bos", "lal-bos")], scrape, render)
+
+        self.assertEqual(results["lal-bos"]["status"], "done")
+        self.assertIsNotNone(results["lal-bos"]["cpu_seconds"])
+
+
+if __name__ == "__main__":
+    unittest.main()
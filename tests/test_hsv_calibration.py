@@ -0,0 +1,73 @@
+from dotenv import load_dotenv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import cv2
+import numpy as np
+from src.common.hsv_calibration import (
+    compute_hsv_range,
+    get_hsv_range,
+    merge_hsv_statistics,
+)
+
+load_dotenv()
+
+
+class TestHsvCalibration(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sample_directory = os.path.join(self.directory.name, "samples")
+        self.cache_path = os.path.join(self.directory.name, "cache", "hsv_range.json")
+        os.makedirs(self.sample_directory)
+        rng = np.random.default_rng(7)
+        self.image_paths = []
+        for i, size in enumerate([(12, 9), (20, 15), (5, 31)]):
+            image_path = os.path.join(self.sample_directory, f"bball{i}.png")
+            cv2.imwrite(image_path, rng.integers(0, 256, (*size, 3), dtype=np.uint8))
+            self.image_paths.append(image_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_streaming_statistics_match_all_pixels_at_once(self):
+        batches = [np.random.default_rng(i).uniform(0, 255, (n, 3)) for i, n in enumerate([7, 50, 1])]
+        count, mean, m2 = (0, 0, 0)
+        for batch in batches:
+            count, mean, m2 = merge_hsv_statistics((count, mean, m2), batch)
+        all_pixels = np.vstack(batches)
+        self.assertEqual(count, len(all_pixels))
+        np.testing.assert_allclose(mean, all_pixels.mean(axis=0))
+        np.testing.assert_allclose(np.sqrt(m2 / count), all_pixels.std(axis=0))
+
+    def test_range_matches_stacked_images(self):
+        hsv_images = [
+            cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2HSV).reshape(-1, 3) for path in self.image_paths
+        ]
+        all_pixels = np.vstack(hsv_images)
+        lower_hsv, upper_hsv = compute_hsv_range(self.image_paths, factor=0.8)
+        np.testing.assert_allclose(lower_hsv, all_pixels.mean(axis=0) - all_pixels.std(axis=0) * 0.8)
+        np.testing.assert_allclose(upper_hsv, all_pixels.mean(axis=0) + all_pixels.std(axis=0) * 0.8)
+
+    def test_range_is_computed_once(self):
+        lower_hsv, upper_hsv = get_hsv_range(self.sample_directory, cache_path=self.cache_path)
+        with patch("src.common.hsv_calibration.compute_hsv_range") as compute:
+            cached_lower, cached_upper = get_hsv_range(self.sample_directory, cache_path=self.cache_path)
+            compute.assert_not_called()
+        np.testing.assert_allclose(cached_lower, lower_hsv)
+        np.testing.assert_allclose(cached_upper, upper_hsv)
+
+    def test_changed_sample_or_factor_computes_again(self):
+        lower_hsv, _ = get_hsv_range(self.sample_directory, cache_path=self.cache_path)
+        wider_lower, _ = get_hsv_range(self.sample_directory, factor=1.5, cache_path=self.cache_path)
+        self.assertTrue(np.all(wider_lower <= lower_hsv))
+
+        cv2.imwrite(self.image_paths[0], np.full((12, 9, 3), 40, dtype=np.uint8))
+        unchanged_range = (np.zeros(3), np.zeros(3))
+        with patch("src.common.hsv_calibration.compute_hsv_range", return_value=unchanged_range) as compute:
+            get_hsv_range(self.sample_directory, cache_path=self.cache_path)
+            compute.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
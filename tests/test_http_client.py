@@ -0,0 +1,136 @@
+from dotenv import load_dotenv
+import http.server
+import threading
+import unittest
+from unittest.mock import Mock, patch
+from src.common.http_client import AsyncHttpClient, HttpClient, get_retry_delay
+
+load_dotenv()
+
+
+class FlakyRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answers /flaky with 503 twice before a 200, /throttled with a 429 carrying
+    Retry-After: 0 before a 200, and /down with 503 every time.
+    """
+
+    protocol_version = "HTTP/1.1"
+    attempts = {}
+
+    def do_GET(self):
+        attempt = FlakyRequestHandler.attempts.get(self.path, 0)
+        FlakyRequestHandler.attempts[self.path] = attempt + 1
+        headers = {}
+        if self.path == "/flaky" and attempt < 2 or self.path == "/down":
+            status = 503
+        elif self.path == "/throttled" and attempt == 0:
+            status = 429
+            headers["Retry-After"] = "0"
+        else:
+            status = 200
+        body = b"ok" if status == 200 else b"busy"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpServerTestCase:
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FlakyRequestHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FlakyRequestHandler.attempts = {}
+
+
+class TestRetryDelay(unittest.TestCase):
+    def test_backoff_grows_with_each_attempt_and_is_capped(self):
+        with patch("src.common.http_client.random.uniform", side_effect=lambda low, high: high):
+            delays = [get_retry_delay(attempt, 0.5, max_delay=3) for attempt in range(4)]
+        self.assertEqual(delays, [0.5, 1.0, 2.0, 3])
+
+    def test_retry_after_header_is_honored(self):
+        response = Mock(headers={"Retry-After": "7"})
+        self.assertEqual(get_retry_delay(0, 0.5, response), 7.0)
+        self.assertEqual(get_retry_delay(0, 0.5, response, max_delay=5), 5)
+
+
+class TestHttpClient(HttpServerTestCase, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = HttpClient(backoff_factor=0)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_retries_server_errors(self):
+        response = self.client.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        metrics = self.client.get_metrics()
+        self.assertEqual(metrics["requests"], 3)
+        self.assertEqual(metrics["retries"], 2)
+        self.assertEqual(metrics["failures"], 0)
+
+    def test_waits_for_retry_after_on_429(self):
+        with patch("src.common.http_client.time.sleep") as sleep:
+            response = self.client.get(f"{self.base_url}/throttled")
+        self.assertEqual(response.status_code, 200)
+        sleep.assert_called_once_with(0.0)
+
+    def test_gives_up_after_max_retries(self):
+        response = self.client.get(f"{self.base_url}/down")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(FlakyRequestHandler.attempts["/down"], self.client.max_retries + 1)
+        self.assertEqual(self.client.get_metrics()["failures"], 1)
+
+
+class TestAsyncHttpClient(HttpServerTestCase, unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncHttpClient(backoff_factor=0)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_retries_server_errors(self):
+        response = await self.client.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        metrics = self.client.get_metrics()
+        self.assertEqual(metrics["requests"], 3)
+        self.assertEqual(metrics["retries"], 2)
+        self.assertEqual(metrics["failures"], 0)
+
+    async def test_waits_for_retry_after_on_429(self):
+        with patch("src.common.http_client.asyncio.sleep") as sleep:
+            response = await self.client.get(f"{self.base_url}/throttled")
+        self.assertEqual(response.status_code, 200)
+        sleep.assert_called_once_with(0.0)
+
+    async def test_gives_up_after_max_retries(self):
+        response = await self.client.get(f"{self.base_url}/down")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(FlakyRequestHandler.attempts["/down"], self.client.max_retries + 1)
+        self.assertEqual(self.client.get_metrics()["failures"], 1)
+
+    async def test_reuses_pooled_connections(self):
+        responses = await self.client.get_all([f"{self.base_url}/ok"] * 3)
+        responses += await self.client.get_all([f"{self.base_url}/ok"] * 3)
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertGreater(self.client.get_metrics()["connections_reused"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+from dotenv import load_dotenv
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src.common.page_cache import (
+    GAME_STATUS_FINAL,
+    GAME_STATUS_LIVE,
+    GAME_STATUS_SCHEDULED,
+    PageCache,
+    get_game_ttl,
+    zstandard,
+)
+
+load_dotenv()
+
+GAME_URL = "https://www.nba.com/game/lal-vs-bos-0022300001"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class PageCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        clock_patch = patch("src.common.page_cache.time", self.clock)
+        clock_patch.start()
+        self.addCleanup(clock_patch.stop)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_cache(self, **kwargs):
+        cache = PageCache(self.directory.name, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def count_blobs(self):
+        blobs_directory = os.path.join(self.directory.name, "blobs")
+        return sum(len(files) for _, _, files in os.walk(blobs_directory))
+
+
+class TestGameTtl(PageCacheTestCase):
+    def test_live_pages_expire_after_a_minute(self):
+        cache = self.make_cache()
+        cache.put(GAME_URL, b"live", ttl=get_game_ttl(GAME_STATUS_LIVE))
+        self.clock.advance(59)
+        self.assertEqual(cache.get(GAME_URL), b"live")
+        self.clock.advance(2)
+        self.assertIsNone(cache.get(GAME_URL))
+
+    def test_scheduled_pages_expire_after_half_an_hour(self):
+        cache = self.make_cache()
+        cache.put(GAME_URL, b"scheduled", ttl=get_game_ttl(GAME_STATUS_SCHEDULED))
+        self.clock.advance(29 * 60)
+        self.assertEqual(cache.get(GAME_URL), b"scheduled")
+        self.clock.advance(2 * 60)
+        self.assertIsNone(cache.get(GAME_URL))
+
+    def test_final_pages_never_expire(self):
+        cache = self.make_cache()
+        cache.put(GAME_URL, b"final", ttl=get_game_ttl(GAME_STATUS_FINAL))
+        self.clock.advance(365 * 24 * 3600)
+        self.assertEqual(cache.get(GAME_URL), b"final")
+
+    def test_set_ttl_counts_from_when_the_entry_was_stored(self):
+        cache = self.make_cache()
+        cache.put(GAME_URL, b"page", ttl=get_game_ttl(GAME_STATUS_SCHEDULED))
+        self.clock.advance(120)
+        cache.set_ttl(GAME_URL, get_game_ttl(GAME_STATUS_LIVE))
+        self.assertIsNone(cache.get(GAME_URL))
+
+        cache.set_ttl(GAME_URL, get_game_ttl(GAME_STATUS_FINAL))
+        self.clock.advance(365 * 24 * 3600)
+        self.assertEqual(cache.get(GAME_URL), b"page")
+
+
+class TestPageCacheStorage(PageCacheTestCase):
+    def test_least_recently_used_entries_are_evicted_first(self):
+        # The three first bodies take 32 bytes, the fourth pushes the total over the limit
+        cache = self.make_cache(max_size_bytes=40, compress=False)
+        for name in ["first", "second", "third"]:
+            cache.put(f"{GAME_URL}/{name}", name.encode() * 2)
+            self.clock.advance(1)
+        cache.get(f"{GAME_URL}/first")
+        self.clock.advance(1)
+        cache.put(f"{GAME_URL}/fourth", b"fourthfourth")
+
+        self.assertIsNone(cache.get(f"{GAME_URL}/second"))
+        self.assertEqual(cache.get(f"{GAME_URL}/first"), b"firstfirst")
+        self.assertEqual(cache.get(f"{GAME_URL}/third"), b"thirdthird")
+        self.assertEqual(cache.get(f"{GAME_URL}/fourth"), b"fourthfourth")
+        self.assertEqual(cache.get_stats()["size_bytes"], 32)
+
+    def test_identical_bodies_share_one_blob(self):
+        cache = self.make_cache()
+        cache.put(f"{GAME_URL}?period=1", b"same payload")
+        cache.put(f"{GAME_URL}?period=2", b"same payload")
+        self.assertEqual(cache.get(f"{GAME_URL}?period=2"), b"same payload")
+        self.assertEqual(cache.get_stats()["entries"], 2)
+        self.assertEqual(self.count_blobs(), 1)
+
+    def test_tracking_parameters_share_an_entry(self):
+        cache = self.make_cache()
+        cache.put(f"{GAME_URL}?b=2&a=1", b"page")
+        self.assertEqual(cache.get(f"{GAME_URL}?a=1&b=2&utm_source=feed#box-score"), b"page")
+
+    def test_stores_plain_bodies_without_zstandard(self):
+        with patch("src.common.page_cache.zstandard", None):
+            cache = self.make_cache(compress=True)
+            self.assertFalse(cache.compress)
+            cache.put(GAME_URL, b"uncompressed")
+            self.assertEqual(cache.get(GAME_URL), b"uncompressed")
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_compressed_entry_is_a_miss_without_zstandard(self):
+        cache = self.make_cache(compress=True)
+        cache.put(GAME_URL, b"compressed " * 100)
+        self.assertEqual(cache.get(GAME_URL), b"compressed " * 100)
+        with patch("src.common.page_cache.zstandard", None):
+            self.assertIsNone(cache.get(GAME_URL))
+
+
+if __name__ == "__main__":
+    unittest.main()
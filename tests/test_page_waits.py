@@ -0,0 +1,47 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.page_waits import PageWaiter, WaitRecorder
+
+load_dotenv()
+
+
+class FakeElement:
+    def __init__(self, attributes):
+        self.attributes = attributes
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class FakeDriver:
+    # The video element's src changes after ``changes_after`` reads, or never when None
+    def __init__(self, src, new_src=None, changes_after=None):
+        self.reads = 0
+        self.src = src
+        self.new_src = new_src
+        self.changes_after = changes_after
+
+    def find_element(self, by, value):
+        self.reads += 1
+        if self.changes_after is not None and self.reads > self.changes_after:
+            return FakeElement({"src": self.new_src})
+        return FakeElement({"src": self.src})
+
+
+class TestWaitForAttributeChange(unittest.TestCase):
+    def test_returns_the_new_value(self):
+        driver = FakeDriver("first.mp4", "second.mp4", changes_after=2)
+        waiter = PageWaiter(driver, WaitRecorder(), poll_frequency=0.01)
+        value = waiter.wait_for_attribute_change(("id", "video"), "src", "first.mp4", timeout=1)
+        self.assertEqual(value, "second.mp4")
+
+    def test_returns_none_when_the_value_does_not_change(self):
+        recorder = WaitRecorder()
+        waiter = PageWaiter(FakeDriver("first.mp4"), recorder, poll_frequency=0.01)
+        value = waiter.wait_for_attribute_change(("id", "video"), "src", "first.mp4", timeout=0.05)
+        self.assertIsNone(value)
+        self.assertEqual(recorder.summary()["src_change"]["timeouts"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.utilities import format_play_by_play_clock
+from src.common.utilities import process_play_by_play_actions
+
+load_dotenv()
+
+ACTIONS = [
+    {
+        "actionNumber": 175,
+        "clock": "PT06M28.00S",
+        "period": 2,
+        "description": "James 2' Running Dunk (20 PTS)",
+        "videoAvailable": 1,
+    },
+    {
+        "actionNumber": 176,
+        "clock": "PT06M12.00S",
+        "period": 2,
+        "description": "Bol P.FOUL (P2.T2) (S.Wright)",
+        "videoAvailable": 1,
+    },
+    {
+        "actionNumber": 180,
+        "clock": "PT05M50.00S",
+        "period": 2,
+        "description": "Davis 1' Alley Oop Dunk (12 PTS)",
+        "videoAvailable": 0,
+    },
+    {
+        "actionNumber": 9,
+        "clock": "PT11M02.40S",
+        "period": 1,
+        "description": "Davis 25' 3PT Jump Shot (3 PTS)",
+        "videoAvailable": 1,
+    },
+]
+
+
+class TestProcessPlayByPlayActions(unittest.TestCase):
+
+    def test_format_clock(self):
+        self.assertEqual(format_play_by_play_clock("PT06M28.00S"), "06:28")
+        self.assertEqual(format_play_by_play_clock("PT00M05.30S"), "00:05")
+        self.assertEqual(format_play_by_play_clock("06:28"), "06:28")
+
+    def test_special_keyword_records(self):
+        events = process_play_by_play_actions(
+            ACTIONS,
+            "0022300682",
+            "https://www.nba.com",
+            "2023-24",
+            special_keywords=["dunk"],
+        )
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["pos"], "175")
+        self.assertEqual(events[0]["title"], "James 2' Running Dunk ")
+        self.assertEqual(events[0]["clock"], "06:28")
+        self.assertTrue(
+            events[0]["page_url"].startswith("https://www.nba.com/stats/events?")
+        )
+        self.assertIn("GameEventID=175", events[0]["page_url"])
+        self.assertIn("GameID=0022300682", events[0]["page_url"])
+
+    def test_player_filters(self):
+        events = process_play_by_play_actions(
+            ACTIONS,
+            "0022300682",
+            "https://www.nba.com",
+            "2023-24",
+            players=["Davis", "Bol"],
+            words_to_exclude=["FOUL"],
+            keywords=["3PT"],
+        )
+        self.assertEqual([event["pos"] for event in events], ["009"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from dotenv import load_dotenv
+import threading
+import time
+import unittest
+from src.common.rate_limiter import RateLimiter
+
+load_dotenv()
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_requests_to_a_host_are_spaced_out(self):
+        rate_limiter = RateLimiter(requests_per_second=10)
+        started_at = time.monotonic()
+        delays = [rate_limiter.wait("https://www.nba.com/game/1") for _ in range(4)]
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.3)
+        self.assertEqual(delays[0], 0.0)
+        for delay in delays[1:]:
+            self.assertAlmostEqual(delay, 0.1, delta=0.05)
+
+    def test_concurrent_workers_queue_up_behind_each_other(self):
+        rate_limiter = RateLimiter(requests_per_second=10)
+        started_at = []
+        lock = threading.Lock()
+
+        def request():
+            rate_limiter.wait("https://www.nba.com/game/1")
+            with lock:
+                started_at.append(time.monotonic())
+
+        threads = [threading.Thread(target=request) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        started_at.sort()
+        for previous, current in zip(started_at, started_at[1:]):
+            self.assertGreaterEqual(current - previous, 0.08)
+
+    def test_hosts_are_limited_separately(self):
+        rate_limiter = RateLimiter(requests_per_second=1)
+        self.assertEqual(rate_limiter.wait("https://www.nba.com/game/1"), 0.0)
+        self.assertEqual(rate_limiter.wait("https://videos.nba.com/1.mp4"), 0.0)
+
+    def test_zero_disables_rate_limiting(self):
+        for requests_per_second in [0, None]:
+            rate_limiter = RateLimiter(requests_per_second)
+            started_at = time.monotonic()
+            for _ in range(5):
+                self.assertEqual(rate_limiter.wait("https://www.nba.com/game/1"), 0.0)
+            self.assertLess(time.monotonic() - started_at, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+from dotenv import load_dotenv
+import unittest
+from src.common.ffmpeg_renderer import are_clips_compatible, plan_clip_cut
+
+load_dotenv()
+
+CLIP_PARAMETERS = {
+    "video": {
+        "codec_name": "h264",
+        "profile": "High",
+        "width": 1280,
+        "height": 720,
+        "pix_fmt": "yuv420p",
+        "r_frame_rate": "30/1",
+    },
+    "audio": {"codec_name": "aac", "sample_rate": "44100", "channels": 2},
+}
+
+
+class TestStreamCopyPlanning(unittest.TestCase):
+    def test_identical_clips_are_compatible(self):
+        self.assertTrue(are_clips_compatible([CLIP_PARAMETERS, dict(CLIP_PARAMETERS)]))
+
+    def test_different_resolution_is_not_compatible(self):
+        smaller = {
+            "video": dict(CLIP_PARAMETERS["video"], width=960, height=540),
+            "audio": CLIP_PARAMETERS["audio"],
+        }
+        self.assertFalse(are_clips_compatible([CLIP_PARAMETERS, smaller]))
+
+    def test_clip_without_audio_is_not_compatible(self):
+        silent = {"video": CLIP_PARAMETERS["video"], "audio": None}
+        self.assertFalse(are_clips_compatible([silent, silent]))
+
+    def test_cut_on_keyframe_is_copied(self):
+        self.assertEqual(plan_clip_cut(2.0, 15.0, [0.0, 2.0, 4.0]), (None, (2.0, 15.0)))
+
+    def test_cut_between_keyframes_encodes_until_next_keyframe(self):
+        self.assertEqual(
+            plan_clip_cut(1.5, 15.0, [0.0, 2.0, 4.0]), ((1.5, 2.0), (2.0, 15.0))
+        )
+
+    def test_cut_without_later_keyframe_is_encoded(self):
+        self.assertEqual(plan_clip_cut(5.0, 6.0, [0.0, 2.0, 4.0]), ((5.0, 6.0), None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+from dotenv import load_dotenv
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from src.common.page_cache import PageCache
+from src.common.video_url_resolver import EVENTS_ROW_CLASS, VideoUrlResolver
+
+load_dotenv()
+
+EVENT_URL = "https://www.nba.com/game/lal-vs-bos-0022300001/play-by-play?eventId={}"
+
+
+class UnavailableDriverPool:
+    # Counts the browsers asked for and has none to give
+    size = 2
+
+    def __init__(self):
+        self.borrowed = 0
+
+    def borrow(self):
+        self.borrowed += 1
+        raise RuntimeError("No browser in tests")
+
+
+def make_event(pos):
+    return {"pos": f"{pos:03d}", "page_url": EVENT_URL.format(pos)}
+
+
+class TestVideoUrlResolver(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.page_cache = PageCache(self.directory.name)
+        self.driver_pool = UnavailableDriverPool()
+
+    def tearDown(self):
+        self.page_cache.close()
+        self.directory.cleanup()
+
+    def cache_video_urls(self, event_data):
+        video_urls = [f"https://videos.nba.com/{event_data['pos']}.mp4"]
+        self.page_cache.put_json(
+            event_data["page_url"],
+            video_urls,
+            namespace="video_urls",
+            ttl=None,
+            extra={"row_class": EVENTS_ROW_CLASS, "keywords": None},
+        )
+        return video_urls
+
+    def make_resolver(self, requests_per_second):
+        return VideoUrlResolver(
+            requests_per_second=requests_per_second,
+            driver_pool=self.driver_pool,
+            page_cache=self.page_cache,
+        )
+
+    def test_cached_events_are_not_throttled(self):
+        events = [make_event(pos) for pos in range(1, 6)]
+        expected = {event_data["pos"]: self.cache_video_urls(event_data) for event_data in events}
+        resolver = self.make_resolver(requests_per_second=2)
+
+        started_at = time.monotonic()
+        with patch.object(resolver.rate_limiter, "wait") as wait:
+            results = resolver.resolve(events)
+        # Throttled like page loads, five events would take two seconds
+        self.assertLess(time.monotonic() - started_at, 1.0)
+        self.assertEqual(dict(results), expected)
+        wait.assert_not_called()
+        self.assertEqual(self.driver_pool.borrowed, 0)
+
+    def test_only_cache_misses_wait_for_the_rate_limiter(self):
+        cached_event, missed_event = make_event(1), make_event(2)
+        video_urls = self.cache_video_urls(cached_event)
+        resolver = self.make_resolver(requests_per_second=2)
+
+        with patch.object(resolver.rate_limiter, "wait") as wait:
+            results = resolver.resolve([cached_event, missed_event])
+        self.assertEqual(results, {"001": video_urls, "002": []})
+        wait.assert_called_once_with(missed_event["page_url"])
+        self.assertEqual(self.driver_pool.borrowed, 1)
+
+    def test_cache_misses_are_spaced_out(self):
+        events = [make_event(pos) for pos in range(1, 4)]
+        resolver = self.make_resolver(requests_per_second=10)
+
+        started_at = time.monotonic()
+        resolver.resolve(events)
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.2)
+        self.assertEqual(self.driver_pool.borrowed, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()